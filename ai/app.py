@@ -1,50 +1,81 @@
 import re
 import uuid
 import io
+import asyncio
 import json
+import threading
 import traceback
 import PyPDF2
-import spacy
-from spacy.matcher import Matcher, PhraseMatcher
-from fastapi import FastAPI, UploadFile, File, HTTPException,BackgroundTasks
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field,validator 
 from typing import List, Optional, Dict, Any
 import os
 from dotenv import load_dotenv
-from supabase import create_client, Client
 from datetime import datetime
-import google.generativeai as genai
-from functools import lru_cache
 from pathlib import Path
+from starlette.datastructures import Headers
 
 from typing import Dict, Any
 
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from pydantic import BaseModel, EmailStr
 
+from email_queue import EmailQueue, EmailDispatcher
+from email_templates import render_confirmation_email, render_confirmation_emails
+from ingestion_queue import (INGESTION_MAX_QUEUED, STATUS_QUEUED, TERMINAL_STATUSES, IngestionQueue,
+                             IngestionWorkers, PermanentIngestionError)
+from metrics import ServiceMetrics
+from ranking_state import CandidateLog
+from request_profiler import install_profiler
+from resume_index import ResumeFingerprint, ResumeIndex
+from service_lifecycle import WARMUP_ON_STARTUP, LazyResource, Warmup, health_router
+
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Gemini
-try:
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    model = genai.GenerativeModel('gemini-1.5-pro-latest')
-    print("✅ Gemini configured successfully")
-except Exception as e:
-    print(f"❌ Gemini configuration failed: {e}")
-    raise
+# Heavy clients and models (Gemini, spaCy, Supabase) are created on first use
+# or by the background warmup, so importing this module stays fast
+def configure_gemini():
+    import google.generativeai as genai
+    endpoint = os.getenv("GEMINI_API_ENDPOINT")
+    if endpoint:
+        # e.g. the local stand-in from benchmarks/fake_services.py, reachable over REST only
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"), transport="rest",
+                        client_options={"api_endpoint": endpoint})
+    else:
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai
+
+gemini = LazyResource("Gemini", configure_gemini)
+gemini_model = LazyResource("Gemini model", lambda: gemini.get().GenerativeModel('gemini-1.5-pro-latest'))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    initialize_resumes_file()
+    if WARMUP_ON_STARTUP:
+        warmup.start()
+    email_dispatcher.start()
+    ingestion_workers.start()
+    yield
+    ingestion_workers.stop()
+    email_dispatcher.stop()
 
 # Initialize FastAPI
 app = FastAPI(
     title="AI Resume Parser with Gemini Enhancement",
     version="1.0",
-    debug=True
+    debug=True,
+    lifespan=lifespan
 )
 
+metrics = ServiceMetrics("parser")
+metrics.instrument(app)
+install_profiler(app, "parser")
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -116,17 +147,30 @@ async def process_with_gemini(raw_text: str) -> Dict[str, Any]:
     """
     
     try:
-        response = model.generate_content(prompt)
+        with metrics.stage("gemini_process"):
+            response = gemini_model.get().generate_content(prompt)
         
         json_str = response.text[response.text.find('{'):response.text.rfind('}')+1]
         return json.loads(json_str)
     except Exception as e:
+        metrics.failure("gemini")
         raise HTTPException(
             status_code=500,
             detail=f"Gemini processing failed: {str(e)}"
         )
     
 RESUMES_JSON_FILE = "resumes_data.json"
+_resumes_file_lock = threading.Lock()
+
+# New candidates are logged so the matching service only scores the new arrivals
+candidate_log = CandidateLog()
+
+def log_new_candidate(candidate: Dict[str, Any]):
+    """Record a new candidate for incremental re-ranking without failing the request."""
+    try:
+        candidate_log.append(candidate)
+    except Exception as e:
+        print(f"Failed to log candidate for ranking: {str(e)}")
 
 def initialize_resumes_file():
     """Create the JSON file if it doesn't exist with an empty list"""
@@ -139,59 +183,105 @@ def append_resume_to_file(new_resume: Dict[str, Any]) -> bool:
     Append a new resume to the JSON file if it doesn't already exist.
     Returns True if resume was added, False if it already existed.
     """
-    try:
-        # Read existing data
-        with open(RESUMES_JSON_FILE, 'r') as f:
-            existing_data: List[Dict[str, Any]] = json.load(f)
-        
-        if "email" in new_resume and new_resume["email"]:
-            for existing_resume in existing_data:
-                if "email" in existing_resume and existing_resume["email"] == new_resume["email"]:
-                    print(f"Resume with email {new_resume['email']} already exists. Skipping.")
-                    return False
-        
-        # As a fallback, also check by name if email is missing
-        elif "name" in new_resume and new_resume["name"]:
-            for existing_resume in existing_data:
-                if "name" in existing_resume and existing_resume["name"] == new_resume["name"]:
-                    print(f"Resume with name {new_resume['name']} already exists. Skipping.")
-                    return False
-        
-        # Append new resume only if it doesn't exist
-        existing_data.append(new_resume)
-        
-        # Write back to file
-        with open(RESUMES_JSON_FILE, 'w') as f:
-            json.dump(existing_data, f, indent=2)
-        
-        print(f"Added new resume to file: {new_resume.get('email', new_resume.get('name', 'Unknown'))}")
-        return True
+    # Ingestion workers append from several threads; the read-modify-write must not interleave
+    with _resumes_file_lock:
+        try:
+            # Read existing data
+            with open(RESUMES_JSON_FILE, 'r') as f:
+                existing_data: List[Dict[str, Any]] = json.load(f)
+        
+            if "email" in new_resume and new_resume["email"]:
+                for existing_resume in existing_data:
+                    if "email" in existing_resume and existing_resume["email"] == new_resume["email"]:
+                        print(f"Resume with email {new_resume['email']} already exists. Skipping.")
+                        return False
+        
+            # As a fallback, also check by name if email is missing
+            elif "name" in new_resume and new_resume["name"]:
+                for existing_resume in existing_data:
+                    if "name" in existing_resume and existing_resume["name"] == new_resume["name"]:
+                        print(f"Resume with name {new_resume['name']} already exists. Skipping.")
+                        return False
+        
+            # Append new resume only if it doesn't exist
+            existing_data.append(new_resume)
+        
+            # Write back to file
+            with open(RESUMES_JSON_FILE, 'w') as f:
+                json.dump(existing_data, f, indent=2)
+        
+            print(f"Added new resume to file: {new_resume.get('email', new_resume.get('name', 'Unknown'))}")
+            log_new_candidate(new_resume)
+            return True
             
+        except Exception as e:
+            print(f"Failed to update resumes file: {str(e)}")
+            raise Exception(f"Failed to update resumes file: {str(e)}")
+
+# Resumes already processed are answered from the stored result, before the
+# Gemini call, the storage upload and the candidates insert
+resume_index = ResumeIndex()
+
+async def fingerprint_upload(file: UploadFile) -> ResumeFingerprint:
+    contents = await file.read()
+    await file.seek(0)
+    return ResumeFingerprint.from_upload(contents)
+
+def find_known_resume(kind: str, fingerprint: ResumeFingerprint) -> Optional[Any]:
+    """Stored result for an already processed resume; index errors never fail the request."""
+    try:
+        with metrics.stage("resume_index_lookup"):
+            match = resume_index.find(kind, fingerprint)
     except Exception as e:
-        print(f"Failed to update resumes file: {str(e)}")
-        raise Exception(f"Failed to update resumes file: {str(e)}")
+        print(f"Resume index lookup failed: {str(e)}")
+        return None
+    # The PDF hash alone is checked first; a miss only counts once the text was checked too
+    if match is not None or fingerprint.text_hash is not None:
+        metrics.cache("resume_index", match is not None)
+    if match is None:
+        return None
+    print(f"Resume already processed ({match[0]} match); returning the stored result")
+    return match[1]
+
+def remember_resume(kind: str, fingerprint: ResumeFingerprint, result: Any):
+    try:
+        resume_index.add(kind, fingerprint, jsonable_encoder(result))
+    except Exception as e:
+        print(f"Failed to add resume to the index: {str(e)}")
 
-# Initialize the file when module loads
-initialize_resumes_file()
+def _no_progress(stage: str):
+    pass
 
-# Then modify your existing send_data endpoint like this:
-@app.post("/send-data", response_model=RawResumeData)
-async def send_data(file: UploadFile = File(...)):
-    """Endpoint that sends raw resume data to Gemini for processing"""
+async def run_send_data(file: UploadFile, progress=_no_progress) -> RawResumeData:
+    """The /send-data pipeline; `progress` is told each stage as it starts."""
     try:
-        # 1. Extract raw text from PDF
-        raw_text = await extract_raw_text_from_pdf(file)
+        # 1. Extract raw text from PDF, unless the resume was already processed
+        progress("extracting_text")
+        fingerprint = await fingerprint_upload(file)
+        known = find_known_resume("send-data", fingerprint)
+        if known is None:
+            with metrics.stage("pdf_extract"):
+                raw_text = await extract_raw_text_from_pdf(file)
+            fingerprint.add_text(raw_text)
+            known = find_known_resume("send-data", fingerprint)
+        if known is not None:
+            known["processed_data"]["note"] = "Resume already exists in database"
+            return RawResumeData(**known)
         
         # 2. Send directly to Gemini for processing
+        progress("gemini")
         processed_data = await process_with_gemini(raw_text)
         
         # 3. Append to JSON file if not already exists
-        was_added = append_resume_to_file(processed_data)
+        progress("saving")
+        with metrics.stage("resumes_file_append"):
+            was_added = append_resume_to_file(processed_data)
         
         response_data = RawResumeData(
             raw_text=raw_text[:1000] + "... [truncated]",
             processed_data=processed_data
         )
+        remember_resume("send-data", fingerprint, response_data)
         
         # Add a note about whether the resume was added or already existed
         if not was_added:
@@ -206,24 +296,28 @@ async def send_data(file: UploadFile = File(...)):
             status_code=500,
             detail=f"Resume processing failed: {str(e)}"
         )
+
+@app.post("/send-data", response_model=RawResumeData)
+async def send_data(file: UploadFile = File(...)):
+    """Endpoint that sends raw resume data to Gemini for processing"""
+    return await run_send_data(file)
+
 # Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_lg")
-    print("✅ spaCy model loaded successfully")
-except Exception as e:
-    print(f"❌ spaCy model loading failed: {e}")
-    raise
+def load_spacy_model():
+    import spacy
+    return spacy.load("en_core_web_lg")
+
+nlp = LazyResource("spaCy model", load_spacy_model)
 
 # Initialize Supabase
-try:
-    supabase: Client = create_client(
+def connect_supabase():
+    from supabase import create_client
+    return create_client(
         os.getenv("SUPABASE_URL"),
         os.getenv("SUPABASE_KEY")
     )
-    print("✅ Supabase connection successful")
-except Exception as e:
-    print(f"❌ Supabase connection failed: {e}")
-    raise
+
+supabase = LazyResource("Supabase client", connect_supabase)
 
 # Constants
 SKILL_BLACKLIST = {
@@ -275,14 +369,17 @@ class JobWithCandidates(BaseModel):
 
 # Helper Functions
 def initialize_nlp_components():
-    skill_patterns = list(nlp.pipe([
+    from spacy.matcher import Matcher, PhraseMatcher
+
+    nlp_model = nlp.get()
+    skill_patterns = list(nlp_model.pipe([
         skill for skill in TECHNICAL_SKILLS 
         if len(skill.split()) < 3
     ]))
-    skill_matcher = PhraseMatcher(nlp.vocab)
+    skill_matcher = PhraseMatcher(nlp_model.vocab)
     skill_matcher.add("SKILL", skill_patterns)
 
-    experience_matcher = Matcher(nlp.vocab)
+    experience_matcher = Matcher(nlp_model.vocab)
     experience_patterns = [
         [{"POS": "PROPN", "OP": "+"}, {"LOWER": "at"}, {"POS": "PROPN", "OP": "+"}],
         [{"POS": "PROPN", "OP": "+"}, {"LOWER": ","}, {"LOWER": "inc"}],
@@ -292,7 +389,10 @@ def initialize_nlp_components():
 
     return skill_matcher, experience_matcher
 
-skill_matcher, experience_matcher = initialize_nlp_components()
+nlp_matchers = LazyResource("NLP matchers", initialize_nlp_components)
+
+warmup = Warmup([gemini, gemini_model, supabase, nlp, nlp_matchers])
+app.include_router(health_router(warmup))
 
 def is_valid_skill(text):
     return (
@@ -305,6 +405,7 @@ def is_valid_skill(text):
 
 def extract_skills(doc) -> List[str]:
     skills = set()
+    skill_matcher, _ = nlp_matchers.get()
     matches = skill_matcher(doc)
     for match_id, start, end in matches:
         skill = doc[start:end].text
@@ -365,12 +466,12 @@ async def upload_resume_to_storage(file: UploadFile) -> str:
         await file.seek(0)
         file_contents = await file.read()
         
-        supabase.storage.from_("resumes").upload(
+        supabase.get().storage.from_("resumes").upload(
             path=unique_filename,
             file=file_contents,
             file_options={"content-type": file.content_type, "x-upsert": "true"}
         )
-        return supabase.storage.from_("resumes").get_public_url(unique_filename)
+        return supabase.get().storage.from_("resumes").get_public_url(unique_filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload resume: {str(e)}")
 
@@ -442,7 +543,6 @@ def extract_education(doc) -> List[Dict[str, Any]]:
     
     return education
 
-@lru_cache(maxsize=100)
 async def enhance_resume_with_gemini(raw_text: str, extracted_data: dict) -> EnhancedResumeData:
     prompt = f"""
     Analyze this resume and enhance the extracted data:
@@ -468,10 +568,12 @@ async def enhance_resume_with_gemini(raw_text: str, extracted_data: dict) -> Enh
     """
     
     try:
-        response = model.generate_content(prompt)
+        with metrics.stage("gemini_enhance"):
+            response = gemini_model.get().generate_content(prompt)
         json_str = response.text[response.text.find('{'):response.text.rfind('}')+1]
         return EnhancedResumeData(**json.loads(json_str))
     except Exception as e:
+        metrics.failure("gemini")
         print(f"Gemini enhancement failed: {str(e)}")
         return EnhancedResumeData(
             resume_text=extracted_data.get("resume_text", ""),
@@ -485,17 +587,30 @@ async def enhance_resume_with_gemini(raw_text: str, extracted_data: dict) -> Enh
             corrections_made=["Gemini enhancement failed"]
         )
 
-# API Endpoints
-@app.post("/parse-resume/", response_model=ResumeData)
-async def parse_resume(file: UploadFile = File(...)):
+async def run_parse_resume(file: UploadFile, progress=_no_progress) -> ResumeData:
+    """The /parse-resume/ pipeline; `progress` is told each stage as it starts."""
     try:
-        text = await extract_text_from_pdf(file)
-        doc = nlp(text)
-        
-        contact_info = extract_contact_info(doc)
-        skills = extract_skills(doc)
-        experience = extract_experience(doc) or []
-        education = extract_education(doc) or []
+        progress("extracting_text")
+        fingerprint = await fingerprint_upload(file)
+        known = find_known_resume("parse-resume", fingerprint)
+        if known is None:
+            with metrics.stage("pdf_extract"):
+                text = await extract_text_from_pdf(file)
+            fingerprint.add_text(text)
+            known = find_known_resume("parse-resume", fingerprint)
+        if known is not None:
+            # Already in the candidates table; do not upload or insert it again
+            return ResumeData(**known)
+        
+        progress("nlp")
+        with metrics.stage("spacy_parse"):
+            doc = nlp.get()(text)
+        
+        with metrics.stage("spacy_extract"):
+            contact_info = extract_contact_info(doc)
+            skills = extract_skills(doc)
+            experience = extract_experience(doc) or []
+            education = extract_education(doc) or []
         
         extracted_data = {
             "resume_text": text[:5000],
@@ -505,8 +620,11 @@ async def parse_resume(file: UploadFile = File(...)):
             "contact_info": contact_info
         }
         
+        progress("gemini")
         enhanced_data = await enhance_resume_with_gemini(text, extracted_data)
-        resume_url = await upload_resume_to_storage(file)
+        progress("uploading")
+        with metrics.stage("storage_upload"):
+            resume_url = await upload_resume_to_storage(file)
         
         resume_record = {
             "id": str(uuid.uuid4()),
@@ -522,9 +640,17 @@ async def parse_resume(file: UploadFile = File(...)):
             "created_at": datetime.now().isoformat()
         }
         
-        supabase.table("candidates").insert(resume_record).execute()
+        progress("saving")
+        with metrics.stage("supabase_insert"):
+            supabase.get().table("candidates").insert(resume_record).execute()
+        log_new_candidate({
+            "name": contact_info["name"],
+            "resume_text": text,
+            "extracted_skills": enhanced_data.skills,
+            "experience_years": enhanced_data.experience_years
+        })
         
-        return ResumeData(
+        resume_data = ResumeData(
             name=contact_info["name"],
             email=contact_info["email"],
             phone=contact_info["phone"],
@@ -534,17 +660,111 @@ async def parse_resume(file: UploadFile = File(...)):
             education=education,
             enhanced_data=enhanced_data
         )
+        remember_resume("parse-resume", fingerprint, resume_data)
+        return resume_data
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(500, detail=str(e))
 
+# API Endpoints
+@app.post("/parse-resume/", response_model=ResumeData)
+async def parse_resume(file: UploadFile = File(...)):
+    return await run_parse_resume(file)
+
+# Async ingestion: an upload is stored in a durable SQLite queue and answered
+# with a job id at once; a bounded worker pool runs the same pipelines as
+# /send-data and /parse-resume/ in the background
+INGESTION_PIPELINES = {"send-data": run_send_data, "parse-resume": run_parse_resume}
+INGESTION_EVENT_POLL_SECONDS = 0.5
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+
+def ingestion_handler(pipeline):
+    """Run a pipeline on a queued upload; client errors are not retried."""
+    async def handle(job: Dict[str, Any], progress) -> Dict[str, Any]:
+        upload = UploadFile(
+            file=io.BytesIO(job["payload"]),
+            filename=job["filename"],
+            headers=Headers({"content-type": job["content_type"] or ""})
+        )
+        try:
+            result = await pipeline(upload, progress)
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise PermanentIngestionError(e.detail)
+            raise
+        return jsonable_encoder(result)
+    return handle
+
+ingestion_queue = IngestionQueue()
+ingestion_workers = IngestionWorkers(
+    ingestion_queue,
+    {kind: ingestion_handler(pipeline) for kind, pipeline in INGESTION_PIPELINES.items()}
+)
+
+@app.post("/jobs/{pipeline}", status_code=202)
+async def submit_ingestion_job(pipeline: str, file: UploadFile = File(...)):
+    """
+    Queue a resume for the send-data or parse-resume pipeline and return its
+    job id without waiting for it. Poll /jobs/{job_id} or stream
+    /jobs/{job_id}/events for progress and the result.
+    """
+    if pipeline not in INGESTION_PIPELINES:
+        raise HTTPException(status_code=404, detail=f"Unknown ingestion pipeline {pipeline}")
+    if file.content_type != "application/pdf":
+        raise HTTPException(status_code=400, detail="Only PDF files are accepted")
+    contents = await file.read()
+    if not contents:
+        raise HTTPException(status_code=400, detail="Empty file uploaded")
+    if len(contents) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="File too large (max 5MB)")
+    if ingestion_queue.pending() >= INGESTION_MAX_QUEUED:
+        raise HTTPException(status_code=503, detail="Ingestion queue is full, retry later",
+                            headers={"Retry-After": "30"})
+
+    job_id = ingestion_queue.enqueue(pipeline, file.filename, file.content_type, contents)
+    ingestion_workers.notify()
+    return {
+        "job_id": job_id,
+        "status": STATUS_QUEUED,
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """Status, current stage, and the result or error of an ingestion job."""
+    job = ingestion_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def stream_ingestion_job(job_id: str):
+    """Server-sent events, one per status or stage change, ending when the job finishes."""
+    if ingestion_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    async def events():
+        last_state = None
+        while True:
+            job = ingestion_queue.get(job_id)
+            state = (job["status"], job["stage"], job["attempts"])
+            if state != last_state:
+                last_state = state
+                yield f"event: {job['status']}\ndata: {json.dumps(job, default=str)}\n\n"
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(INGESTION_EVENT_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/apply-job/")
 async def apply_to_job(application: JobApplication):
     try:
-        candidate = supabase.table("candidates").select("*").eq("id", application.candidate_id).execute()
-        job = supabase.table("jobs").select("*").eq("id", application.job_id).execute()
+        candidate = supabase.get().table("candidates").select("*").eq("id", application.candidate_id).execute()
+        job = supabase.get().table("jobs").select("*").eq("id", application.job_id).execute()
         
         if not candidate.data or not job.data:
             raise HTTPException(status_code=404, detail="Candidate or Job not found")
@@ -556,7 +776,7 @@ async def apply_to_job(application: JobApplication):
             "status": "Submitted"
         }
         
-        response = supabase.table("applications").insert(application_data).execute()
+        response = supabase.get().table("applications").insert(application_data).execute()
         return {"message": "Application submitted successfully", "application_id": response.data[0]["id"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -590,8 +810,13 @@ async def analyze_candidate(request: dict):
         """
         
         # Generate response from Gemini
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
+        model = gemini.get().GenerativeModel('gemini-2.0-flash')
+        try:
+            with metrics.stage("gemini_analyze"):
+                response = model.generate_content(prompt)
+        except Exception:
+            metrics.failure("gemini")
+            raise
         
         # Parse the response (assumes Gemini returns properly formatted JSON)
         try:
@@ -611,15 +836,15 @@ async def analyze_candidate(request: dict):
 @app.get("/job-applications/{job_id}", response_model=JobWithCandidates)
 async def get_job_applications(job_id: str):
     try:
-        job = supabase.table("jobs").select("*").eq("id", job_id).execute()
+        job = supabase.get().table("jobs").select("*").eq("id", job_id).execute()
         if not job.data:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        applications = supabase.table("applications").select("*").eq("job_id", job_id).execute()
+        applications = supabase.get().table("applications").select("*").eq("job_id", job_id).execute()
         candidates = []
         
         for app in applications.data:
-            candidate = supabase.table("candidates").select("*").eq("id", app["candidate_id"]).execute()
+            candidate = supabase.get().table("candidates").select("*").eq("id", app["candidate_id"]).execute()
             if candidate.data:
                 candidates.append(candidate.data[0])
         
@@ -645,148 +870,62 @@ class EmailRequest(BaseModel):
             raise ValueError('Invalid email format')
         return v
 
-# Email sending function to run in the background
-def send_email_background(email_to: str, subject: str, content: str):
-    # Get email credentials from environment variables
-    email_from = os.getenv("SENDER_EMAIL")
-    email_password = os.getenv("SMTP_PASSWORD")
-    smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    
-    if not all([email_from, email_password]):
-        print("Email credentials not properly configured in environment variables")
-        return False
-    
-    # Create message
-    message = MIMEMultipart()
-    message["From"] = email_from
-    message["To"] = email_to
-    message["Subject"] = subject
-    
-    # Attach HTML content
-    message.attach(MIMEText(content, "html"))
-    
-    # Connect to server and send
-    try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(email_from, email_password)
-            server.send_message(message)
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {str(e)}")
-        return False
+# Outbound emails are persisted in a SQLite queue and delivered by a background
+# dispatcher that reuses one SMTP session across many messages
+email_queue = EmailQueue()
+email_dispatcher = EmailDispatcher(email_queue)
 
 # Add this endpoint to your FastAPI app
 @app.post("/send-confirmation-email")
-async def send_confirmation_email(request: EmailRequest, background_tasks: BackgroundTasks):
+async def send_confirmation_email(request: EmailRequest):
     try:
-        # Extract candidate data
-        candidate_data = request.candidate_data
-        personal_info = candidate_data.get("personal_information", {})
-        name = personal_info.get("name", "Candidate")
-        
-        # Get current date and time
-        submission_date = datetime.now().strftime('%Y-%m-%d %H:%M')
-        
-        # Create email content
-        subject = "Application Confirmation - Please Review Your Details"
-        
-        # Build HTML for candidate details
-        personal_html = ""
-        if personal_info:
-            personal_html += "<h3>Personal Information</h3><ul>"
-            for key, value in personal_info.items():
-                personal_html += f"<li><strong>{key.replace('_', ' ').title()}:</strong> {value}</li>"
-            personal_html += "</ul>"
-        
-        # Education section
-        education_html = ""
-        if "education" in candidate_data:
-            education_html += "<h3>Education</h3><ul>"
-            for edu in candidate_data["education"]:
-                education_html += "<li>"
-                for key, value in edu.items():
-                    education_html += f"<strong>{key.replace('_', ' ').title()}:</strong> {value}<br>"
-                education_html += "</li>"
-            education_html += "</ul>"
-        
-        # Experience section
-        experience_html = ""
-        if "experience" in candidate_data:
-            experience_html += "<h3>Work Experience</h3><ul>"
-            for exp in candidate_data["experience"]:
-                experience_html += "<li>"
-                for key, value in exp.items():
-                    experience_html += f"<strong>{key.replace('_', ' ').title()}:</strong> {value}<br>"
-                experience_html += "</li>"
-            experience_html += "</ul>"
-        
-        # Skills section
-        skills_html = ""
-        if "skills" in candidate_data:
-            skills_html += "<h3>Skills</h3><ul>"
-            for skill in candidate_data["skills"]:
-                skills_html += f"<li>{skill}</li>"
-            skills_html += "</ul>"
-        
-        # Position applied for
-        position_html = ""
-        if "position" in candidate_data:
-            position_html = f"<p><strong>Position Applied For:</strong> {candidate_data['position']}</p>"
-        
-        content = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; border-radius: 10px;">
-                <h2 style="color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 10px;">Application Confirmation</h2>
-                
-                <p>Dear {name},</p>
-                
-                <p>Thank you for submitting your application to our system. Please review the information you've provided below:</p>
-                
-                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <p style="margin: 0; font-weight: bold;">Application Details:</p>
-                    <p><strong>Submission Date:</strong> {submission_date}</p>
-                    {position_html}
-                    
-                    {personal_html}
-                    
-                    {education_html}
-                    
-                    {experience_html}
-                    
-                    {skills_html}
-                </div>
-                
-                <p>If any information is incorrect or incomplete, please contact us immediately at <a href="mailto:support@example.com">support@example.com</a>.</p>
-                
-                <p>Our team will review your application and reach out to you soon regarding the next steps.</p>
-                
-                <p>Best regards,<br>Recruitment Team</p>
-            </div>
-        </body>
-        </html>
-        """
+        # Render from the precompiled, auto-escaping template
+        with metrics.stage("email_render"):
+            subject, content = render_confirmation_email(request.candidate_data)
         
-        # Add email task to background to prevent blocking the API
-        background_tasks.add_task(
-            send_email_background,
-            email_to=request.email,
-            subject=subject,
-            content=content
-        )
+        # Persist the email; the dispatcher delivers it without blocking the API
+        message_id = email_queue.enqueue(request.email, subject, content)
         
         # Log the email attempt
         print(f"Confirmation email with details queued for {request.email}")
         
-        # Update the database to record that an email was sent
-        
-        return {"message": f"Confirmation email with application details sent to {request.email}"}
+        return {
+            "message": f"Confirmation email with application details sent to {request.email}",
+            "message_id": message_id
+        }
         
     except Exception as e:
         # Handle other errors
         error_message = f"Failed to send confirmation email: {str(e)}"
         print(error_message)
         print(traceback.format_exc())  # Log full traceback
-        return {"error": error_message}
\ No newline at end of file
+        return {"error": error_message}
+
+class BulkEmailRequest(BaseModel):
+    recipients: List[EmailRequest]
+
+@app.post("/send-confirmation-emails")
+async def send_confirmation_emails(request: BulkEmailRequest):
+    """Render and queue confirmation emails for many candidates in one call."""
+    try:
+        with metrics.stage("email_render"):
+            rendered = render_confirmation_emails([r.candidate_data for r in request.recipients])
+        message_ids = [
+            email_queue.enqueue(recipient.email, subject, content)
+            for recipient, (subject, content) in zip(request.recipients, rendered)
+        ]
+        print(f"Queued {len(message_ids)} confirmation emails")
+        return {"message": f"Queued {len(message_ids)} confirmation emails", "message_ids": message_ids}
+    except Exception as e:
+        error_message = f"Failed to queue confirmation emails: {str(e)}"
+        print(error_message)
+        print(traceback.format_exc())
+        return {"error": error_message}
+
+@app.get("/email-status/{message_id}")
+async def get_email_status(message_id: str):
+    """Report the delivery status of a queued email."""
+    status = email_queue.get_status(message_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return status
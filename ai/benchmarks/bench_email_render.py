@@ -0,0 +1,158 @@
+"""
+Benchmark confirmation email rendering: the precompiled Jinja2 template
+(single and bulk mode) against the original string-concatenation builder.
+
+    python benchmarks/bench_email_render.py --count 5000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from email_templates import render_confirmation_email, render_confirmation_emails
+
+
+def legacy_render(candidate_data):
+    """The original /send-confirmation-email HTML builder, kept for comparison."""
+    personal_info = candidate_data.get("personal_information", {})
+    name = personal_info.get("name", "Candidate")
+
+    # Get current date and time
+    submission_date = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+    # Create email content
+    subject = "Application Confirmation - Please Review Your Details"
+
+    # Build HTML for candidate details
+    personal_html = ""
+    if personal_info:
+        personal_html += "<h3>Personal Information</h3><ul>"
+        for key, value in personal_info.items():
+            personal_html += f"<li><strong>{key.replace('_', ' ').title()}:</strong> {value}</li>"
+        personal_html += "</ul>"
+
+    # Education section
+    education_html = ""
+    if "education" in candidate_data:
+        education_html += "<h3>Education</h3><ul>"
+        for edu in candidate_data["education"]:
+            education_html += "<li>"
+            for key, value in edu.items():
+                education_html += f"<strong>{key.replace('_', ' ').title()}:</strong> {value}<br>"
+            education_html += "</li>"
+        education_html += "</ul>"
+
+    # Experience section
+    experience_html = ""
+    if "experience" in candidate_data:
+        experience_html += "<h3>Work Experience</h3><ul>"
+        for exp in candidate_data["experience"]:
+            experience_html += "<li>"
+            for key, value in exp.items():
+                experience_html += f"<strong>{key.replace('_', ' ').title()}:</strong> {value}<br>"
+            experience_html += "</li>"
+        experience_html += "</ul>"
+
+    # Skills section
+    skills_html = ""
+    if "skills" in candidate_data:
+        skills_html += "<h3>Skills</h3><ul>"
+        for skill in candidate_data["skills"]:
+            skills_html += f"<li>{skill}</li>"
+        skills_html += "</ul>"
+
+    # Position applied for
+    position_html = ""
+    if "position" in candidate_data:
+        position_html = f"<p><strong>Position Applied For:</strong> {candidate_data['position']}</p>"
+
+    content = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; border-radius: 10px;">
+            <h2 style="color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 10px;">Application Confirmation</h2>
+
+            <p>Dear {name},</p>
+
+            <p>Thank you for submitting your application to our system. Please review the information you've provided below:</p>
+
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                <p style="margin: 0; font-weight: bold;">Application Details:</p>
+                <p><strong>Submission Date:</strong> {submission_date}</p>
+                {position_html}
+
+                {personal_html}
+
+                {education_html}
+
+                {experience_html}
+
+                {skills_html}
+            </div>
+
+            <p>If any information is incorrect or incomplete, please contact us immediately at <a href="mailto:support@example.com">support@example.com</a>.</p>
+
+            <p>Our team will review your application and reach out to you soon regarding the next steps.</p>
+
+            <p>Best regards,<br>Recruitment Team</p>
+        </div>
+    </body>
+    </html>
+    """
+    return subject, content
+
+
+def sample_candidates(count):
+    return [
+        {
+            "personal_information": {"name": f"Candidate {i}", "email": f"candidate{i}@example.com", "phone": "555-0100"},
+            "education": [{"degree": "B.E. Computer Engineering", "institution": "Example University", "year": "2024"}],
+            "experience": [
+                {"company": "TechNova Solutions", "position": "Frontend Intern", "duration": "Jun 2023 - Aug 2023"},
+                {"company": "DataWorks", "position": "Software Engineer", "duration": "2024 - Present"},
+            ],
+            "skills": ["React.js", "TypeScript", "Python", "SQL", "Docker", "Git"],
+            "position": "Senior Frontend Developer (React.js)",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {count / elapsed:>12,.0f} renders/s")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    candidates = sample_candidates(args.count)
+    submission_date = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+    results = {
+        "legacy_concat": timed("legacy concatenation", lambda: [legacy_render(c) for c in candidates], args.count),
+        "template_single": timed(
+            "template (single)",
+            lambda: [render_confirmation_email(c, submission_date) for c in candidates],
+            args.count
+        ),
+        "template_bulk": timed(
+            "template (bulk)",
+            lambda: render_confirmation_emails(candidates, submission_date),
+            args.count
+        ),
+    }
+    print(json.dumps({"count": args.count, "renders_per_second": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
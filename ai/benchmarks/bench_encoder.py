@@ -0,0 +1,58 @@
+"""
+Benchmark sentence-encoder throughput on each backend, in sentences per
+second, together with its embedding drift from the fp32 PyTorch model. Texts
+are the resumes and job descriptions of candidate_data.csv.
+
+    ENCODER_THREADS=4 python benchmarks/bench_encoder.py --backends torch onnx onnx-int8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from encoder import BACKENDS, ENCODER_THREADS, embedding_drift, load_encoder, sample_texts
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "candidate_data.csv")
+
+
+def throughput(encoder, texts, batch_size, repeats):
+    encoder.encode(texts[:batch_size], batch_size=batch_size)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        encoder.encode(texts, batch_size=batch_size)
+    return len(texts) * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=ENCODER_THREADS)
+    args = parser.parse_args()
+
+    texts = sample_texts(DATA_PATH, args.texts)
+    reference = load_encoder("torch", args.threads)
+
+    results = {}
+    for backend in args.backends:
+        encoder = reference if backend == "torch" else load_encoder(backend, args.threads)
+        results[backend] = {
+            "sentences_per_second": round(throughput(encoder, texts, args.batch_size, args.repeats), 1),
+            "drift": embedding_drift(reference, encoder, texts),
+        }
+
+    print(json.dumps({
+        "texts": len(texts),
+        "batch_size": args.batch_size,
+        "threads": args.threads or "default",
+        "backends": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
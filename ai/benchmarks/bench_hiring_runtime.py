@@ -0,0 +1,100 @@
+"""
+Benchmark the compact hiring-model runtime against the joblib pipeline:
+cold start (fresh interpreter importing and loading the model), load time
+with modules already imported, and per-row prediction latency, after
+checking both give the same probabilities.
+
+Run from the ai/ directory after training (python hiring_model.py):
+
+    python benchmarks/bench_hiring_runtime.py --rows 500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+AI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, AI_DIR)
+
+from hiring_features import build_features, frame_from_requests, requests_from_frame
+from hiring_runtime import COMPACT_MODEL_DIR, CompactHiringModel
+
+JOBLIB_PATH = os.path.join("models", "hiring_model.joblib")
+
+COLD_START = {
+    "joblib": f"import joblib; joblib.load({JOBLIB_PATH!r})",
+    "compact": f"from hiring_runtime import CompactHiringModel; CompactHiringModel.load({COMPACT_MODEL_DIR!r})",
+}
+
+
+def cold_start_seconds(statement, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True, cwd=os.getcwd(),
+                       env={**os.environ, "PYTHONPATH": AI_DIR})
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def load_seconds(load, repeats):
+    """Artifact load time with all modules already imported."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def per_row_ms(predict, requests):
+    start = time.perf_counter()
+    for request in requests:
+        predict([request])
+    return (time.perf_counter() - start) / len(requests) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.read_csv(os.path.join(AI_DIR, "candidate_data.csv")).head(args.rows)
+    requests = requests_from_frame(df)
+
+    pipeline = joblib.load(JOBLIB_PATH)
+    compact = CompactHiringModel.load(COMPACT_MODEL_DIR)
+
+    def pipeline_predict(batch):
+        return pipeline.predict_proba(build_features(frame_from_requests(batch)))[:, 1]
+
+    max_diff = float(np.max(np.abs(pipeline_predict(requests) - compact.predict_proba(requests))))
+
+    print(json.dumps({
+        "rows": len(requests),
+        "max_probability_difference": max_diff,
+        "cold_start_seconds": {name: round(cold_start_seconds(stmt, args.repeats), 3) for name, stmt in COLD_START.items()},
+        "warm_load_seconds": {
+            "joblib": round(load_seconds(lambda: joblib.load(JOBLIB_PATH), args.repeats), 4),
+            "compact": round(load_seconds(lambda: CompactHiringModel.load(COMPACT_MODEL_DIR), args.repeats), 4),
+        },
+        "per_row_latency_ms": {
+            "joblib": round(per_row_ms(pipeline_predict, requests), 3),
+            "compact": round(per_row_ms(compact.predict_proba, requests), 3),
+        },
+        "batch_latency_ms": {
+            "joblib": round(per_row_ms(lambda _: pipeline_predict(requests), [None]), 3),
+            "compact": round(per_row_ms(lambda _: compact.predict_proba(requests), [None]), 3),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
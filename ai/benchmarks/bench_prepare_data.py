@@ -0,0 +1,100 @@
+"""
+Benchmark hiring-model feature preparation: the vectorized
+EnhancedHiringPredictor.prepare_data against the original row-wise
+implementation (Series.apply text cleaning and a row-wise df.apply for the
+skill match), on candidate_data.csv resampled to the requested size.
+
+    python benchmarks/bench_prepare_data.py --rows 200000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hiring_model import EnhancedHiringPredictor
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "candidate_data.csv")
+
+
+def legacy_prepare_data(predictor, df):
+    """The original row-wise feature preparation, kept for comparison."""
+    df = df.copy()
+    df['Resume_Text'] = df['Resume_Text'].fillna('')
+    df['Job_Description'] = df['Job_Description'].fillna('')
+    df['Skills'] = df['Skills'].fillna('')
+    df['Required_Skills'] = df['Required_Skills'].fillna('')
+
+    for col in ['Experience (Years)', 'Offered_Salary', 'Salary_Expectation']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+        df[col] = df[col].fillna(df[col].median())
+
+    df['Resume_Text_Clean'] = df['Resume_Text'].apply(predictor.advanced_text_preprocessing)
+    df['Job_Description_Clean'] = df['Job_Description'].apply(predictor.advanced_text_preprocessing)
+    df['Skill_Match_Score'] = df.apply(
+        lambda row: predictor.calculate_skill_match(row['Skills'], row['Required_Skills']),
+        axis=1
+    )
+    df['Experience_Level'] = pd.cut(
+        df['Experience (Years)'],
+        bins=[-1, 1, 3, 5, 8, 15, np.inf],
+        labels=['Entry', 'Junior', 'Mid', 'Senior', 'Expert', 'Leadership']
+    )
+    df['Salary_Diff_Percentage'] = (df['Offered_Salary'] - df['Salary_Expectation']) / df['Salary_Expectation'] * 100
+    df['Salary_Diff_Percentage'] = df['Salary_Diff_Percentage'].fillna(0)
+    return df[predictor.FEATURES], df['Hired']
+
+
+def resample(rows):
+    base = pd.read_csv(DATA_PATH)
+    return base.sample(n=rows, replace=True, random_state=42).reset_index(drop=True)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    predictor = EnhancedHiringPredictor()
+    df = resample(args.rows)
+
+    (X_legacy, _), legacy_seconds = timed(lambda: legacy_prepare_data(predictor, df))
+    (X_vector, _), vector_seconds = timed(lambda: predictor.prepare_data(df))
+
+    for col in predictor.FEATURES:
+        if not np.array_equal(X_legacy[col].astype(object).to_numpy(), X_vector[col].astype(object).to_numpy()):
+            raise AssertionError(f"Feature mismatch in column {col}")
+
+    csv_path = os.path.join(os.path.dirname(__file__), f"_prepare_data_{args.rows}.csv")
+    df.to_csv(csv_path, index=False)
+    try:
+        _, chunked_seconds = timed(lambda: predictor.prepare_data_from_csv(csv_path, args.chunksize))
+    finally:
+        os.remove(csv_path)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "legacy_rowwise_seconds": round(legacy_seconds, 3),
+        "vectorized_seconds": round(vector_seconds, 3),
+        "speedup": round(legacy_seconds / vector_seconds, 2),
+        "chunked_csv_seconds": round(chunked_seconds, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark loading hiring-model training data from CSV against the Parquet
+file written by convert_csv_to_parquet, on candidate_data.csv resampled to
+the requested size. Each load runs in a fresh subprocess so its peak RSS is
+measured on its own.
+
+    python benchmarks/bench_training_data.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hiring_model import EnhancedHiringPredictor, convert_csv_to_parquet
+import hiring_features
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "candidate_data.csv")
+
+
+def load_csv(path):
+    """The original load: read every column as text-inferred, then coerce numerics."""
+    df = pd.read_csv(path)
+    for col in hiring_features.NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def load_parquet(path):
+    return pd.read_parquet(path, columns=EnhancedHiringPredictor.REQUIRED_COLUMNS)
+
+
+def measure(loader, path):
+    """Run in a child process: time one load and report frame memory and peak RSS."""
+    start = time.perf_counter()
+    df = {"csv": load_csv, "parquet": load_parquet}[loader](path)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": round(seconds, 3),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def run_child(loader, path):
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", loader, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--measure", nargs=2, metavar=("LOADER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "training.csv")
+        parquet_path = os.path.join(tmp_dir, "training.parquet")
+        base = pd.read_csv(DATA_PATH)
+        base.sample(n=args.rows, replace=True, random_state=42).to_csv(csv_path, index=False)
+
+        start = time.perf_counter()
+        convert_csv_to_parquet(csv_path, parquet_path)
+        convert_seconds = time.perf_counter() - start
+
+        csv_result = run_child("csv", csv_path)
+        parquet_result = run_child("parquet", parquet_path)
+
+        print(json.dumps({
+            "rows": args.rows,
+            "csv_file_mb": round(os.path.getsize(csv_path) / 2**20, 1),
+            "parquet_file_mb": round(os.path.getsize(parquet_path) / 2**20, 1),
+            "convert_seconds": round(convert_seconds, 3),
+            "csv": csv_result,
+            "parquet": parquet_result,
+            "load_speedup": round(csv_result["seconds"] / parquet_result["seconds"], 2),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
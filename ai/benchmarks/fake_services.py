@@ -0,0 +1,257 @@
+"""
+Local stand-ins for the parser service's external dependencies, so app.py
+can be load-tested without paid APIs:
+
+  Gemini    the REST generateContent endpoint, answering like
+            benchmarks/stubs.py after a configurable latency, failing a
+            configurable share of calls with 503
+  Supabase  PostgREST tables under /rest/v1 and storage uploads under
+            /storage/v1, kept in memory
+  SMTP      a sink that accepts and counts every message
+
+    python benchmarks/fake_services.py --gemini-latency 2 --gemini-error-rate 0.05
+
+Then start app.py against them:
+
+    GEMINI_API_ENDPOINT=http://127.0.0.1:9101 GEMINI_API_KEY=fake \\
+    SUPABASE_URL=http://127.0.0.1:9102 SUPABASE_KEY=fake.fake.fake \\
+    SMTP_SERVER=127.0.0.1 SMTP_PORT=9025 SMTP_STARTTLS=false SENDER_EMAIL=bench@example.com \\
+    uvicorn app:app --port 8000
+
+and drive it with benchmarks/load_test.py. Both HTTP stand-ins report their
+request counts at GET /__stats; all counts are printed on exit.
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import FakeSupabase, gemini_reply
+
+
+class Stats:
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def add(self, key: str):
+        with self.lock:
+            self.counts[key] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stats: Stats = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/__stats":
+            self.send_json(200, self.stats.snapshot())
+        else:
+            self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        self.handle_request("POST")
+
+    def handle_request(self, method: str):
+        self.read_body()
+        self.send_json(404, {"message": "not found"})
+
+
+class GeminiHandler(JSONHandler):
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+
+    def handle_request(self, method: str):
+        body = self.read_body()
+        if method != "POST" or ":generateContent" not in self.path:
+            self.stats.add("not_found")
+            self.send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+            return
+
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        if random.random() < self.error_rate:
+            self.stats.add("errors")
+            self.send_json(503, {"error": {"code": 503, "message": "The model is overloaded (fake)",
+                                           "status": "UNAVAILABLE"}})
+            return
+
+        request = json.loads(body or b"{}")
+        prompt = "\n".join(part.get("text", "") for content in request.get("contents", [])
+                           for part in content.get("parts", []))
+        self.stats.add("generate_content")
+        self.send_json(200, {
+            "candidates": [{
+                "content": {"parts": [{"text": gemini_reply(prompt)}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": 200},
+        })
+
+
+class SupabaseHandler(JSONHandler):
+    client: FakeSupabase = None
+    latency = 0.0
+
+    def handle_request(self, method: str):
+        body = self.read_body()
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        if self.latency:
+            time.sleep(self.latency)
+
+        if parts[:2] == ["rest", "v1"] and len(parts) == 3:
+            query = self.client.table(parts[2])
+            if method == "POST":
+                self.stats.add(f"insert:{parts[2]}")
+                result = query.insert(json.loads(body or b"{}")).execute()
+                self.send_json(201, result.data)
+                return
+            for column, condition in parse_qsl(url.query):
+                if column != "select" and condition.startswith("eq."):
+                    query = query.eq(column, condition[3:])
+            self.stats.add(f"select:{parts[2]}")
+            self.send_json(200, query.execute().data)
+        elif parts[:3] == ["storage", "v1", "object"] and len(parts) >= 5 and method == "POST":
+            path = "/".join(parts[4:])
+            self.client.storage.from_(parts[3]).upload(path, body)
+            self.stats.add("storage_upload")
+            self.send_json(200, {"Key": f"{parts[3]}/{path}"})
+        else:
+            self.stats.add("not_found")
+            self.send_json(404, {"message": f"{method} {url.path} is not supported by the fake"})
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+    stats: Stats = None
+
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        self.reply("220 fake-smtp ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-fake-smtp")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 fake-smtp")
+            elif verb == "AUTH":
+                if command.upper().startswith("AUTH LOGIN") and len(command.split()) == 2:
+                    self.reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.stats.add("messages")
+                self.reply("250 OK queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(server, name: str):
+    thread = threading.Thread(target=server.serve_forever, name=name, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--gemini-port", type=int, default=9101)
+    parser.add_argument("--supabase-port", type=int, default=9102)
+    parser.add_argument("--smtp-port", type=int, default=9025)
+    parser.add_argument("--gemini-latency", type=float, default=1.0, help="seconds per generateContent call")
+    parser.add_argument("--gemini-jitter", type=float, default=0.0, help="uniform +/- seconds around the latency")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="share of calls failing with 503")
+    parser.add_argument("--supabase-latency", type=float, default=0.0, help="seconds per PostgREST/storage call")
+    args = parser.parse_args()
+
+    stats = {"gemini": Stats(), "supabase": Stats(), "smtp": Stats()}
+    gemini_handler = type("Gemini", (GeminiHandler,), {
+        "stats": stats["gemini"], "latency": args.gemini_latency,
+        "jitter": args.gemini_jitter, "error_rate": args.gemini_error_rate,
+    })
+    supabase_handler = type("Supabase", (SupabaseHandler,), {
+        "stats": stats["supabase"], "client": FakeSupabase(), "latency": args.supabase_latency,
+    })
+    smtp_handler = type("SMTPSink", (SMTPSinkHandler,), {"stats": stats["smtp"]})
+
+    ThreadingHTTPServer.daemon_threads = True
+    servers = [
+        serve(ThreadingHTTPServer((args.host, args.gemini_port), gemini_handler), "fake-gemini"),
+        serve(ThreadingHTTPServer((args.host, args.supabase_port), supabase_handler), "fake-supabase"),
+        serve(ThreadingTCPServer((args.host, args.smtp_port), smtp_handler), "fake-smtp"),
+    ]
+    print(f"Gemini   http://{args.host}:{args.gemini_port}  (latency {args.gemini_latency}s, "
+          f"error rate {args.gemini_error_rate})")
+    print(f"Supabase http://{args.host}:{args.supabase_port}")
+    print(f"SMTP     {args.host}:{args.smtp_port}", flush=True)
+
+    stopped = threading.Event()
+    # Installed explicitly: a shell starts background jobs with SIGINT ignored
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    stopped.wait()
+    for server in servers:
+        server.shutdown()
+    print(json.dumps({name: stat.snapshot() for name, stat in stats.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Concurrent load test of the parser service (app.py), meant to run against
+the local stand-ins from benchmarks/fake_services.py so no paid API is hit.
+
+Before the run, jobs and candidates are seeded into the fake Supabase. Then
+--concurrency workers send requests for --duration seconds, each picking a
+scenario by the --mix weights:
+
+  send-data         POST /send-data with a synthetic resume PDF
+  parse-resume      POST /parse-resume/ with a synthetic resume PDF
+  apply-job         POST /apply-job/ for a seeded job and candidate
+  job-applications  GET /job-applications/{job_id} for a seeded job
+  email             POST /send-confirmation-email (weight 0 unless asked for)
+  ingest            POST /jobs/send-data, then poll GET /jobs/{id} until the
+                    job finishes (weight 0 unless asked for); latency is
+                    end to end, the accept latency is reported as ingest-accept
+
+The report gives throughput, p50/p95/p99 latency, error rate and status
+codes per scenario and overall, as JSON:
+
+    python benchmarks/fake_services.py &
+    (start app.py against the fakes, see fake_services.py)
+    python benchmarks/load_test.py --concurrency 16 --duration 60 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+
+SCENARIOS = ["send-data", "parse-resume", "apply-job", "job-applications", "email", "ingest"]
+DEFAULT_MIX = "send-data=1,parse-resume=1,apply-job=3,job-applications=3,email=0,ingest=0"
+
+
+def parse_mix(mix: str):
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name}; choose from {sorted(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.job_ids = [f"job-{i}" for i in range(args.jobs)]
+        self.candidate_ids = [f"candidate-{i}" for i in range(args.candidates)]
+
+        self.resumes = synthetic.make_resumes(args.resumes, args.seed)
+        self.pdfs = [synthetic.make_pdf(synthetic.resume_text(resume)) for resume in self.resumes]
+
+    async def seed(self, client: httpx.AsyncClient):
+        """Insert the jobs and candidates the apply and listing scenarios refer to."""
+        base = self.args.supabase_url.rstrip("/") + "/rest/v1"
+        jobs = [{"id": job_id, "title": f"Job {i}", "description": "Synthetic load-test job"}
+                for i, job_id in enumerate(self.job_ids)]
+        # Shaped like the rows /parse-resume/ inserts, which /job-applications/ returns as ResumeData
+        candidates = []
+        for i, candidate_id in enumerate(self.candidate_ids):
+            resume = self.resumes[i % len(self.resumes)]
+            candidates.append({
+                "id": candidate_id,
+                "name": resume["personal_information"]["name"],
+                "email": resume["personal_information"]["email"],
+                "phone": resume["personal_information"]["phone"],
+                "resume_text": synthetic.resume_text(resume),
+                "extracted_skills": [skill for values in resume["skills"].values() for skill in values],
+                "work_experience": resume["work_experience"],
+                "education": resume["education"],
+            })
+        for table, rows in [("jobs", jobs), ("candidates", candidates)]:
+            response = await client.post(f"{base}/{table}", json=rows)
+            response.raise_for_status()
+
+    async def wait_ready(self, client: httpx.AsyncClient):
+        deadline = time.monotonic() + self.args.ready_timeout
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/readyz")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(1)
+        raise RuntimeError(f"{self.args.url} did not become ready within {self.args.ready_timeout}s")
+
+    def upload(self, path: str):
+        index = self.rng.randrange(len(self.pdfs))
+        return "POST", path, {"files": {"file": (f"resume-{index}.pdf", self.pdfs[index], "application/pdf")}}
+
+    def request_for(self, scenario: str):
+        if scenario == "send-data":
+            return self.upload("/send-data")
+        if scenario == "parse-resume":
+            return self.upload("/parse-resume/")
+        if scenario == "apply-job":
+            return "POST", "/apply-job/", {"json": {
+                "candidate_id": self.rng.choice(self.candidate_ids),
+                "job_id": self.rng.choice(self.job_ids),
+            }}
+        if scenario == "job-applications":
+            return "GET", f"/job-applications/{self.rng.choice(self.job_ids)}", {}
+        resume = self.rng.choice(self.resumes)
+        return "POST", "/send-confirmation-email", {"json": {
+            "email": resume["personal_information"]["email"],
+            "candidate_data": resume,
+        }}
+
+    async def ingest(self, client: httpx.AsyncClient):
+        """Submit a queued send-data job and poll it; returns the final status."""
+        method, path, kwargs = self.upload("/jobs/send-data")
+        start = time.perf_counter()
+        response = await client.request(method, path, **kwargs)
+        self.samples["ingest-accept"].append((time.perf_counter() - start) * 1000)
+        self.statuses["ingest-accept"][str(response.status_code)] += 1
+        if response.status_code != 202:
+            return response.status_code
+        job_id = response.json()["job_id"]
+        while True:
+            await asyncio.sleep(self.args.poll_interval)
+            job = (await client.get(f"/jobs/{job_id}")).json()
+            if job["status"] == "succeeded":
+                return 200
+            if job["status"] == "failed":
+                return "failed"
+
+    async def worker(self, client: httpx.AsyncClient, mix, deadline: float):
+        names, weights = list(mix), list(mix.values())
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                if scenario == "ingest":
+                    status = await self.ingest(client)
+                else:
+                    method, path, kwargs = self.request_for(scenario)
+                    status = (await client.request(method, path, **kwargs)).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            self.samples[scenario].append((time.perf_counter() - start) * 1000)
+            self.statuses[scenario][str(status)] += 1
+
+    async def run(self, mix):
+        timeout = httpx.Timeout(self.args.timeout)
+        limits = httpx.Limits(max_connections=self.args.concurrency)
+        async with httpx.AsyncClient(base_url=self.args.url, timeout=timeout, limits=limits) as client:
+            if self.args.wait_ready:
+                await self.wait_ready(client)
+            async with httpx.AsyncClient(timeout=timeout) as supabase:
+                await self.seed(supabase)
+            start = time.monotonic()
+            deadline = start + self.args.duration
+            await asyncio.gather(*(self.worker(client, mix, deadline) for _ in range(self.args.concurrency)))
+            return time.monotonic() - start
+
+    def summarize(self, latencies, statuses, elapsed):
+        latencies = sorted(latencies)
+        failed = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+        return {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "error_rate": round(failed / len(latencies), 4) if latencies else None,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 1) if latencies else None,
+                "p95": round(percentile(latencies, 95), 1) if latencies else None,
+                "p99": round(percentile(latencies, 99), 1) if latencies else None,
+                "max": round(latencies[-1], 1) if latencies else None,
+            },
+            "statuses": dict(statuses),
+        }
+
+    def report(self, elapsed):
+        overall_latencies, overall_statuses = [], Counter()
+        scenarios = {}
+        for scenario in sorted(self.samples):
+            scenarios[scenario] = self.summarize(self.samples[scenario], self.statuses[scenario], elapsed)
+            overall_latencies += self.samples[scenario]
+            overall_statuses.update(self.statuses[scenario])
+        return {
+            "url": self.args.url,
+            "concurrency": self.args.concurrency,
+            "duration_seconds": round(elapsed, 2),
+            "overall": self.summarize(overall_latencies, overall_statuses, elapsed),
+            "scenarios": scenarios,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--supabase-url", default="http://127.0.0.1:9102")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--jobs", type=int, default=20, help="jobs seeded into the fake Supabase")
+    parser.add_argument("--candidates", type=int, default=500, help="candidates seeded into the fake Supabase")
+    parser.add_argument("--resumes", type=int, default=200, help="distinct resume PDFs uploaded")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="seconds between ingest job polls")
+    parser.add_argument("--wait-ready", action="store_true", help="wait for /readyz before starting")
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    load_test = LoadTest(args)
+    elapsed = asyncio.run(load_test.run(args.mix))
+    report = load_test.report(elapsed)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
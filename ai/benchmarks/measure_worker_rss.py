@@ -0,0 +1,131 @@
+"""
+Measure per-worker memory of a service launched by serve.py, with and
+without preloading the models in the master (Linux only, reads /proc).
+
+For each mode the launcher is started, /readyz is polled until the models
+are loaded, a few requests are sent, and RSS, PSS and private (USS) memory
+of the master and every worker are read from /proc/<pid>/smaps_rollup.
+
+    python benchmarks/measure_worker_rss.py resume_matcher app --workers 1 4 --output benchmarks/worker_rss.txt
+"""
+import argparse
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+AI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Paths that exercise the loaded models once they are ready
+WARM_PATHS = {
+    "resume_matcher": ["/process-and-match-resumes?limit=5"],
+    "app": ["/healthz"],
+}
+
+
+def memory_mb(pid):
+    """RSS, PSS and USS of one process in MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": round(fields.get("Rss", 0) / 1024, 1),
+        "pss": round(fields.get("Pss", 0) / 1024, 1),
+        "uss": round((fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / 1024, 1),
+    }
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_ready(port, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/readyz", timeout=5) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(1)
+    return False
+
+
+def measure(module, workers, port, preload, timeout):
+    command = [sys.executable, "serve.py", module, "--workers", str(workers), "--port", str(port)]
+    if not preload:
+        command.append("--no-preload")
+    process = subprocess.Popen(command, cwd=AI_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # Every worker has to be warm, so poll at least as often as there are workers
+        for _ in range(workers * 2):
+            if not wait_ready(port, timeout):
+                raise RuntimeError(f"{module} did not become ready within {timeout}s")
+        for path in WARM_PATHS[module]:
+            for _ in range(workers * 2):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=60).read()
+        time.sleep(2)
+
+        worker_memory = [memory_mb(pid) for pid in children(process.pid)]
+        master_memory = memory_mb(process.pid)
+        return {
+            "master": master_memory,
+            "worker": {key: sum(m[key] for m in worker_memory) / len(worker_memory) for key in ("rss", "pss", "uss")},
+            "total_pss": master_memory["pss"] + sum(m["pss"] for m in worker_memory),
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=["resume_matcher", "app"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--timeout", type=int, default=300)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    lines = [
+        f"Python {sys.version.split()[0]}, {platform.system()}, {os.cpu_count()} CPU(s), "
+        f"ENCODER_MODEL={os.getenv('ENCODER_MODEL', 'default')}",
+        "MB per process; the worker columns are the mean over the workers",
+        "",
+    ]
+    for module in args.modules:
+        lines.append(f"{module}:")
+        lines.append(f"  {'workers':>7}  {'preload':<7}  {'master RSS':>10} {'PSS':>7} {'USS':>7}"
+                     f"  {'worker RSS':>10} {'PSS':>7} {'USS':>7}  {'total PSS':>9}")
+        for workers in args.workers:
+            for preload in (False, True):
+                try:
+                    result = measure(module, workers, args.port, preload, args.timeout)
+                except RuntimeError as e:
+                    lines.append(f"  {workers:>7}  {'yes' if preload else 'no':<7}  failed ({e})")
+                    continue
+                master, worker = result["master"], result["worker"]
+                lines.append(f"  {workers:>7}  {'yes' if preload else 'no':<7}  "
+                             f"{master['rss']:10.1f} {master['pss']:7.1f} {master['uss']:7.1f}  "
+                             f"{worker['rss']:10.1f} {worker['pss']:7.1f} {worker['uss']:7.1f}  "
+                             f"{result['total_pss']:9.1f}")
+        lines.append("")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Profile how long importing each service module takes, using Python's
+-X importtime in a fresh interpreter, and list the top-level packages that
+account for most of it.
+
+    python benchmarks/profile_imports.py resume_matcher app --output benchmarks/import_profile.txt
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+AI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def profile_module(module):
+    """Return (wall seconds, {top-level package: microseconds spent importing it}) for one import."""
+    env = dict(os.environ, WARMUP_ON_STARTUP="false")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=AI_DIR, env=env, capture_output=True, text=True
+    )
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        # Attribute each module's own time to its top-level package
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return seconds, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=["resume_matcher", "app"])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    lines = [f"Python {sys.version.split()[0]}, WARMUP_ON_STARTUP=false", ""]
+    for module in args.modules:
+        try:
+            seconds, packages = profile_module(module)
+        except RuntimeError as e:
+            lines += [f"import {module}: failed ({e})", ""]
+            continue
+        lines.append(f"import {module}: {seconds:.2f}s wall (interpreter start included)")
+        for name, micros in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            lines.append(f"  {micros / 1e6:7.3f}s  {name}")
+        lines.append("")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
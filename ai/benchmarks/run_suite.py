@@ -0,0 +1,453 @@
+"""
+Reproducible benchmark suite for the parsing, matching and prediction hot
+paths, on synthetic data (benchmarks/synthetic.py) with Gemini and Supabase
+stubbed in-process (benchmarks/stubs.py).
+
+Each hot path is timed on its own:
+
+  pdf_extract              app.extract_text_from_pdf, per PDF
+  spacy_parse, spacy_*     the spaCy pipeline and each extractor, per resume
+  send_data                POST /send-data end to end, Gemini stubbed
+  parse_resume             POST /parse-resume/ end to end, Gemini and Supabase stubbed
+  *[known]                 the same uploads again, answered from the resume index
+  match_candidates_to_job  the whole ranking, default weights and without semantic
+  match_candidates_to_jobs the pool against --jobs jobs in one pass, and without
+                           semantic against one match_candidates_to_job per job
+  scorer_<name>            each registered scorer over the candidate pool
+  predict_hiring           POST /predict-hiring, one candidate per request
+  predict_hiring_batch     POST /predict-hiring/batch over the whole pool
+  append_resume_to_file    appending to a resumes file already holding the pool
+
+Pool-dependent benchmarks run once per --sizes entry (1k, 10k and 100k
+candidates by default). Per-document benchmarks do not depend on the pool
+and run once on --docs resumes. The hiring model is trained from
+candidate_data.csv into a temporary registry, so every commit is measured
+with the same model. A benchmark whose dependency (spaCy, the sentence
+encoder) is missing is recorded as skipped with the reason.
+
+Run from the ai/ directory:
+
+    python benchmarks/run_suite.py
+    python benchmarks/run_suite.py --sizes 1000 --only scorer_ match_
+    python benchmarks/run_suite.py --compare benchmarks/results/base.json benchmarks/results/head.json
+
+Results go to benchmarks/results/<commit>.json unless --output is given.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib import metadata
+
+AI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+RESULTS_DIR = os.path.join(AI_DIR, "benchmarks", "results")
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+PREDICT_CHUNK = 1_000
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=AI_DIR, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=AI_DIR,
+                               check=True, capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def prepare_environment(workdir):
+    """Keep every store the services open at import time out of the working tree."""
+    os.environ["RANKING_STATE_DB"] = os.path.join(workdir, "ranking_state.db")
+    os.environ["EMAIL_QUEUE_DB"] = os.path.join(workdir, "email_queue.db")
+    os.environ["INGESTION_QUEUE_DB"] = os.path.join(workdir, "ingestion_queue.db")
+    os.environ["RESUME_INDEX_DB"] = os.path.join(workdir, "resume_index.db")
+    os.environ["WARMUP_ON_STARTUP"] = "false"
+    sys.path.insert(0, AI_DIR)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(run, repeat, setup=None):
+    """Best and median wall time of `run` over `repeat` runs; `setup` runs untimed before each."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def quiet():
+    """Swallow the services' per-item prints, which would otherwise flood the output."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+class Suite:
+    def __init__(self, args, workdir):
+        self.args = args
+        self.workdir = workdir
+        self.results = []
+        self._app = None
+        self._matcher = None
+        self.index_resets = 0
+
+    def selected(self, name):
+        return not self.args.only or any(name.startswith(prefix) for prefix in self.args.only)
+
+    def record(self, name, size, items, run, setup=None):
+        if not self.selected(name):
+            return
+        try:
+            with quiet():
+                best, median = timed(run, self.args.repeat, setup)
+        except Exception as e:
+            self.skip(name, size, f"{type(e).__name__}: {e}")
+            return
+        result = {
+            "name": name,
+            "size": size,
+            "items": items,
+            "best_seconds": round(best, 6),
+            "median_seconds": round(median, 6),
+            "per_item_ms": round(best / items * 1000, 4),
+        }
+        self.results.append(result)
+        print(f"{name:<40} size={size!s:<7} items={items:<7} best={best:.4f}s "
+              f"per_item={result['per_item_ms']}ms", file=sys.stderr)
+
+    def skip(self, name, size, reason):
+        if self.selected(name):
+            self.results.append({"name": name, "size": size, "skipped": reason})
+            print(f"{name:<40} size={size!s:<7} skipped: {reason}", file=sys.stderr)
+
+    # Services are imported lazily so a missing dependency of one only skips its benchmarks
+
+    def app(self):
+        if self._app is None:
+            import app as app_module
+            from stubs import install_stubs
+            install_stubs(app_module)
+            app_module.RESUMES_JSON_FILE = os.path.join(self.workdir, "resumes_data.json")
+            self._app = app_module
+        return self._app
+
+    def matcher(self):
+        if self._matcher is None:
+            import resume_matcher
+            self._matcher = resume_matcher
+        return self._matcher
+
+    # Per-document paths
+
+    def run_documents(self, resumes):
+        import synthetic
+        texts = [synthetic.resume_text(resume) for resume in resumes]
+        pdfs = [synthetic.make_pdf(text) for text in texts]
+        count = len(texts)
+
+        try:
+            app = self.app()
+        except ImportError as e:
+            for name in ["pdf_extract", "spacy_parse", "spacy_extract_contact_info", "spacy_extract_skills",
+                         "spacy_extract_experience", "spacy_extract_education", "send_data", "send_data[known]",
+                         "parse_resume", "parse_resume[known]"]:
+                self.skip(name, None, f"app.py cannot be imported: {e}")
+            return
+
+        from fastapi import UploadFile
+        from fastapi.testclient import TestClient
+        from starlette.datastructures import Headers
+
+        def extract_all():
+            async def extract():
+                for pdf in pdfs:
+                    upload = UploadFile(file=io.BytesIO(pdf), filename="resume.pdf",
+                                        headers=Headers({"content-type": "application/pdf"}))
+                    await app.extract_text_from_pdf(upload)
+            asyncio.run(extract())
+
+        self.record("pdf_extract", None, count, extract_all)
+
+        client = TestClient(app.app)
+
+        def post_all(path):
+            def run():
+                for i, pdf in enumerate(pdfs):
+                    response = client.post(path, files={"file": (f"resume-{i}.pdf", pdf, "application/pdf")})
+                    if response.status_code != 200:
+                        raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+            return run
+
+        # /send-data rewrites the whole resumes file, so each run starts from an empty one, and
+        # from an empty resume index so every upload is processed
+        self.record("send_data", None, count, post_all("/send-data"), setup=self.reset_resumes_file)
+        self.record("send_data[known]", None, count, post_all("/send-data"))
+
+        try:
+            nlp = app.nlp.get()
+            app.nlp_matchers.get()
+        except Exception as e:
+            for name in ["spacy_parse", "spacy_extract_contact_info", "spacy_extract_skills",
+                         "spacy_extract_experience", "spacy_extract_education", "parse_resume", "parse_resume[known]"]:
+                self.skip(name, None, f"spaCy model unavailable: {e}")
+            return
+
+        self.record("spacy_parse", None, count, lambda: [nlp(text) for text in texts])
+        docs = [nlp(text) for text in texts]
+        for extractor in [app.extract_contact_info, app.extract_skills, app.extract_experience,
+                          app.extract_education]:
+            self.record(f"spacy_{extractor.__name__}", None, count,
+                        lambda extractor=extractor: [extractor(doc) for doc in docs])
+        self.record("parse_resume", None, count, post_all("/parse-resume/"), setup=self.reset_resume_index)
+        self.record("parse_resume[known]", None, count, post_all("/parse-resume/"))
+
+    def reset_resumes_file(self):
+        with open(self.app().RESUMES_JSON_FILE, "w") as f:
+            json.dump([], f)
+        self.reset_resume_index()
+
+    def reset_resume_index(self):
+        from resume_index import ResumeIndex
+        self.index_resets += 1
+        self.app().resume_index = ResumeIndex(os.path.join(self.workdir, f"resume_index-{self.index_resets}.db"))
+
+    # Pool-dependent paths
+
+    def run_matching(self, size, resumes, postings):
+        try:
+            rm = self.matcher()
+        except ImportError as e:
+            for name in ["match_candidates_to_job", "scorer_"]:
+                self.skip(name, size, f"resume_matcher cannot be imported: {e}")
+            return
+
+        jobs = [rm.job_from_posting(posting) for posting in postings]
+        job_description = jobs[0]
+        candidates = [rm.candidate_from_resume_item(resume) for resume in resumes]
+
+        def cold_caches():
+            # Every run ranks a job and resumes seen for the first time
+            rm._compiled_jobs.clear()
+            rm._chunk_embedding_cache.clear()
+
+        self.record("match_candidates_to_job", size, size,
+                    lambda: rm.match_candidates_to_job(job_description, candidates), setup=cold_caches)
+        self.record("match_candidates_to_job[no_semantic]", size, size,
+                    lambda: rm.match_candidates_to_job(job_description, candidates, {"semantic": 0}),
+                    setup=cold_caches)
+        # Items are job × candidate pairs
+        self.record("match_candidates_to_jobs", size, size * len(jobs),
+                    lambda: rm.match_candidates_to_jobs(jobs, candidates), setup=cold_caches)
+        self.record("match_candidates_to_jobs[no_semantic]", size, size * len(jobs),
+                    lambda: rm.match_candidates_to_jobs(jobs, candidates, weights={"semantic": 0}),
+                    setup=cold_caches)
+        self.record("match_candidates_to_jobs[per_job,no_semantic]", size, size * len(jobs),
+                    lambda: [rm.match_candidates_to_job(job, candidates, {"semantic": 0}) for job in jobs],
+                    setup=cold_caches)
+
+        compiled = rm.compile_job(job_description)
+        for name, scorer in sorted(rm.SCORERS.items(), key=lambda item: item[1].cost):
+            try:
+                # Job-side work (e.g. the job embedding) is compiled once, outside the timing
+                scorer.score_batch(candidates[:1], compiled)
+            except Exception as e:
+                self.skip(f"scorer_{name}", size, f"{type(e).__name__}: {e}")
+                continue
+            self.record(f"scorer_{name}", size, size,
+                        lambda scorer=scorer: scorer.score_batch(candidates, compiled),
+                        setup=rm._chunk_embedding_cache.clear)
+
+    def prepare_hiring_model(self):
+        """Train the benchmark model from candidate_data.csv into a temporary registry once."""
+        rm = self.matcher()
+        if rm.model_registry.active is not None:
+            return rm
+        import pandas as pd
+        from hiring_model import EnhancedHiringPredictor
+        from model_registry import publish_model
+
+        predictor = EnhancedHiringPredictor()
+        with quiet():
+            X, y = predictor.prepare_data(pd.read_csv(os.path.join(AI_DIR, "candidate_data.csv")))
+            predictor.build_pipeline()
+            predictor.pipeline.fit(X, y)
+            registry_dir = os.path.join(self.workdir, "registry")
+            publish_model(predictor.pipeline, {"purpose": "benchmark"}, registry_dir=registry_dir, activate=True)
+            rm.model_registry.registry_dir = registry_dir
+            rm.hiring_models.get()
+            rm.model_registry.refresh()
+        return rm
+
+    def run_prediction(self, size, payloads):
+        try:
+            rm = self.prepare_hiring_model()
+        except Exception as e:
+            for name in ["predict_hiring", "predict_hiring_batch"]:
+                self.skip(name, size, f"hiring model unavailable: {type(e).__name__}: {e}")
+            return
+
+        from fastapi.testclient import TestClient
+        client = TestClient(rm.app)
+        single = payloads[:self.args.requests]
+
+        def predict_each():
+            for payload in single:
+                response = client.post("/predict-hiring", json=payload)
+                if response.status_code != 200:
+                    raise RuntimeError(f"/predict-hiring returned {response.status_code}: {response.text[:200]}")
+
+        def predict_batches():
+            for start in range(0, len(payloads), PREDICT_CHUNK):
+                response = client.post("/predict-hiring/batch",
+                                       json={"candidates": payloads[start:start + PREDICT_CHUNK]})
+                if response.status_code != 200:
+                    raise RuntimeError(f"/predict-hiring/batch returned {response.status_code}")
+
+        self.record("predict_hiring", size, len(single), predict_each)
+        self.record("predict_hiring_batch", size, len(payloads), predict_batches)
+
+    def run_append(self, size, resumes, extra):
+        if not self.selected("append_resume_to_file"):
+            return
+        try:
+            app = self.app()
+        except ImportError as e:
+            self.skip("append_resume_to_file", size, f"app.py cannot be imported: {e}")
+            return
+
+        existing = [dict(resume, email=resume["personal_information"]["email"]) for resume in resumes]
+        new = [dict(resume, email=resume["personal_information"]["email"]) for resume in extra]
+
+        # Rewriting a large file is slow itself, so it is written once and copied before each run
+        filled = os.path.join(self.workdir, f"resumes_{size}.json")
+        with open(filled, "w") as f:
+            json.dump(existing, f, indent=2)
+
+        def fill():
+            shutil.copyfile(filled, app.RESUMES_JSON_FILE)
+
+        def append_all():
+            for resume in new:
+                if not app.append_resume_to_file(resume):
+                    raise RuntimeError("append_resume_to_file treated a new resume as a duplicate")
+
+        self.record("append_resume_to_file", size, len(new), append_all, setup=fill)
+
+    def run(self):
+        import synthetic
+        from hiring_features import requests_from_frame
+
+        largest = max(self.args.sizes)
+        resumes = synthetic.make_resumes(largest + max(self.args.docs, self.args.appends), self.args.seed)
+        pool, extra = resumes[:largest], resumes[largest:]
+        postings = synthetic.make_jobs(self.args.jobs, self.args.seed)
+        payloads = requests_from_frame(synthetic.make_hiring_frame(largest, self.args.seed))
+
+        self.run_documents(extra[:self.args.docs])
+        for size in self.args.sizes:
+            self.run_matching(size, pool[:size], postings)
+            self.run_prediction(size, payloads[:size])
+            self.run_append(size, pool[:size], extra[:self.args.appends])
+        return self.results
+
+
+def package_versions():
+    versions = {}
+    for name in ["numpy", "pandas", "scikit-learn", "xgboost", "fastapi", "spacy", "PyPDF2",
+                 "sentence-transformers", "onnxruntime"]:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def compare(base_path, head_path, threshold):
+    """Print per-item timings of two result files side by side; return the number of regressions."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+    base_results = {(r["name"], r["size"]): r for r in base["results"] if "per_item_ms" in r}
+
+    print(f"{'benchmark':<40} {'size':>7} {'base ms':>10} {'head ms':>10} {'change':>8}")
+    regressions = 0
+    for result in head["results"]:
+        key = (result["name"], result["size"])
+        if "per_item_ms" not in result or key not in base_results:
+            continue
+        before, after = base_results[key]["per_item_ms"], result["per_item_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{result['name']:<40} {result['size']!s:>7} {before:>10.4f} {after:>10.4f} {change:>+7.1f}%{flag}")
+    print(f"\n{base['meta']['commit']} -> {head['meta']['commit']}: {regressions} regression(s) above {threshold}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--docs", type=int, default=200, help="resumes for the per-document benchmarks")
+    parser.add_argument("--jobs", type=int, default=10, help="jobs for the many-to-many matching benchmarks")
+    parser.add_argument("--requests", type=int, default=500, help="single /predict-hiring requests per size")
+    parser.add_argument("--appends", type=int, default=5, help="resumes appended per size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name starts with one of these")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=10.0, help="slowdown in percent flagged by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    commit = git_commit()
+    with tempfile.TemporaryDirectory(prefix="screensmart-bench-") as workdir:
+        prepare_environment(workdir)
+        results = Suite(args, workdir).run()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "packages": package_versions(),
+            "environment": {name: os.getenv(name) for name in
+                            ["ENCODER_BACKEND", "ENCODER_THREADS", "SEMANTIC_POOLING", "METRICS_ENABLED"]},
+            "sizes": args.sizes,
+            "docs": args.docs,
+            "jobs": args.jobs,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+In-process stand-ins for Gemini and Supabase, so the parser service's code
+paths can be timed without network calls or API keys.
+
+    import app
+    install_stubs(app)
+
+replaces app.gemini, app.gemini_model and app.supabase with fakes. Gemini
+replies are built from the prompt (the resume text it embeds), so parsed
+resumes keep distinct emails; Supabase tables and storage live in memory.
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+from service_lifecycle import LazyResource
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+
+
+def gemini_reply(prompt: str) -> str:
+    """A plausible Gemini answer to one of app.py's prompts, as JSON text."""
+    if "enhance the extracted data" in prompt:
+        return json.dumps({
+            "resume_text": "Experienced developer building mobile and web applications.",
+            "job_description": "Mobile Application Developer",
+            "education": "Bachelor of Science in Information Technology",
+            "industry": "Information Technology",
+            "applied_job_title": "Mobile Application Developer",
+            "experience_years": 4.0,
+            "salary_expectation": 90000.0,
+            "skills": ["Flutter", "Kotlin", "Firebase", "Git"],
+            "corrections_made": [],
+        })
+    if "Analyze the following candidate information" in prompt:
+        return "```json\n" + json.dumps({
+            "strengths": ["Mobile development", "Backend integration", "Delivery"],
+            "improvements": ["Testing", "Cloud depth", "Documentation"],
+            "suitability": "Good fit for mobile engineering roles",
+        }) + "\n```"
+
+    lines = [line.strip() for line in prompt.split("RAW RESUME TEXT:")[-1].splitlines() if line.strip()]
+    email = _EMAIL_RE.search(prompt)
+    return json.dumps({
+        "personal_information": {"name": lines[0] if lines else "Unknown"},
+        "name": lines[0] if lines else "Unknown",
+        "email": email.group(0) if email else "",
+        "skills": {"technical": ["Flutter", "Kotlin", "Firebase"], "soft": ["Communication"]},
+        "ats_score": 80,
+    })
+
+
+class FakeGeminiResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """generate_content after an optional fixed latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def generate_content(self, prompt: str) -> FakeGeminiResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return FakeGeminiResponse(gemini_reply(prompt))
+
+
+class FakeGenai:
+    """The google.generativeai module surface app.py uses."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def GenerativeModel(self, name: str) -> FakeGeminiModel:
+        return FakeGeminiModel(self.latency)
+
+
+class FakeResult:
+    def __init__(self, data: List[Dict[str, Any]]):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.rows = None
+
+    def select(self, columns: str = "*") -> "FakeQuery":
+        return self
+
+    def eq(self, column: str, value) -> "FakeQuery":
+        self.filters.append((column, value))
+        return self
+
+    def insert(self, row: Dict[str, Any]) -> "FakeQuery":
+        self.rows = [row] if isinstance(row, dict) else list(row)
+        return self
+
+    def execute(self) -> FakeResult:
+        with self.client.lock:
+            table = self.client.tables.setdefault(self.table, [])
+            if self.rows is not None:
+                inserted = [{"id": str(uuid.uuid4()), **row} for row in self.rows]
+                table.extend(inserted)
+                return FakeResult(inserted)
+            return FakeResult([row for row in table
+                               if all(row.get(column) == value for column, value in self.filters)])
+
+
+class FakeBucket:
+    def __init__(self, client: "FakeSupabase", bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def upload(self, path: str, file: bytes, file_options: Dict[str, str] = None):
+        with self.client.lock:
+            self.client.objects[(self.bucket, path)] = file
+        return {"Key": f"{self.bucket}/{path}"}
+
+    def get_public_url(self, path: str) -> str:
+        return f"http://storage.local/{self.bucket}/{path}"
+
+
+class FakeStorage:
+    def __init__(self, client: "FakeSupabase"):
+        self.client = client
+
+    def from_(self, bucket: str) -> FakeBucket:
+        return FakeBucket(self.client, bucket)
+
+
+class FakeSupabase:
+    """In-memory tables and storage behind the supabase-py calls app.py makes."""
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.objects: Dict[tuple, bytes] = {}
+        self.lock = threading.Lock()
+        self.storage = FakeStorage(self)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+
+def install_stubs(app_module, gemini_latency: float = 0.0) -> FakeSupabase:
+    """Point a freshly imported app module at the fakes; returns the fake Supabase."""
+    genai = FakeGenai(gemini_latency)
+    client = FakeSupabase()
+    app_module.gemini = LazyResource("Gemini (stub)", lambda: genai)
+    app_module.gemini_model = LazyResource("Gemini model (stub)", lambda: genai.GenerativeModel("stub"))
+    app_module.supabase = LazyResource("Supabase client (stub)", lambda: client)
+    return client
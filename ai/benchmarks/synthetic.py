@@ -0,0 +1,236 @@
+"""
+Deterministic synthetic data for the benchmarks, shaped like the repo's own
+data: resumes and job postings like the entries of resumes_data.json, hiring
+rows like candidate_data.csv, and single-page text PDFs of the resumes. The
+same size and seed always give the same data, so timings are comparable
+between commits.
+"""
+import os
+import random
+import zlib
+from typing import Any, Dict, List
+
+import pandas as pd
+
+AI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CANDIDATE_CSV = os.path.join(AI_DIR, "candidate_data.csv")
+
+FIRST_NAMES = ["Amit", "Priya", "Gavin", "Sara", "Rahul", "Maria", "John", "Aisha", "Chen", "Lucas",
+               "Fatima", "Noah", "Ananya", "Diego", "Emma", "Kenji", "Olivia", "Ravi", "Zara", "Mateo"]
+LAST_NAMES = ["Sharma", "Soares", "Patel", "Garcia", "Smith", "Khan", "Wang", "Silva", "Iyer", "Brown",
+              "Nguyen", "Mueller", "Costa", "Reddy", "Johnson", "Ali", "Kim", "Rossi", "Das", "Lopez"]
+CITIES = ["Hyderabad, India", "Bengaluru, India", "Mumbai, India", "Remote", "San Francisco, CA",
+          "New York, NY", "London, UK", "Berlin, Germany", "Toronto, Canada", "Singapore"]
+COMPANIES = ["NexGen Apps", "BrightWave Technologies", "TechNova Solutions", "CloudPeak Systems",
+             "PixelForge Labs", "DataHarbor Inc", "BlueOrbit Software", "Quantum Leap Digital",
+             "GreenByte Solutions", "Skyline Mobile"]
+POSITIONS = ["Mobile Application Developer", "Software Engineer", "Frontend Developer",
+             "Backend Developer", "Full Stack Developer", "Android Developer", "iOS Developer",
+             "Senior Software Engineer", "Software Engineering Intern"]
+DEGREES = ["Bachelor of Science in Information Technology", "Bachelor of Technology in Computer Science",
+           "Master of Computer Applications", "Master of Science in Software Engineering",
+           "Bachelor of Engineering in Electronics"]
+UNIVERSITIES = ["Osmania University", "University of Mumbai", "Anna University", "Stanford University",
+                "University of Toronto", "National University of Singapore", "Delhi University"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+
+SKILLS = {
+    "mobile_development": ["Flutter", "Dart", "Kotlin", "Swift", "React Native", "Java", "Objective-C",
+                           "Jetpack Compose", "SwiftUI", "Ionic"],
+    "backend": ["Firebase", "Node.js", "FastAPI", "PostgreSQL", "Django", "Spring Boot", "MongoDB",
+                "GraphQL", "Redis", "Express.js", "MySQL"],
+    "tools": ["Git", "Jenkins", "Docker", "Jira", "Android Studio", "Xcode", "Figma", "Webpack",
+              "Postman", "Kubernetes"],
+    "cloud": ["AWS", "Google Cloud", "Azure", "Firebase", "Heroku"],
+}
+FRONTEND_SKILLS = ["React.js", "TypeScript", "Next.js", "Redux", "Context API", "CSS-in-JS", "SASS",
+                   "Tailwind CSS", "Vue.js", "Angular", "JavaScript", "HTML5"]
+SOFT_SKILLS = ["Problem-solving", "Team collaboration", "Agile methodologies", "Communication",
+               "Mentoring", "Time management"]
+
+RESPONSIBILITIES = [
+    "Designed and developed cross-platform mobile applications using {skill} and {skill2}.",
+    "Integrated {skill} for real-time database management and push notifications.",
+    "Implemented CI/CD pipelines with {skill}, reducing deployment time by {pct}%.",
+    "Worked on UI/UX optimization, increasing user engagement by {pct}%.",
+    "Developed enterprise-level applications using {skill} and {skill2}.",
+    "Integrated RESTful APIs built with {skill} for seamless backend communication.",
+    "Optimized app performance, reducing crash rates by {pct}%.",
+    "Mentored junior developers and conducted code reviews on {skill} projects.",
+]
+PROJECTS = ["HealthSync", "EduBridge", "ShopSwift", "TravelMate", "FinTrack", "MediConnect",
+            "FoodieHub", "TaskFlow"]
+JOB_TITLES = ["Senior Frontend Developer (React.js)", "Mobile Application Developer (Flutter)",
+              "Backend Engineer (Python)", "Android Developer", "Full Stack Engineer",
+              "iOS Developer (Swift)", "Platform Engineer", "Software Engineer II"]
+JOB_RESPONSIBILITIES = [
+    "Develop and maintain high-quality {skill} applications",
+    "Optimize components for maximum performance",
+    "Collaborate with UX designers to implement pixel-perfect interfaces",
+    "Mentor junior developers and conduct code reviews",
+    "Participate in architectural decision-making",
+    "Build and operate services with {skill} and {skill2}",
+    "Own the release pipeline and automated testing with {skill}",
+]
+
+
+def _sample(rng: random.Random, values: List[str], low: int, high: int) -> List[str]:
+    return rng.sample(values, rng.randint(low, min(high, len(values))))
+
+
+def _fill(rng: random.Random, template: str, skills: List[str]) -> str:
+    skill, skill2 = rng.sample(skills, 2) if len(skills) >= 2 else (skills * 2 or ["Git", "Git"])[:2]
+    return template.format(skill=skill, skill2=skill2, pct=rng.randint(10, 60))
+
+
+def make_resume(rng: random.Random, index: int) -> Dict[str, Any]:
+    """One resumes_data.json candidate entry; the email is unique per index."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = {category: _sample(rng, values, 2, 6) for category, values in SKILLS.items()}
+    all_skills = [skill for values in skills.values() for skill in values]
+
+    work_experience = []
+    end_year = 2024
+    for _ in range(rng.randint(1, 3)):
+        start_year = end_year - rng.randint(1, 4)
+        work_experience.append({
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(CITIES),
+            "position": rng.choice(POSITIONS),
+            "start_date": f"{rng.choice(MONTHS)} {start_year}",
+            "end_date": "Present" if not work_experience else f"{rng.choice(MONTHS)} {end_year}",
+            "responsibilities": [_fill(rng, template, all_skills)
+                                 for template in rng.sample(RESPONSIBILITIES, rng.randint(2, 4))],
+        })
+        end_year = start_year
+
+    return {
+        "personal_information": {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{index}@example.com",
+            "phone": f"+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}",
+            "linkedin": f"linkedin.com/in/{first.lower()}{last.lower()}{index}",
+            "location": rng.choice(CITIES),
+        },
+        "education": [{
+            "degree": rng.choice(DEGREES),
+            "university": rng.choice(UNIVERSITIES),
+            "location": rng.choice(CITIES),
+            "graduation_year": end_year,
+            "cgpa": round(rng.uniform(6.5, 9.8), 1),
+        }],
+        "work_experience": work_experience,
+        "skills": skills,
+        "certifications": [{"name": f"{skill} Certified Developer", "year": rng.randint(2018, 2024)}
+                           for skill in rng.sample(all_skills, rng.randint(0, 2))],
+        "projects": [{
+            "name": name,
+            "description": f"{rng.choice(['Mobile', 'Web', 'AI-Powered'])} app ({', '.join(rng.sample(all_skills, 2))})",
+            "details": [_fill(rng, template, all_skills) for template in rng.sample(RESPONSIBILITIES, 2)],
+        } for name in rng.sample(PROJECTS, rng.randint(1, 2))],
+        "ats_score": rng.randint(55, 95),
+    }
+
+
+def make_resumes(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_resume(rng, index) for index in range(count)]
+
+
+def make_job(rng: random.Random, index: int) -> Dict[str, Any]:
+    """One resumes_data.json job posting entry."""
+    pool = FRONTEND_SKILLS + [skill for values in SKILLS.values() for skill in values]
+    required = rng.sample(pool, 8)
+    return {
+        "job_description": {
+            "company_name": rng.choice(COMPANIES),
+            "industry": "Information Technology & Services",
+            "work_type": rng.choice(["Full-time", "Contract", "Part-time"]),
+            "location": rng.choice(CITIES),
+            "applied_job_title": rng.choice(JOB_TITLES),
+            "offered_salary": {"min": 90000, "max": 150000, "currency": "USD", "period": "yearly"},
+            "required_skills": {
+                "core_technologies": required[:3],
+                "state_management": required[3:5],
+                "styling": required[5:8],
+                "soft_skills": rng.sample(SOFT_SKILLS, 3),
+                "experience_requirements": {"minimum_years": rng.randint(1, 8)},
+            },
+            "job_responsibilities": [_fill(rng, template, required)
+                                     for template in rng.sample(JOB_RESPONSIBILITIES, 5)],
+        },
+        "metadata": {"posting_date": "2024-01-15", "job_id": f"job-{index}"},
+    }
+
+
+def make_jobs(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed + 1)
+    return [make_job(rng, index) for index in range(count)]
+
+
+def resume_text(resume: Dict[str, Any]) -> str:
+    """Plain-text rendering of a synthetic resume, laid out like a typical PDF resume."""
+    info = resume["personal_information"]
+    lines = [info["name"], f"{info['email']} | {info['phone']} | {info['location']}", "", "Experience"]
+    for job in resume["work_experience"]:
+        lines.append(f"{job['position']} at {job['company']} {job['start_date']} - {job['end_date']}")
+        lines.extend(f"- {item}" for item in job["responsibilities"])
+    lines += ["", "Education"]
+    for education in resume["education"]:
+        lines.append(f"{education['degree']}, {education['university']} {education['graduation_year']}")
+    lines += ["", "Skills"]
+    for category, values in resume["skills"].items():
+        lines.append(f"{category.replace('_', ' ').title()}: {', '.join(values)}")
+    lines += ["", "Projects"]
+    for project in resume["projects"]:
+        lines.append(f"{project['name']}: {project['description']}")
+        lines.extend(f"- {item}" for item in project["details"])
+    return "\n".join(lines)
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str) -> bytes:
+    """A single-page PDF showing `text` line by line in Helvetica, with a compressed content stream."""
+    content = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+    for line in text.splitlines():
+        content.append(f"({_pdf_escape(line)}) Tj T*")
+    content.append("ET")
+    stream = zlib.compress("\n".join(content).encode("latin-1"))
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+def make_hiring_frame(count: int, seed: int = 0, source: str = CANDIDATE_CSV) -> pd.DataFrame:
+    """
+    candidate_data.csv-shaped rows, each column sampled independently from
+    the real file so values and missing-value rates match it.
+    """
+    df = pd.read_csv(source)
+    sampled = pd.DataFrame({
+        column: df[column].sample(count, replace=True, random_state=seed + i).to_numpy()
+        for i, column in enumerate(df.columns)
+    })
+    sampled["Candidate_ID"] = [f"CAND_{index}" for index in range(count)]
+    return sampled
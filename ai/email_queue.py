@@ -0,0 +1,283 @@
+"""
+Outbound email queue backed by SQLite and a dispatcher that reuses one
+authenticated SMTP session for many messages.
+
+Messages are persisted before anything is sent, so a crash or restart never
+loses a confirmation email. The dispatcher claims messages in batches, keeps
+the SMTP connection open between batches (closing it after an idle period),
+throttles to a configurable send rate and retries transient failures with
+exponential backoff. Delivery status can be queried by message id.
+
+For local testing, point the dispatcher at an aiosmtpd stand-in:
+
+    python -m aiosmtpd -n -l localhost:8025
+    SMTP_SERVER=localhost SMTP_PORT=8025 SMTP_STARTTLS=false SENDER_EMAIL=noreply@example.com
+"""
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional
+
+from sqlite_store import ProcessLocalConnection, process_alive
+
+EMAIL_QUEUE_DB = os.getenv("EMAIL_QUEUE_DB", "email_queue.db")
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_RETRY = "retry"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+class EmailQueue:
+    """Durable FIFO of outbound emails stored in a SQLite database."""
+
+    def __init__(self, db_path: str = EMAIL_QUEUE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = ProcessLocalConnection(db_path, row_factory=sqlite3.Row)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbound_emails (
+                id TEXT PRIMARY KEY,
+                email_to TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                content TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                worker_pid INTEGER,
+                next_attempt_at REAL NOT NULL,
+                created_at TEXT NOT NULL,
+                sent_at TEXT
+            )
+            """
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(outbound_emails)")}
+        if "worker_pid" not in columns:
+            # Databases created before claims recorded their process
+            self._conn.execute("ALTER TABLE outbound_emails ADD COLUMN worker_pid INTEGER")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbound_emails_pending "
+            "ON outbound_emails (status, next_attempt_at)"
+        )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._connection()
+
+    def enqueue(self, email_to: str, subject: str, content: str) -> str:
+        """Persist a message and return its id."""
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outbound_emails (id, email_to, subject, content, status, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (message_id, email_to, subject, content, STATUS_QUEUED, time.time(), datetime.now().isoformat())
+            )
+        return message_id
+
+    def claim_batch(self, limit: int) -> List[Dict[str, Any]]:
+        """Atomically mark up to `limit` due messages as sending and return them."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT * FROM outbound_emails WHERE status IN (?, ?) AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (STATUS_QUEUED, STATUS_RETRY, time.time(), limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbound_emails SET status = ?, worker_pid = ? WHERE id = ?",
+                    [(STATUS_SENDING, os.getpid(), row["id"]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, message_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbound_emails SET status = ?, attempts = attempts + 1, last_error = NULL, sent_at = ? "
+                "WHERE id = ?",
+                (STATUS_SENT, datetime.now().isoformat(), message_id)
+            )
+
+    def mark_failed(self, message_id: str, error: str, retry_in: Optional[float] = None):
+        """Record a failed attempt; schedule a retry unless `retry_in` is None."""
+        status = STATUS_FAILED if retry_in is None else STATUS_RETRY
+        next_attempt_at = time.time() + (retry_in or 0)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbound_emails SET status = ?, attempts = attempts + 1, last_error = ?, next_attempt_at = ? "
+                "WHERE id = ?",
+                (status, error, next_attempt_at, message_id)
+            )
+
+    def requeue_inflight(self) -> int:
+        """
+        Return messages left in `sending` by a stopped or crashed dispatcher to
+        the queue. Messages claimed by processes still alive are left alone.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, worker_pid FROM outbound_emails WHERE status = ?", (STATUS_SENDING,)
+            ).fetchall()
+            orphaned = [(STATUS_QUEUED, row["id"]) for row in rows if not process_alive(row["worker_pid"])]
+            self._conn.executemany(
+                "UPDATE outbound_emails SET status = ?, worker_pid = NULL WHERE id = ?", orphaned
+            )
+        return len(orphaned)
+
+    def get_status(self, message_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, email_to, subject, status, attempts, last_error, created_at, sent_at "
+                "FROM outbound_emails WHERE id = ?",
+                (message_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+
+class EmailDispatcher:
+    """Background worker that drains an EmailQueue over a pooled SMTP session."""
+
+    def __init__(
+        self,
+        queue: EmailQueue,
+        batch_size: int = int(os.getenv("EMAIL_BATCH_SIZE", "20")),
+        rate_per_second: float = float(os.getenv("EMAIL_RATE_PER_SECOND", "5")),
+        max_attempts: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5")),
+        backoff_base: float = float(os.getenv("EMAIL_BACKOFF_SECONDS", "30")),
+        backoff_max: float = 3600.0,
+        idle_timeout: float = 60.0,
+        poll_interval: float = 1.0
+    ):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.min_interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+
+        self.email_from = os.getenv("SENDER_EMAIL")
+        self.email_password = os.getenv("SMTP_PASSWORD")
+        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
+        self.use_starttls = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
+
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._last_send = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        requeued = self.queue.requeue_inflight()
+        if requeued:
+            print(f"Requeued {requeued} emails left in flight by a previous run")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._disconnect()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self._server is not None:
+            return self._server
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
+        if self.use_starttls:
+            server.starttls()
+        if self.email_password:
+            server.login(self.email_from, self.email_password)
+        self._server = server
+        return server
+
+    def _disconnect(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
+
+    def _throttle(self):
+        wait = self._last_send + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_send = time.monotonic()
+
+    def _build_message(self, email: Dict[str, Any]) -> MIMEMultipart:
+        message = MIMEMultipart()
+        message["From"] = self.email_from
+        message["To"] = email["email_to"]
+        message["Subject"] = email["subject"]
+        message.attach(MIMEText(email["content"], "html"))
+        return message
+
+    def _send(self, email: Dict[str, Any]):
+        message = self._build_message(email)
+        try:
+            self._connect().send_message(message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # The pooled session went stale between batches; reconnect once
+            self._disconnect()
+            self._connect().send_message(message)
+        self._last_used = time.monotonic()
+
+    def _retry_delay(self, attempts: int) -> Optional[float]:
+        if attempts + 1 >= self.max_attempts:
+            return None
+        return min(self.backoff_base * (2 ** attempts), self.backoff_max)
+
+    def _process_batch(self, batch: List[Dict[str, Any]]):
+        for email in batch:
+            self._throttle()
+            try:
+                self._send(email)
+                self.queue.mark_sent(email["id"])
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+                # Permanent rejections will not succeed on retry
+                self.queue.mark_failed(email["id"], str(e))
+            except Exception as e:
+                self._disconnect()
+                self.queue.mark_failed(email["id"], str(e), self._retry_delay(email["attempts"]))
+                print(f"Failed to send email {email['id']} to {email['email_to']}: {str(e)}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.email_from:
+                print("Email credentials not properly configured in environment variables")
+                self._stop.wait(self.poll_interval * 30)
+                continue
+
+            try:
+                batch = self.queue.claim_batch(self.batch_size)
+            except Exception as e:
+                print(f"Failed to claim email batch: {str(e)}")
+                batch = []
+
+            if batch:
+                self._process_batch(batch)
+                continue
+
+            if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self._disconnect()
+            self._stop.wait(self.poll_interval)
@@ -0,0 +1,100 @@
+"""
+Compiled, auto-escaping templates for candidate emails.
+
+Templates are compiled once at import time and reused for every render, so
+producing a confirmation email is a single pass over the candidate data
+instead of repeated string concatenation. All interpolated values are
+HTML-escaped.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, StrictUndefined
+
+CONFIRMATION_SUBJECT = "Application Confirmation - Please Review Your Details"
+
+CONFIRMATION_TEMPLATE = """
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; border-radius: 10px;">
+                <h2 style="color: #2c3e50; border-bottom: 1px solid #eee; padding-bottom: 10px;">Application Confirmation</h2>
+
+                <p>Dear {{ name }},</p>
+
+                <p>Thank you for submitting your application to our system. Please review the information you've provided below:</p>
+
+                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                    <p style="margin: 0; font-weight: bold;">Application Details:</p>
+                    <p><strong>Submission Date:</strong> {{ submission_date }}</p>
+                    {% if position is not none %}<p><strong>Position Applied For:</strong> {{ position }}</p>{% endif %}
+
+                    {% if personal_info %}<h3>Personal Information</h3><ul>
+                    {%- for key, value in personal_info.items() %}<li><strong>{{ key|label }}:</strong> {{ value }}</li>{% endfor -%}
+                    </ul>{% endif %}
+
+                    {% if education is not none %}<h3>Education</h3><ul>
+                    {%- for edu in education %}<li>{% for key, value in edu.items() %}<strong>{{ key|label }}:</strong> {{ value }}<br>{% endfor %}</li>{% endfor -%}
+                    </ul>{% endif %}
+
+                    {% if experience is not none %}<h3>Work Experience</h3><ul>
+                    {%- for exp in experience %}<li>{% for key, value in exp.items() %}<strong>{{ key|label }}:</strong> {{ value }}<br>{% endfor %}</li>{% endfor -%}
+                    </ul>{% endif %}
+
+                    {% if skills is not none %}<h3>Skills</h3><ul>
+                    {%- for skill in skills %}<li>{{ skill }}</li>{% endfor -%}
+                    </ul>{% endif %}
+                </div>
+
+                <p>If any information is incorrect or incomplete, please contact us immediately at <a href="mailto:support@example.com">support@example.com</a>.</p>
+
+                <p>Our team will review your application and reach out to you soon regarding the next steps.</p>
+
+                <p>Best regards,<br>Recruitment Team</p>
+            </div>
+        </body>
+        </html>
+        """
+
+
+def _label(key: Any) -> str:
+    """Turn a snake_case field name into a human readable label."""
+    return str(key).replace('_', ' ').title()
+
+
+_env = Environment(autoescape=True, undefined=StrictUndefined)
+_env.filters["label"] = _label
+_confirmation_template = _env.from_string(CONFIRMATION_TEMPLATE)
+
+
+def _confirmation_context(candidate_data: Dict[str, Any], submission_date: str) -> Dict[str, Any]:
+    personal_info = candidate_data.get("personal_information", {})
+    return {
+        "name": personal_info.get("name", "Candidate"),
+        "submission_date": submission_date,
+        "position": candidate_data.get("position"),
+        "personal_info": personal_info,
+        "education": candidate_data.get("education"),
+        "experience": candidate_data.get("experience"),
+        "skills": candidate_data.get("skills"),
+    }
+
+
+def render_confirmation_email(candidate_data: Dict[str, Any],
+                              submission_date: Optional[str] = None) -> Tuple[str, str]:
+    """Render the confirmation email for one candidate, returning (subject, html)."""
+    if submission_date is None:
+        submission_date = datetime.now().strftime('%Y-%m-%d %H:%M')
+    html = _confirmation_template.render(_confirmation_context(candidate_data, submission_date))
+    return CONFIRMATION_SUBJECT, html
+
+
+def render_confirmation_emails(candidates: List[Dict[str, Any]],
+                               submission_date: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Render confirmation emails for many candidates with a shared submission date."""
+    if submission_date is None:
+        submission_date = datetime.now().strftime('%Y-%m-%d %H:%M')
+    render = _confirmation_template.render
+    return [
+        (CONFIRMATION_SUBJECT, render(_confirmation_context(candidate_data, submission_date)))
+        for candidate_data in candidates
+    ]
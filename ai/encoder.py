@@ -0,0 +1,126 @@
+"""
+Sentence encoder used for semantic matching, with a selectable backend.
+
+    ENCODER_BACKEND=torch      full-precision PyTorch (default)
+    ENCODER_BACKEND=onnx       the same model exported to ONNX, run by onnxruntime
+    ENCODER_BACKEND=onnx-int8  dynamically int8-quantized ONNX export
+
+ENCODER_THREADS sets the intra-op thread count (0 keeps the runtime default)
+and ENCODER_ONNX_FILE picks another ONNX file from the model repository or
+a local export. Every backend returns the same `encode` API, so callers do
+not change. Check how far a backend drifts from the fp32 embeddings with:
+
+    python encoder.py check onnx-int8 [candidate_data.csv]
+    python encoder.py export-int8 models/encoder_int8 [avx2|avx512|avx512_vnni|arm64]
+"""
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+ENCODER_MODEL = os.getenv("ENCODER_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", "0"))
+ENCODER_ONNX_FILE = os.getenv("ENCODER_ONNX_FILE")
+
+# ONNX files published alongside the model; the avx2 build runs on any x86-64 server
+ONNX_FILES = {
+    "onnx": "onnx/model.onnx",
+    "onnx-int8": "onnx/model_quint8_avx2.onnx",
+}
+BACKENDS = ["torch"] + list(ONNX_FILES)
+
+# Lowest acceptable cosine between a backend's embedding and the fp32 one
+DRIFT_MIN_COSINE = 0.99
+
+
+def load_encoder(backend: str = ENCODER_BACKEND, threads: int = ENCODER_THREADS,
+                 model_name: str = ENCODER_MODEL, onnx_file: Optional[str] = ENCODER_ONNX_FILE) -> "SentenceTransformer":
+    """
+    Load the sentence encoder on the requested backend. sentence_transformers
+    (and torch) are imported here rather than at module import.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        return SentenceTransformer(model_name)
+
+    if backend in ONNX_FILES:
+        import onnxruntime as ort
+        session_options = ort.SessionOptions()
+        if threads:
+            session_options.intra_op_num_threads = threads
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs={
+            "file_name": onnx_file or ONNX_FILES[backend],
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options,
+        })
+
+    raise ValueError(f"Unknown encoder backend {backend}; expected one of {BACKENDS}")
+
+
+def export_int8_encoder(output_dir: str, quantization: str = "avx2", model_name: str = ENCODER_MODEL) -> List[str]:
+    """
+    Export the encoder to ONNX and quantize it locally, for hosts that cannot
+    download the published ONNX files. Returns the written ONNX file paths,
+    relative to output_dir, for use as ENCODER_MODEL/ENCODER_ONNX_FILE.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save(output_dir)
+    export_dynamic_quantized_onnx_model(model, quantization, output_dir)
+    onnx_dir = os.path.join(output_dir, "onnx")
+    return sorted(os.path.join("onnx", name) for name in os.listdir(onnx_dir) if name.endswith(".onnx"))
+
+
+def embedding_drift(reference: "SentenceTransformer", candidate: "SentenceTransformer",
+                    texts: List[str]) -> Dict[str, Any]:
+    """
+    Compare a backend's embeddings with the reference (fp32) ones: cosine
+    between the two embeddings of each text, and the largest change of any
+    pairwise similarity expressed in match-score points (0-100).
+    """
+    expected = reference.encode(texts, normalize_embeddings=True)
+    actual = candidate.encode(texts, normalize_embeddings=True)
+    cosines = np.sum(expected * actual, axis=1)
+    similarity_diff = np.abs(expected @ expected.T - actual @ actual.T) * 100
+    return {
+        "texts": len(texts),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "max_similarity_diff": float(similarity_diff.max()),
+        "passed": bool(cosines.min() >= DRIFT_MIN_COSINE),
+    }
+
+
+def sample_texts(csv_path: str, limit: int = 500) -> List[str]:
+    """Resume and job description texts from a hiring-model training CSV."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, usecols=['Resume_Text', 'Job_Description'])
+    texts = pd.concat([df['Resume_Text'], df['Job_Description']]).dropna().astype(str)
+    return texts.drop_duplicates().head(limit).tolist()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "check" and len(sys.argv) >= 3:
+        texts = sample_texts(sys.argv[3] if len(sys.argv) > 3 else 'candidate_data.csv')
+        drift = embedding_drift(load_encoder("torch"), load_encoder(sys.argv[2]), texts)
+        print(drift)
+        sys.exit(0 if drift["passed"] else 1)
+    elif command == "export-int8" and len(sys.argv) >= 3:
+        quantization = sys.argv[3] if len(sys.argv) > 3 else "avx2"
+        for path in export_int8_encoder(sys.argv[2], quantization):
+            print(path)
+    else:
+        print(__doc__)
+        sys.exit(1)
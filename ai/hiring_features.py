@@ -0,0 +1,312 @@
+"""
+Feature engineering shared by hiring-model training (hiring_model.py) and
+serving (/predict-hiring in resume_matcher.py).
+
+Both sides must build identical features for the model to see at serving
+time what it saw during training, so every transformation lives here once.
+Run this module against a training CSV to check that serving a training row
+reproduces its training features exactly:
+
+    python hiring_features.py candidate_data.csv
+"""
+import bisect
+import math
+import re
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+INPUT_COLUMNS = [
+    'Resume_Text', 'Job_Description', 'Skills', 'Required_Skills',
+    'Experience (Years)', 'Offered_Salary', 'Salary_Expectation',
+    'Education', 'Industry', 'Location',
+    'Applied_Job_Title', 'Work_Type'
+]
+TARGET_COLUMN = 'Hired'
+NUMERIC_COLUMNS = ['Experience (Years)', 'Offered_Salary', 'Salary_Expectation']
+CATEGORICAL_COLUMNS = ['Education', 'Industry', 'Location', 'Applied_Job_Title', 'Work_Type']
+TEXT_FEATURES = ['Resume_Text_Clean', 'Job_Description_Clean']
+NUMERIC_FEATURES = ['Experience (Years)', 'Skill_Match_Score', 'Salary_Diff_Percentage']
+CATEGORICAL_FEATURES = CATEGORICAL_COLUMNS + ['Experience_Level']
+FEATURES = [
+    'Resume_Text_Clean', 'Job_Description_Clean',
+    'Experience (Years)', 'Skill_Match_Score',
+    'Salary_Diff_Percentage',
+    'Education', 'Industry', 'Location',
+    'Applied_Job_Title', 'Work_Type',
+    'Experience_Level'
+]
+
+EXPERIENCE_BINS = [-1, 1, 3, 5, 8, 15, np.inf]
+EXPERIENCE_LABELS = ['Entry', 'Junior', 'Mid', 'Senior', 'Expert', 'Leadership']
+
+NON_ALPHA_PATTERN = r'[^a-zA-Z\s]'
+WHITESPACE_PATTERN = r'\s+'
+_non_alpha_re = re.compile(NON_ALPHA_PATTERN)
+
+
+def clean_text(text: Any) -> str:
+    """Lowercase, keep only letters and whitespace, and collapse whitespace."""
+    if not isinstance(text, str):
+        return ""
+    return ' '.join(_non_alpha_re.sub('', text.lower()).split())
+
+
+def skill_match(candidate_skills: Any, required_skills: Any) -> float:
+    """Fraction of the comma-separated required skills covered by the candidate."""
+    if not isinstance(candidate_skills, str) or not isinstance(required_skills, str):
+        return 0.0
+
+    candidate_skills_list = [s.strip().lower() for s in candidate_skills.split(',')]
+    required_skills_list = [s.strip().lower() for s in required_skills.split(',')]
+
+    if not required_skills_list:
+        return 1.0
+
+    matches = sum(1 for skill in candidate_skills_list if skill in required_skills_list)
+
+    return matches / len(required_skills_list) if len(required_skills_list) > 0 else 0.0
+
+
+def clean_text_series(texts: pd.Series) -> pd.Series:
+    """Vectorized clean_text over a column."""
+    return (
+        texts.str.lower()
+        .str.replace(NON_ALPHA_PATTERN, '', regex=True)
+        .str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+        .str.strip()
+        .fillna('')
+    )
+
+
+def skill_match_series(candidate_skills: pd.Series, required_skills: pd.Series) -> pd.Series:
+    """
+    Vectorized skill_match. Skill strings repeat heavily, so each distinct
+    string is split once; the exploded skills of every distinct
+    (candidate, required) pair are then matched with set joins.
+    """
+    candidate_codes, candidate_uniques = pd.factorize(candidate_skills)
+    required_codes, required_uniques = pd.factorize(required_skills)
+
+    candidate = pd.Series(candidate_uniques, dtype=object).str.lower().str.split(',').explode().str.strip()
+    required = pd.Series(required_uniques, dtype=object).str.lower().str.split(',')
+    required_counts = required.str.len().to_numpy(dtype=float)
+    required = required.explode().str.strip()
+
+    candidate = pd.DataFrame({'candidate': candidate.index, 'skill': candidate.to_numpy()}).dropna()
+    required = pd.DataFrame({'required': required.index, 'skill': required.to_numpy()}).dropna().drop_duplicates()
+
+    pairs = pd.DataFrame({'candidate': candidate_codes, 'required': required_codes})
+    pairs = pairs[(pairs['candidate'] >= 0) & (pairs['required'] >= 0)].drop_duplicates()
+    matches = (
+        pairs.merge(candidate, on='candidate')
+        .merge(required, on=['required', 'skill'])
+        .groupby(['candidate', 'required'])
+        .size()
+    )
+    pairs['score'] = (
+        matches.reindex(pd.MultiIndex.from_frame(pairs[['candidate', 'required']]), fill_value=0).to_numpy()
+        / required_counts[pairs['required'].to_numpy()]
+    )
+
+    scores = pd.DataFrame({'candidate': candidate_codes, 'required': required_codes}).merge(
+        pairs, on=['candidate', 'required'], how='left'
+    )['score']
+    return pd.Series(scores.fillna(0.0).to_numpy(), index=candidate_skills.index)
+
+
+_SALARY_AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(?:([kKmM])(?![a-zA-Z]))?')
+_SALARY_MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_salary(value: Any) -> Optional[float]:
+    """
+    A single salary figure from the forms jobs and candidates store it in:
+    numbers, {"min": .., "max": ..} objects and strings like "$120k - $150k"
+    or "120,000". Ranges give their midpoint; None if no amount is found.
+    """
+    if isinstance(value, dict):
+        amounts = [parse_salary(value.get(key)) for key in ('min', 'max')]
+        amounts = [amount for amount in amounts if amount is not None]
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None if math.isnan(value) else float(value)
+    elif isinstance(value, str):
+        amounts = [
+            float(number.replace(',', '')) * _SALARY_MULTIPLIERS.get(suffix.lower(), 1)
+            for number, suffix in _SALARY_AMOUNT_RE.findall(value)
+        ]
+    else:
+        return None
+    return sum(amounts) / len(amounts) if amounts else None
+
+
+def numeric_medians(df: pd.DataFrame) -> Dict[str, float]:
+    return {col: pd.to_numeric(df[col], errors='coerce').median() for col in NUMERIC_COLUMNS}
+
+
+def build_features(df: pd.DataFrame, medians: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Build the model feature frame from raw input columns. Missing numeric
+    values are filled with `medians` (or the frame's own medians).
+    """
+    missing_columns = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing columns: {missing_columns}")
+
+    X = pd.DataFrame(index=df.index)
+    X['Resume_Text_Clean'] = clean_text_series(df['Resume_Text'].fillna(''))
+    X['Job_Description_Clean'] = clean_text_series(df['Job_Description'].fillna(''))
+
+    numeric = {}
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors='coerce')
+        numeric[col] = values.fillna(medians[col] if medians else values.median())
+
+    X['Experience (Years)'] = numeric['Experience (Years)']
+    X['Skill_Match_Score'] = skill_match_series(df['Skills'].fillna(''), df['Required_Skills'].fillna(''))
+
+    salary_diff = (numeric['Offered_Salary'] - numeric['Salary_Expectation']) / numeric['Salary_Expectation'] * 100
+    # A zero expectation leaves the difference undefined, like 0/0: both are filled with 0
+    X['Salary_Diff_Percentage'] = salary_diff.replace([np.inf, -np.inf], np.nan).fillna(0)
+
+    for col in CATEGORICAL_COLUMNS:
+        X[col] = df[col].astype('category')
+
+    X['Experience_Level'] = pd.cut(numeric['Experience (Years)'], bins=EXPERIENCE_BINS, labels=EXPERIENCE_LABELS)
+
+    return X[FEATURES]
+
+
+def frame_from_requests(requests: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Map /predict-hiring request payloads onto the raw training columns."""
+    return pd.DataFrame({
+        'Resume_Text': [r['resume_text'] for r in requests],
+        'Job_Description': [r['job_description'] for r in requests],
+        'Skills': [', '.join(r['skills']) for r in requests],
+        'Required_Skills': [', '.join(r['required_skills']) for r in requests],
+        'Experience (Years)': [r['experience_years'] for r in requests],
+        'Offered_Salary': [r['offered_salary'] for r in requests],
+        'Salary_Expectation': [r['salary_expectation'] for r in requests],
+        'Education': [r['education'] for r in requests],
+        'Industry': [r['industry'] for r in requests],
+        'Location': [r['location'] for r in requests],
+        'Applied_Job_Title': [r['applied_job_title'] for r in requests],
+        'Work_Type': [r['work_type'] for r in requests],
+    })
+
+
+def experience_level(years: float) -> Optional[str]:
+    """Scalar equivalent of the pd.cut binning used in build_features."""
+    if years is None or math.isnan(years):
+        return None
+    index = bisect.bisect_left(EXPERIENCE_BINS, years) - 1
+    return EXPERIENCE_LABELS[index] if 0 <= index < len(EXPERIENCE_LABELS) else None
+
+
+def salary_diff_percentage(offered_salary: float, salary_expectation: float) -> float:
+    """Scalar equivalent of the salary difference column, including its x/0 -> 0 fill."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = float((np.float64(offered_salary) - np.float64(salary_expectation)) / np.float64(salary_expectation) * 100)
+    return value if math.isfinite(value) else 0.0
+
+
+def build_feature_records(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build model features straight from /predict-hiring payloads without going
+    through a DataFrame. Produces the same values as
+    build_features(frame_from_requests(requests)).
+    """
+    records = []
+    for r in requests:
+        experience_years = float(r['experience_years'])
+        records.append({
+            'Resume_Text_Clean': clean_text(r['resume_text']),
+            'Job_Description_Clean': clean_text(r['job_description']),
+            'Experience (Years)': experience_years,
+            'Skill_Match_Score': skill_match(', '.join(r['skills']), ', '.join(r['required_skills'])),
+            'Salary_Diff_Percentage': salary_diff_percentage(r['offered_salary'], r['salary_expectation']),
+            'Education': r['education'],
+            'Industry': r['industry'],
+            'Location': r['location'],
+            'Applied_Job_Title': r['applied_job_title'],
+            'Work_Type': r['work_type'],
+            'Experience_Level': experience_level(experience_years),
+        })
+    return records
+
+
+def requests_from_frame(df: pd.DataFrame, medians: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Express training rows as /predict-hiring payloads, the way a client would
+    send them: skills as lists and numeric gaps already filled.
+    """
+    medians = medians or numeric_medians(df)
+
+    def split_skills(value):
+        return [s.strip() for s in value.split(',')] if isinstance(value, str) else []
+
+    def text(value):
+        return value if isinstance(value, str) else ''
+
+    requests = []
+    for row in df.to_dict('records'):
+        numeric = {}
+        for col in NUMERIC_COLUMNS:
+            value = pd.to_numeric(row[col], errors='coerce')
+            numeric[col] = float(medians[col] if pd.isna(value) else value)
+        requests.append({
+            'resume_text': text(row['Resume_Text']),
+            'job_description': text(row['Job_Description']),
+            'skills': split_skills(row['Skills']),
+            'required_skills': split_skills(row['Required_Skills']),
+            'experience_years': numeric['Experience (Years)'],
+            'offered_salary': numeric['Offered_Salary'],
+            'salary_expectation': numeric['Salary_Expectation'],
+            'education': row['Education'],
+            'industry': row['Industry'],
+            'location': row['Location'],
+            'applied_job_title': row['Applied_Job_Title'],
+            'work_type': row['Work_Type'],
+        })
+    return requests
+
+
+def check_serving_parity(df: pd.DataFrame) -> List[str]:
+    """
+    Serve every training row through both request paths (batched frame and
+    per-record) and compare with the training features. Returns a list of mismatch descriptions (empty if
+    training and serving agree exactly).
+    """
+    medians = numeric_medians(df)
+    trained = build_features(df, medians).reset_index(drop=True)
+    requests = requests_from_frame(df, medians)
+    served = {
+        'batch': build_features(frame_from_requests(requests)),
+        'records': pd.DataFrame(build_feature_records(requests), columns=FEATURES),
+    }
+
+    mismatches = []
+    for path, features in served.items():
+        for col in FEATURES:
+            expected = trained[col].astype(object).to_numpy()
+            actual = features[col].astype(object).to_numpy()
+            differing = [
+                i for i, (a, b) in enumerate(zip(expected, actual))
+                if not (a == b or (pd.isna(a) and pd.isna(b)))
+            ]
+            if differing:
+                mismatches.append(f"{path} {col}: {len(differing)} rows differ (first at row {differing[0]})")
+    return mismatches
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else 'candidate_data.csv'
+    problems = check_serving_parity(pd.read_csv(path))
+    if problems:
+        print("Training/serving feature mismatch:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print(f"Serving reproduces the training features for every row of {path}")
@@ -1,153 +1,203 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
-from sklearn.model_selection import train_test_split, cross_val_score
+from typing import Dict, Any, List
+from sklearn.model_selection import train_test_split, StratifiedKFold, ParameterSampler
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder
 import xgboost as xgb
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sklearn.metrics import precision_score, confusion_matrix, classification_report, accuracy_score
-import matplotlib.pyplot as plt
-import seaborn as sns
 import joblib
 import os
-import re
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import hiring_features
+from hiring_runtime import COMPACT_MODEL_DIR, export_serving_artifact
+from model_registry import ACTIVE_POINTER, METADATA_FILE, PIPELINE_FILE, REGISTRY_DIR, publish_model, read_pointer
 
 class EnhancedHiringPredictor:
+    REQUIRED_COLUMNS = hiring_features.INPUT_COLUMNS + [hiring_features.TARGET_COLUMN]
+    FEATURES = hiring_features.FEATURES
+
     def __init__(self):
         self.model_path = 'hiring_model.joblib'
         self.pipeline = None
         self.precision = 0
         self.accuracy = 0
+        self.version = None
+        # Numeric fill values of the training data, published with the model
+        self.medians = None
 
     def advanced_text_preprocessing(self, text: str) -> str:
-        if not isinstance(text, str):
-            return ""
-        text = re.sub(r'[^a-zA-Z\s]', '', text.lower())
-        text = ' '.join(text.split())
-        return text
+        return hiring_features.clean_text(text)
         
     def calculate_skill_match(self, candidate_skills, required_skills):
-        if not isinstance(candidate_skills, str) or not isinstance(required_skills, str):
-            return 0.0
-            
-        candidate_skills_list = [s.strip().lower() for s in candidate_skills.split(',')]
-        required_skills_list = [s.strip().lower() for s in required_skills.split(',')]
-        
-        if not required_skills_list:
-            return 1.0
-            
-        matches = sum(1 for skill in candidate_skills_list if skill in required_skills_list)
-        
-        return matches / len(required_skills_list) if len(required_skills_list) > 0 else 0.0
-
-    def prepare_data(self, df: pd.DataFrame):
-        required_columns = [
-            'Resume_Text', 'Job_Description', 'Skills', 'Required_Skills', 
-            'Experience (Years)', 'Offered_Salary', 'Salary_Expectation', 
-            'Education', 'Industry', 'Location', 
-            'Applied_Job_Title', 'Work_Type', 'Hired'
-        ]
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        return hiring_features.skill_match(candidate_skills, required_skills)
+
+    def _engineer_features(self, df: pd.DataFrame, medians: Dict[str, float] = None, verbose: bool = True):
+        X = hiring_features.build_features(df, medians)
+        y = df['Hired']
+
+        if verbose:
+            print("Data preparation info:")
+            print(X.info())
+            print("\nTarget variable distribution:")
+            print(y.value_counts(normalize=True))
+
+        return X, y
+
+    def prepare_data(self, df: pd.DataFrame, medians: Dict[str, float] = None):
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
         if missing_columns:
             raise ValueError(f"Missing columns: {missing_columns}")
 
-        df = df.copy()
-        df['Resume_Text'] = df['Resume_Text'].fillna('')
-        df['Job_Description'] = df['Job_Description'].fillna('')
-        df['Skills'] = df['Skills'].fillna('')
-        df['Required_Skills'] = df['Required_Skills'].fillna('')
-        
-        numeric_cols = ['Experience (Years)', 'Offered_Salary', 'Salary_Expectation']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-            df[col] = df[col].fillna(df[col].median())
+        self.medians = medians or hiring_features.numeric_medians(df)
+        return self._engineer_features(df, self.medians)
 
-        df['Resume_Text_Clean'] = df['Resume_Text'].apply(self.advanced_text_preprocessing)
-        df['Job_Description_Clean'] = df['Job_Description'].apply(self.advanced_text_preprocessing)
+    def prepare_data_from_csv(self, csv_path: str, chunksize: int = 100_000):
+        """
+        Prepare training data from a CSV in chunks. Only the required columns
+        are read and the raw text and skill columns of each chunk are dropped
+        once its features are built, so the full raw file never sits in memory.
+        """
+        header = pd.read_csv(csv_path, nrows=0).columns
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in header]
+        if missing_columns:
+            raise ValueError(f"Missing columns: {missing_columns}")
 
-        df['Skill_Match_Score'] = df.apply(
-            lambda row: self.calculate_skill_match(row['Skills'], row['Required_Skills']), 
-            axis=1
+        # The numeric fill values are medians over the whole file, so gather
+        # the (small) numeric columns first
+        medians = self.medians = hiring_features.numeric_medians(
+            pd.read_csv(csv_path, usecols=hiring_features.NUMERIC_COLUMNS)
         )
 
-        df['Experience_Level'] = pd.cut(
-            df['Experience (Years)'], 
-            bins=[-1, 1, 3, 5, 8, 15, np.inf], 
-            labels=['Entry', 'Junior', 'Mid', 'Senior', 'Expert', 'Leadership']
-        )
+        X_parts, y_parts = [], []
+        for chunk in pd.read_csv(csv_path, usecols=self.REQUIRED_COLUMNS, chunksize=chunksize):
+            X_chunk, y_chunk = self._engineer_features(chunk, medians, verbose=False)
+            X_parts.append(X_chunk)
+            y_parts.append(y_chunk)
 
-        df['Salary_Diff_Percentage'] = (df['Offered_Salary'] - df['Salary_Expectation']) / df['Salary_Expectation'] * 100
-        df['Salary_Diff_Percentage'] = df['Salary_Diff_Percentage'].fillna(0)
+        X = pd.concat(X_parts, ignore_index=True)
+        y = pd.concat(y_parts, ignore_index=True)
+        # Chunks can see different category sets; restore categorical dtypes
+        for col in hiring_features.CATEGORICAL_FEATURES:
+            X[col] = X[col].astype('category')
 
-        features = [
-            'Resume_Text_Clean', 'Job_Description_Clean', 
-            'Experience (Years)', 'Skill_Match_Score',
-            'Salary_Diff_Percentage',
-            'Education', 'Industry', 'Location', 
-            'Applied_Job_Title', 'Work_Type', 
-            'Experience_Level'
-        ]
-        
-        missing_features = [feat for feat in features if feat not in df.columns]
-        if missing_features:
-            raise ValueError(f"Missing feature columns: {missing_features}")
+        print(f"Prepared {len(X)} rows from {csv_path}")
+        print("\nTarget variable distribution:")
+        print(y.value_counts(normalize=True))
 
-        X = df[features]
-        y = df['Hired']
+        return X, y
+
+    def prepare_data_from_parquet(self, parquet_path: str, batch_size: int = 100_000):
+        """
+        Prepare training data from a Parquet file written by
+        convert_csv_to_parquet. Only the required columns are read, numeric
+        columns arrive already typed and categoricals arrive dictionary-encoded.
+        """
+        parquet_file = pq.ParquetFile(parquet_path)
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in parquet_file.schema_arrow.names]
+        if missing_columns:
+            raise ValueError(f"Missing columns: {missing_columns}")
+
+        medians = self.medians = hiring_features.numeric_medians(
+            pd.read_parquet(parquet_path, columns=hiring_features.NUMERIC_COLUMNS)
+        )
+
+        X_parts, y_parts = [], []
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=self.REQUIRED_COLUMNS):
+            X_batch, y_batch = self._engineer_features(batch.to_pandas(), medians, verbose=False)
+            X_parts.append(X_batch)
+            y_parts.append(y_batch)
+
+        X = pd.concat(X_parts, ignore_index=True)
+        y = pd.concat(y_parts, ignore_index=True)
+        for col in hiring_features.CATEGORICAL_FEATURES:
+            X[col] = X[col].astype('category')
 
-        print("Data preparation info:")
-        print(X.info())
+        print(f"Prepared {len(X)} rows from {parquet_path}")
         print("\nTarget variable distribution:")
         print(y.value_counts(normalize=True))
 
         return X, y
 
-    def build_pipeline(self):
-        """Construct advanced preprocessing and model pipeline"""
-        text_cols = ['Resume_Text_Clean', 'Job_Description_Clean']
-        categorical_cols = ['Education', 'Industry', 'Location', 
-                            'Applied_Job_Title', 'Work_Type', 'Experience_Level']
-        numeric_cols = ['Experience (Years)', 'Skill_Match_Score', 'Salary_Diff_Percentage']
+    def prepare_data_from_file(self, path: str):
+        if path.endswith(('.parquet', '.pq')):
+            return self.prepare_data_from_parquet(path)
+        return self.prepare_data_from_csv(path)
+
+    DEFAULT_CLASSIFIER_PARAMS = {
+        "n_estimators": 200,
+        "max_depth": 7,
+        "learning_rate": 0.1,
+        "subsample": 0.8,
+        "colsample_bytree": 0.8,
+        "min_child_weight": 3,
+        "scale_pos_weight": 5,
+    }
+
+    SEARCH_SPACE = {
+        "max_depth": [3, 5, 7, 9],
+        "learning_rate": [0.03, 0.05, 0.1, 0.2],
+        "subsample": [0.6, 0.8, 1.0],
+        "colsample_bytree": [0.6, 0.8, 1.0],
+        "min_child_weight": [1, 3, 5],
+        "scale_pos_weight": [1, 3, 5],
+    }
+
+    def build_preprocessor(self) -> ColumnTransformer:
+        text_cols = hiring_features.TEXT_FEATURES
+        categorical_cols = hiring_features.CATEGORICAL_FEATURES
+        numeric_cols = hiring_features.NUMERIC_FEATURES
 
         text_transformers = [
             (f'text_{col}', TfidfVectorizer(max_features=250), col) 
             for col in text_cols
         ]
         
-        preprocessor = ColumnTransformer(
+        return ColumnTransformer(
             transformers=[
                 *text_transformers,
                 ('num', StandardScaler(), numeric_cols),
                 ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_cols)
             ])
 
+    def build_pipeline(self, classifier_params: Dict[str, Any] = None):
+        """Construct advanced preprocessing and model pipeline"""
+        params = {**self.DEFAULT_CLASSIFIER_PARAMS, **(classifier_params or {})}
         self.pipeline = Pipeline([
-            ('preprocessor', preprocessor),
-            ('classifier', xgb.XGBClassifier(
-                n_estimators=200,
-                max_depth=7,
-                learning_rate=0.1,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                min_child_weight=3,
-                scale_pos_weight=5,
-                random_state=42
-            ))
+            ('preprocessor', self.build_preprocessor()),
+            ('classifier', xgb.XGBClassifier(tree_method='hist', random_state=42, **params))
         ])
 
-    def train(self, df: pd.DataFrame):
+    def train(self, df: pd.DataFrame, plot: bool = False):
+        X, y = self.prepare_data(df)
+        self.fit(X, y, plot=plot)
+
+    def train_from_csv(self, csv_path: str, chunksize: int = 100_000, plot: bool = False):
+        X, y = self.prepare_data_from_csv(csv_path, chunksize)
+        self.fit(X, y, plot=plot)
+
+    def train_from_file(self, path: str, plot: bool = False):
+        """Train from a CSV or a Parquet file, chosen by extension."""
+        X, y = self.prepare_data_from_file(path)
+        self.fit(X, y, plot=plot)
+
+    def fit(self, X: pd.DataFrame, y: pd.Series, classifier_params: Dict[str, Any] = None,
+            plot: bool = False, extra_metadata: Dict[str, Any] = None):
         try:
-            X, y = self.prepare_data(df)
-            
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, stratify=y, random_state=42
             )
 
-            self.build_pipeline()
+            self.build_pipeline(classifier_params)
             self.pipeline.fit(X_train, y_train)
 
             y_pred = self.pipeline.predict(X_test)
@@ -155,22 +205,29 @@ class EnhancedHiringPredictor:
             self.precision = precision_score(y_test, y_pred)
             self.accuracy = accuracy_score(y_test, y_pred)
 
-            plt.figure(figsize=(8, 6))
-            cm = confusion_matrix(y_test, y_pred)
-            sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-            plt.title('Enhanced Hiring Prediction Confusion Matrix')
-            plt.xlabel('Predicted Label')
-            plt.ylabel('True Label')
-            plt.tight_layout()
-            plt.savefig('enhanced_confusion_matrix.png')
-            plt.close()
+            if plot:
+                self.plot_confusion_matrix(y_test, y_pred)
 
             os.makedirs('models', exist_ok=True)
             joblib.dump(self.pipeline, os.path.join('models', self.model_path))
+            export_serving_artifact(self.pipeline, COMPACT_MODEL_DIR)
+            # The first version of a registry goes live; later ones wait to be shadowed or activated
+            first_version = read_pointer(ACTIVE_POINTER) is None
+            self.version = publish_model(self.pipeline, {
+                "precision": float(self.precision),
+                "accuracy": float(self.accuracy),
+                "train_rows": int(len(X_train)),
+                "test_rows": int(len(X_test)),
+                "classifier_params": self.pipeline.named_steps['classifier'].get_xgb_params(),
+                "numeric_medians": _plain_medians(self.medians),
+                **(extra_metadata or {}),
+            }, activate=first_version)
 
             print(f"Model Performance:")
             print(f"Precision: {self.precision:.2%}")
             print(f"Accuracy: {self.accuracy:.2%}")
+            print(f"Published model version: {self.version}" + (" (active)" if first_version else
+                  f"; serve it with: python model_registry.py shadow|activate {self.version}"))
             print("\nClassification Report:")
             print(classification_report(y_test, y_pred))
 
@@ -178,13 +235,372 @@ class EnhancedHiringPredictor:
             print(f"Error during training: {e}")
             raise
 
+    def plot_confusion_matrix(self, y_true, y_pred, path: str = 'enhanced_confusion_matrix.png'):
+        # Plotting libraries are only needed here, so keep them off the import path
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        plt.figure(figsize=(8, 6))
+        cm = confusion_matrix(y_true, y_pred)
+        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
+        plt.title('Enhanced Hiring Prediction Confusion Matrix')
+        plt.xlabel('Predicted Label')
+        plt.ylabel('True Label')
+        plt.tight_layout()
+        plt.savefig(path)
+        plt.close()
+
+    def cache_folds(self, X: pd.DataFrame, y: pd.Series, n_folds: int, cache_dir: str) -> List[str]:
+        """
+        Fit the preprocessor once per cross-validation fold and cache the
+        transformed matrices, so search trials never refit TF-IDF.
+        """
+        fingerprint = hashlib.sha256(
+            pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes() +
+            np.asarray(y).tobytes() + f"{n_folds}:{SEARCH_FOLD_SEED}".encode()
+        ).hexdigest()[:16]
+        fold_dir = os.path.join(cache_dir, f"folds-{fingerprint}")
+        fold_paths = [os.path.join(fold_dir, f"fold_{i}.joblib") for i in range(n_folds)]
+        if all(os.path.exists(path) for path in fold_paths):
+            print(f"Reusing cached folds in {fold_dir}")
+            return fold_paths
+
+        os.makedirs(fold_dir, exist_ok=True)
+        splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=SEARCH_FOLD_SEED)
+        y_values = np.asarray(y)
+        for path, (train_index, valid_index) in zip(fold_paths, splitter.split(X, y_values)):
+            preprocessor = self.build_preprocessor()
+            X_fold_train = preprocessor.fit_transform(X.iloc[train_index])
+            X_fold_valid = preprocessor.transform(X.iloc[valid_index])
+            joblib.dump(
+                (X_fold_train, y_values[train_index], X_fold_valid, y_values[valid_index]),
+                path + ".tmp"
+            )
+            os.replace(path + ".tmp", path)
+        return fold_paths
+
+    def search(self, X: pd.DataFrame, y: pd.Series, n_trials: int = 20, n_folds: int = 5,
+               n_jobs: int = None, max_rounds: int = 1000, early_stopping_rounds: int = 30,
+               cache_dir: str = os.path.join('models', 'search_cache')) -> Dict[str, Any]:
+        """
+        Randomized hyperparameter search with k-fold cross-validation and early
+        stopping. Trials run in a process pool over cached preprocessed folds.
+        Finished trials are appended to a checkpoint file, so an interrupted
+        search resumes where it stopped. The checkpoint lives next to the
+        folds (named by the data, fold count and fold seed) and is named by
+        the settings that change a trial's result, so only trials run under
+        the same settings are reused.
+        """
+        fold_paths = self.cache_folds(X, y, n_folds, cache_dir)
+        settings = {
+            "max_rounds": max_rounds,
+            "early_stopping_rounds": early_stopping_rounds,
+            "booster_seed": SEARCH_BOOSTER_SEED,
+        }
+        settings_key = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+        checkpoint_path = os.path.join(os.path.dirname(fold_paths[0]), f"trials-{settings_key}.jsonl")
+
+        trials = list(ParameterSampler(self.SEARCH_SPACE, n_iter=n_trials, random_state=42))
+        trials = [{key: _plain(value) for key, value in params.items()} for params in trials]
+        # Finished trials are matched by their parameters, not their position
+        completed = {}
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                for line in f:
+                    result = json.loads(line)
+                    completed[_params_key(result["params"])] = result
+        pending = [(i, params) for i, params in enumerate(trials) if _params_key(params) not in completed]
+        if len(pending) < len(trials):
+            print(f"Resuming search: {len(trials) - len(pending)} of {len(trials)} trials already done")
+
+        n_jobs = n_jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_load_search_folds,
+                                 initargs=(fold_paths,)) as executor:
+            futures = [
+                executor.submit(_run_search_trial, trial, params, max_rounds, early_stopping_rounds)
+                for trial, params in pending
+            ]
+            with open(checkpoint_path, 'a') as checkpoint:
+                for future in as_completed(futures):
+                    result = future.result()
+                    completed[_params_key(result["params"])] = result
+                    checkpoint.write(json.dumps(result) + "\n")
+                    checkpoint.flush()
+                    print(f"Trial {result['trial']}: auc={result['auc']:.4f} "
+                          f"precision={result['precision']:.4f} rounds={result['n_estimators']}")
+
+        best = max((completed[_params_key(params)] for params in trials), key=lambda result: result["auc"])
+        print(f"Best trial {best['trial']}: auc={best['auc']:.4f} params={best['params']}")
+        return best
+
+    def train_with_search(self, X: pd.DataFrame, y: pd.Series, plot: bool = False, **search_kwargs):
+        """Search on the training split, then fit and publish the best configuration."""
+        X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+        best = self.search(X_train, y_train, **search_kwargs)
+        params = {**best["params"], "n_estimators": best["n_estimators"]}
+        self.fit(X, y, classifier_params=params, plot=plot, extra_metadata={"search": best})
+
+
+    def train_incremental(self, new_df: pd.DataFrame, base_version: str = None, extra_rounds: int = 50,
+                          registry_dir: str = REGISTRY_DIR):
+        """
+        Continue boosting an existing model on newly labelled outcomes. The
+        base pipeline's fitted preprocessor is reused, so the TF-IDF
+        vocabularies and category maps (the feature space) stay unchanged and
+        only `extra_rounds` new trees are fitted on the new rows. Missing
+        numeric values are filled with the base model's training medians.
+        The result is published as the shadow version, to be activated once
+        its shadow stats look right.
+        """
+        base_version = base_version or read_pointer(ACTIVE_POINTER, registry_dir)
+        if not base_version:
+            raise ValueError("No active model version to continue from")
+        base_pipeline = joblib.load(os.path.join(registry_dir, base_version, PIPELINE_FILE))
+        preprocessor = base_pipeline.named_steps['preprocessor']
+        base_classifier = base_pipeline.named_steps['classifier']
+        with open(os.path.join(registry_dir, base_version, METADATA_FILE)) as f:
+            medians = json.load(f).get("numeric_medians")
+        if not medians:
+            raise ValueError(f"Model version {base_version} has no stored training medians; retrain it in full first")
+
+        X, y = self.prepare_data(new_df, medians)
+        can_evaluate = y.nunique() == 2 and y.value_counts().min() >= 2 and len(y) >= 10
+        if can_evaluate:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, stratify=y, random_state=42
+            )
+        else:
+            X_train, y_train = X, y
+
+        classifier = xgb.XGBClassifier(**{**base_classifier.get_params(), "n_estimators": extra_rounds})
+        classifier.fit(preprocessor.transform(X_train), y_train, xgb_model=base_classifier.get_booster())
+
+        self.pipeline = Pipeline([('preprocessor', preprocessor), ('classifier', classifier)])
+        metrics = {
+            "base_version": base_version,
+            "incremental_rows": int(len(X_train)),
+            "extra_rounds": extra_rounds,
+            "total_rounds": int(classifier.get_booster().num_boosted_rounds()),
+            "numeric_medians": medians,
+        }
+        if can_evaluate:
+            y_pred = self.pipeline.predict(X_test)
+            self.precision = precision_score(y_test, y_pred, zero_division=0)
+            self.accuracy = accuracy_score(y_test, y_pred)
+            metrics.update(precision=float(self.precision), accuracy=float(self.accuracy), test_rows=int(len(X_test)))
+            print(f"Precision on new outcomes: {self.precision:.2%}")
+            print(f"Accuracy on new outcomes: {self.accuracy:.2%}")
+        else:
+            print("Too few labelled outcomes of each class to hold out an evaluation split")
+
+        self.version = publish_model(self.pipeline, metrics, registry_dir, shadow=True)
+        print(f"Published model version {self.version} (continued from {base_version}) as shadow; "
+              f"activate it with: python model_registry.py activate {self.version}")
+        return self.version
+
+def convert_csv_to_parquet(csv_path: str, parquet_path: str = None, chunksize: int = 100_000) -> str:
+    """
+    One-time conversion of a training CSV to Parquet: only the required
+    columns are kept, numeric columns are parsed once (unparseable values
+    become nulls) and categorical columns are dictionary-encoded.
+    """
+    parquet_path = parquet_path or os.path.splitext(csv_path)[0] + '.parquet'
+    schema = pa.schema(
+        [(col, pa.string()) for col in ['Resume_Text', 'Job_Description', 'Skills', 'Required_Skills']] +
+        [(col, pa.float64()) for col in hiring_features.NUMERIC_COLUMNS] +
+        [(col, pa.dictionary(pa.int32(), pa.string())) for col in hiring_features.CATEGORICAL_COLUMNS] +
+        [(hiring_features.TARGET_COLUMN, pa.int8())]
+    )
+
+    rows = 0
+    with pq.ParquetWriter(parquet_path, schema, compression='zstd') as writer:
+        for chunk in pd.read_csv(csv_path, usecols=EnhancedHiringPredictor.REQUIRED_COLUMNS, chunksize=chunksize):
+            for col in ['Resume_Text', 'Job_Description', 'Skills', 'Required_Skills']:
+                chunk[col] = chunk[col].astype(object).where(chunk[col].notna(), None)
+            for col in hiring_features.NUMERIC_COLUMNS:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+            for col in hiring_features.CATEGORICAL_COLUMNS:
+                chunk[col] = chunk[col].astype(object).where(chunk[col].notna(), None).astype('category')
+            chunk[hiring_features.TARGET_COLUMN] = chunk[hiring_features.TARGET_COLUMN].astype('int8')
+            writer.write_table(pa.Table.from_pandas(chunk[schema.names], schema=schema, preserve_index=False))
+            rows += len(chunk)
+
+    print(f"Converted {rows} rows from {csv_path} to {parquet_path}")
+    return parquet_path
+
+# Application statuses that are final hiring outcomes, and their labels
+OUTCOME_LABELS = {"hired": 1, "accepted": 1, "offer accepted": 1, "rejected": 0, "declined": 0}
+OUTCOMES_PATH = 'application_outcomes.csv'
+
+def fetch_application_outcomes(supabase_client) -> pd.DataFrame:
+    """
+    Build labelled training rows from applications whose status is a final
+    outcome, joined with their candidate and job records.
+    """
+    applications = supabase_client.table("applications").select("*").execute().data
+    decided = [a for a in applications if str(a.get("status", "")).strip().lower() in OUTCOME_LABELS]
+    if not decided:
+        return pd.DataFrame(columns=['Application_ID'] + EnhancedHiringPredictor.REQUIRED_COLUMNS)
+
+    candidate_ids = list({a["candidate_id"] for a in decided})
+    job_ids = list({a["job_id"] for a in decided})
+    candidates = {c["id"]: c for c in supabase_client.table("candidates").select("*").in_("id", candidate_ids).execute().data}
+    jobs = {j["id"]: j for j in supabase_client.table("jobs").select("*").in_("id", job_ids).execute().data}
+
+    def joined(value):
+        return ', '.join(value) if isinstance(value, list) else (value or '')
+
+    rows = []
+    for application in decided:
+        candidate = candidates.get(application["candidate_id"])
+        job = jobs.get(application["job_id"])
+        if not candidate or not job:
+            continue
+        enhanced = candidate.get("enhanced_data") or {}
+        rows.append({
+            'Application_ID': application["id"],
+            'Resume_Text': candidate.get("resume_text", ''),
+            'Job_Description': job.get("description", ''),
+            'Skills': joined(candidate.get("extracted_skills")),
+            'Required_Skills': joined(job.get("requirements") or job.get("required_skills")),
+            'Experience (Years)': enhanced.get("experience_years"),
+            'Offered_Salary': hiring_features.parse_salary(job.get("salary") or job.get("salary_range")),
+            'Salary_Expectation': hiring_features.parse_salary(enhanced.get("salary_expectation")),
+            'Education': enhanced.get("education", ''),
+            'Industry': enhanced.get("industry") or job.get("industry", ''),
+            'Location': job.get("location", ''),
+            'Applied_Job_Title': job.get("title", ''),
+            'Work_Type': job.get("job_type") or job.get("employment_type", ''),
+            'Hired': OUTCOME_LABELS[str(application["status"]).strip().lower()],
+        })
+    return pd.DataFrame(rows)
+
+def unseen_outcomes(outcomes: pd.DataFrame, path: str = OUTCOMES_PATH) -> pd.DataFrame:
+    """Outcomes not yet recorded in the local outcomes file."""
+    if not os.path.exists(path):
+        return outcomes
+    seen = set(pd.read_csv(path, usecols=['Application_ID'])['Application_ID'].astype(str))
+    return outcomes[~outcomes['Application_ID'].astype(str).isin(seen)]
+
+def mark_outcomes_seen(outcomes: pd.DataFrame, path: str = OUTCOMES_PATH):
+    """
+    Record outcomes in the local outcomes file. Only called once a model
+    trained on them is published, so a failed run trains on them again.
+    """
+    if os.path.exists(path):
+        outcomes.to_csv(path, mode='a', header=False, index=False)
+    else:
+        outcomes.to_csv(path, index=False)
+
+def _plain_medians(medians: Dict[str, float]) -> Dict[str, float]:
+    return {col: float(value) for col, value in medians.items()} if medians else None
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+# Seeds of the search's fold split and boosters; part of the cached folds' and checkpoints' names
+SEARCH_FOLD_SEED = 42
+SEARCH_BOOSTER_SEED = 42
+
+def _params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+# Cross-validation folds loaded once per search worker process
+_search_folds = []
+
+def _load_search_folds(fold_paths: List[str]):
+    global _search_folds
+    _search_folds = []
+    for path in fold_paths:
+        X_train, y_train, X_valid, y_valid = joblib.load(path)
+        _search_folds.append((
+            xgb.DMatrix(X_train, label=y_train),
+            xgb.DMatrix(X_valid, label=y_valid),
+            y_valid
+        ))
+
+def _run_search_trial(trial: int, params: Dict[str, Any], max_rounds: int,
+                      early_stopping_rounds: int) -> Dict[str, Any]:
+    booster_params = {
+        **params,
+        "objective": "binary:logistic",
+        "eval_metric": "auc",
+        "tree_method": "hist",
+        "nthread": 1,
+        "seed": SEARCH_BOOSTER_SEED,
+    }
+    aucs, precisions, accuracies, rounds = [], [], [], []
+    for dtrain, dvalid, y_valid in _search_folds:
+        booster = xgb.train(
+            booster_params, dtrain, num_boost_round=max_rounds,
+            evals=[(dvalid, "valid")], early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=False
+        )
+        best_rounds = booster.best_iteration + 1
+        probabilities = booster.predict(dvalid, iteration_range=(0, best_rounds))
+        y_pred = (probabilities > 0.5).astype(int)
+        aucs.append(booster.best_score)
+        precisions.append(precision_score(y_valid, y_pred, zero_division=0))
+        accuracies.append(accuracy_score(y_valid, y_pred))
+        rounds.append(best_rounds)
+
+    return {
+        "trial": trial,
+        "params": params,
+        "auc": float(np.mean(aucs)),
+        "precision": float(np.mean(precisions)),
+        "accuracy": float(np.mean(accuracies)),
+        "n_estimators": int(round(np.mean(rounds))),
+    }
+
 def main():
+    parser = argparse.ArgumentParser(description="Train the hiring prediction model")
+    parser.add_argument("--data", default='candidate_data.csv', help="training data, CSV or Parquet")
+    parser.add_argument("--convert-to-parquet", metavar="OUTPUT", default=None,
+                        help="convert --data from CSV to Parquet and exit")
+    parser.add_argument("--search", action="store_true", help="run a cross-validated hyperparameter search first")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--plot", action="store_true", help="save a confusion matrix plot")
+    parser.add_argument("--incremental", action="store_true",
+                        help="continue boosting the active model on new application outcomes "
+                             "(from --outcomes, or fetched from Supabase)")
+    parser.add_argument("--outcomes", default=None, help="CSV of new labelled outcomes for --incremental")
+    parser.add_argument("--extra-rounds", type=int, default=50)
+    args = parser.parse_args()
+
     try:
-        df = pd.read_csv('candidate_data.csv')
+        if args.convert_to_parquet:
+            convert_csv_to_parquet(args.data, args.convert_to_parquet)
+            return
+
         predictor = EnhancedHiringPredictor()
-        predictor.train(df)
+        if args.incremental:
+            if args.outcomes:
+                new_outcomes = pd.read_csv(args.outcomes)
+            else:
+                from dotenv import load_dotenv
+                from supabase import create_client
+                load_dotenv()
+                client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+                new_outcomes = unseen_outcomes(fetch_application_outcomes(client))
+            if new_outcomes.empty:
+                print("No new application outcomes to train on")
+                return
+            predictor.train_incremental(new_outcomes, extra_rounds=args.extra_rounds)
+            if not args.outcomes:
+                mark_outcomes_seen(new_outcomes)
+        elif args.search:
+            X, y = predictor.prepare_data_from_file(args.data)
+            predictor.train_with_search(X, y, plot=args.plot, n_trials=args.trials,
+                                        n_folds=args.folds, n_jobs=args.jobs)
+        else:
+            predictor.train_from_file(args.data, plot=args.plot)
     except Exception as e:
         print(f"Error in main execution: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
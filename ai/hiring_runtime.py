@@ -0,0 +1,235 @@
+"""
+Compact serving artifact and lean inference runtime for the hiring model.
+
+`export_serving_artifact` flattens a fitted EnhancedHiringPredictor pipeline
+into plain files: TF-IDF vocabularies and IDF arrays, one-hot category maps,
+scaler parameters and the XGBoost booster in its native UBJ format. The
+`CompactHiringModel` runtime loads those files (arrays are memory-mapped),
+rebuilds the ColumnTransformer output with plain Python and scipy, and scores
+the booster directly, without unpickling sklearn objects or building
+DataFrames.
+"""
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+import numpy as np
+import scipy.sparse as sp
+import xgboost as xgb
+
+from hiring_features import build_feature_records
+
+COMPACT_MODEL_DIR = os.path.join("models", "hiring_model_compact")
+MANIFEST_FILE = "manifest.json"
+BOOSTER_FILE = "booster.ubj"
+
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+# TfidfVectorizer settings the runtime reproduces; anything else is refused at export
+_SUPPORTED_TFIDF_PARAMS = {
+    "analyzer": "word",
+    "lowercase": True,
+    "ngram_range": (1, 1),
+    "norm": "l2",
+    "preprocessor": None,
+    "stop_words": None,
+    "strip_accents": None,
+    "sublinear_tf": False,
+    "token_pattern": DEFAULT_TOKEN_PATTERN,
+    "tokenizer": None,
+    "use_idf": True,
+}
+
+
+def _json_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def export_serving_artifact(pipeline, output_dir: str = COMPACT_MODEL_DIR) -> str:
+    """Write the compact serving artifact for a fitted pipeline and return its directory."""
+    preprocessor = pipeline.named_steps['preprocessor']
+    classifier = pipeline.named_steps['classifier']
+    os.makedirs(output_dir, exist_ok=True)
+
+    blocks = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == 'remainder' or transformer == 'drop':
+            continue
+
+        if name.startswith('text_'):
+            params = transformer.get_params()
+            unsupported = {
+                key: params[key] for key, expected in _SUPPORTED_TFIDF_PARAMS.items()
+                if params[key] != expected
+            }
+            if unsupported:
+                raise ValueError(f"Cannot export {name}: unsupported TfidfVectorizer settings {unsupported}")
+
+            vocabulary = [None] * len(transformer.vocabulary_)
+            for term, index in transformer.vocabulary_.items():
+                vocabulary[index] = term
+            idf_file = f"{name}_idf.npy"
+            np.save(os.path.join(output_dir, idf_file), transformer.idf_.astype(np.float64))
+            blocks.append({
+                "type": "tfidf",
+                "name": name,
+                "column": columns,
+                "vocabulary": vocabulary,
+                "idf": idf_file,
+                "size": len(vocabulary),
+            })
+
+        elif name == 'num':
+            np.save(os.path.join(output_dir, "num_mean.npy"), transformer.mean_.astype(np.float64))
+            np.save(os.path.join(output_dir, "num_scale.npy"), transformer.scale_.astype(np.float64))
+            blocks.append({
+                "type": "scaler",
+                "name": name,
+                "columns": list(columns),
+                "mean": "num_mean.npy",
+                "scale": "num_scale.npy",
+                "size": len(columns),
+            })
+
+        elif name == 'cat':
+            categories = [[_json_value(value) for value in cats] for cats in transformer.categories_]
+            blocks.append({
+                "type": "onehot",
+                "name": name,
+                "columns": list(columns),
+                "categories": categories,
+                "size": sum(len(cats) for cats in categories),
+            })
+
+        else:
+            raise ValueError(f"Cannot export unknown transformer {name}")
+
+    classifier.get_booster().save_model(os.path.join(output_dir, BOOSTER_FILE))
+
+    manifest = {
+        "format": 1,
+        "sparse_output": bool(preprocessor.sparse_output_),
+        "n_features": sum(block["size"] for block in blocks),
+        "blocks": blocks,
+        "booster": BOOSTER_FILE,
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+
+    return output_dir
+
+
+class CompactHiringModel:
+    """Inference over a compact serving artifact written by export_serving_artifact."""
+
+    def __init__(self, manifest: Dict[str, Any], blocks: List[Dict[str, Any]], booster: xgb.Booster):
+        self.manifest = manifest
+        self.blocks = blocks
+        self.booster = booster
+        self.sparse_output = manifest["sparse_output"]
+        self.n_features = manifest["n_features"]
+        self._token_re = re.compile(DEFAULT_TOKEN_PATTERN)
+
+    @classmethod
+    def load(cls, model_dir: str = COMPACT_MODEL_DIR) -> "CompactHiringModel":
+        with open(os.path.join(model_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        blocks = []
+        offset = 0
+        for block in manifest["blocks"]:
+            runtime_block = {"type": block["type"], "offset": offset}
+            if block["type"] == "tfidf":
+                runtime_block["column"] = block["column"]
+                runtime_block["vocabulary"] = {term: index for index, term in enumerate(block["vocabulary"])}
+                runtime_block["idf"] = np.load(os.path.join(model_dir, block["idf"]), mmap_mode='r')
+            elif block["type"] == "scaler":
+                runtime_block["columns"] = block["columns"]
+                runtime_block["mean"] = np.load(os.path.join(model_dir, block["mean"]), mmap_mode='r')
+                runtime_block["scale"] = np.load(os.path.join(model_dir, block["scale"]), mmap_mode='r')
+            elif block["type"] == "onehot":
+                runtime_block["columns"] = block["columns"]
+                maps = []
+                position = offset
+                for categories in block["categories"]:
+                    maps.append({value: position + i for i, value in enumerate(categories)})
+                    position += len(categories)
+                runtime_block["maps"] = maps
+            else:
+                raise ValueError(f"Unknown block type {block['type']}")
+            blocks.append(runtime_block)
+            offset += block["size"]
+
+        booster = xgb.Booster()
+        booster.load_model(os.path.join(model_dir, manifest["booster"]))
+        return cls(manifest, blocks, booster)
+
+    def _row_entries(self, features: Dict[str, Any]):
+        """Column indices and values of one transformed row."""
+        indices: List[int] = []
+        values: List[float] = []
+        for block in self.blocks:
+            if block["type"] == "tfidf":
+                vocabulary = block["vocabulary"]
+                counts = Counter(
+                    vocabulary[token] for token in self._token_re.findall(features[block["column"]].lower())
+                    if token in vocabulary
+                )
+                if not counts:
+                    continue
+                idf = block["idf"]
+                weights = {index: count * idf[index] for index, count in counts.items()}
+                norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+                for index in sorted(weights):
+                    indices.append(block["offset"] + index)
+                    values.append(weights[index] / norm)
+            elif block["type"] == "scaler":
+                mean, scale = block["mean"], block["scale"]
+                for i, column in enumerate(block["columns"]):
+                    indices.append(block["offset"] + i)
+                    values.append((features[column] - mean[i]) / scale[i])
+            else:
+                for column, mapping in zip(block["columns"], block["maps"]):
+                    index = mapping.get(features[column])
+                    if index is not None:
+                        indices.append(index)
+                        values.append(1.0)
+        return indices, values
+
+    def transform(self, feature_records: List[Dict[str, Any]]):
+        """Reproduce the fitted ColumnTransformer output for feature records."""
+        if self.sparse_output:
+            data, indices, indptr = [], [], [0]
+            for features in feature_records:
+                row_indices, row_values = self._row_entries(features)
+                for index, value in zip(row_indices, row_values):
+                    # Stacking a dense block into CSR drops its zeros, and XGBoost
+                    # treats absent entries as missing, so do the same here
+                    if value != 0.0:
+                        indices.append(index)
+                        data.append(value)
+                indptr.append(len(indices))
+            return sp.csr_matrix(
+                (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+                shape=(len(feature_records), self.n_features)
+            )
+
+        matrix = np.zeros((len(feature_records), self.n_features), dtype=np.float64)
+        for row, features in enumerate(feature_records):
+            row_indices, row_values = self._row_entries(features)
+            matrix[row, row_indices] = row_values
+        return matrix
+
+    def predict_proba(self, requests: List[Dict[str, Any]]) -> np.ndarray:
+        """Probability of being hired for each /predict-hiring payload."""
+        return self.predict_proba_features(build_feature_records(requests))
+
+    def predict_proba_features(self, feature_records: List[Dict[str, Any]]) -> np.ndarray:
+        return self.booster.predict(xgb.DMatrix(self.transform(feature_records)))
@@ -0,0 +1,279 @@
+"""
+Durable queue of resume ingestion jobs backed by SQLite, and a bounded pool
+of worker threads that runs the ingestion pipeline for each one.
+
+An upload is stored (PDF bytes included) before the API answers with the
+job id, so the HTTP connection is released immediately and a crash or
+restart never loses an accepted resume: jobs left running by a previous
+process are queued again on start. Each worker thread runs the async
+pipeline on its own event loop, so the API's loop is never blocked by PDF
+parsing or the Gemini call. A job records the pipeline stage it is in,
+retries transient failures with exponential backoff and keeps its result or
+error for polling.
+
+Several processes (serve.py workers) can share one database; jobs are
+claimed atomically.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlite_store import ProcessLocalConnection, process_alive
+
+INGESTION_QUEUE_DB = os.getenv("INGESTION_QUEUE_DB", "ingestion_queue.db")
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "4"))
+INGESTION_MAX_QUEUED = int(os.getenv("INGESTION_MAX_QUEUED", "1000"))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_RETRY = "retry"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+TERMINAL_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+# A handler runs one job's pipeline: handler(job, progress) -> JSON-serializable result
+Handler = Callable[[Dict[str, Any], Callable[[str], None]], Awaitable[Any]]
+
+
+class PermanentIngestionError(Exception):
+    """A failure retrying cannot fix, e.g. an unreadable PDF."""
+
+
+class IngestionQueue:
+    """Durable FIFO of ingestion jobs stored in a SQLite database."""
+
+    def __init__(self, db_path: str = INGESTION_QUEUE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = ProcessLocalConnection(db_path, row_factory=sqlite3.Row)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                filename TEXT,
+                content_type TEXT,
+                payload BLOB,
+                status TEXT NOT NULL,
+                stage TEXT,
+                worker_pid INTEGER,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                result TEXT,
+                next_attempt_at REAL NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                finished_at TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_pending "
+            "ON ingestion_jobs (status, next_attempt_at)"
+        )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._connection()
+
+    def enqueue(self, kind: str, filename: str, content_type: str, payload: bytes) -> str:
+        """Persist an upload and return its job id."""
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO ingestion_jobs (id, kind, filename, content_type, payload, status, "
+                "next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, filename, content_type, payload, STATUS_QUEUED, time.time(), now, now)
+            )
+        return job_id
+
+    def pending(self) -> int:
+        """Jobs accepted but not yet finished."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM ingestion_jobs WHERE status IN (?, ?, ?)",
+                (STATUS_QUEUED, STATUS_RETRY, STATUS_RUNNING)
+            ).fetchone()
+        return row[0]
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically mark the oldest due job as running and return it."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM ingestion_jobs WHERE status IN (?, ?) AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT 1",
+                    (STATUS_QUEUED, STATUS_RETRY, time.time())
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE ingestion_jobs SET status = ?, worker_pid = ?, updated_at = ? WHERE id = ?",
+                        (STATUS_RUNNING, os.getpid(), datetime.now().isoformat(), row["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return dict(row) if row is not None else None
+
+    def set_stage(self, job_id: str, stage: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE ingestion_jobs SET stage = ?, updated_at = ? WHERE id = ?",
+                (stage, datetime.now().isoformat(), job_id)
+            )
+
+    def mark_succeeded(self, job_id: str, result: Any):
+        """Store the result; the uploaded bytes are no longer needed."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE ingestion_jobs SET status = ?, stage = NULL, attempts = attempts + 1, last_error = NULL, "
+                "result = ?, payload = NULL, updated_at = ?, finished_at = ? WHERE id = ?",
+                (STATUS_SUCCEEDED, json.dumps(result, default=str), now, now, job_id)
+            )
+
+    def mark_failed(self, job_id: str, error: str, retry_in: Optional[float] = None):
+        """Record a failed attempt; schedule a retry unless `retry_in` is None."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            if retry_in is None:
+                self._conn.execute(
+                    "UPDATE ingestion_jobs SET status = ?, attempts = attempts + 1, last_error = ?, "
+                    "payload = NULL, updated_at = ?, finished_at = ? WHERE id = ?",
+                    (STATUS_FAILED, error, now, now, job_id)
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE ingestion_jobs SET status = ?, attempts = attempts + 1, last_error = ?, "
+                    "next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                    (STATUS_RETRY, error, time.time() + retry_in, now, job_id)
+                )
+
+    def requeue_inflight(self) -> int:
+        """
+        Return jobs left running by a stopped or crashed process to the queue.
+        Jobs of processes still alive, e.g. sibling serve.py workers, are left alone.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, worker_pid FROM ingestion_jobs WHERE status = ?", (STATUS_RUNNING,)
+            ).fetchall()
+            orphaned = [(STATUS_QUEUED, row["id"]) for row in rows if not process_alive(row["worker_pid"])]
+            self._conn.executemany(
+                "UPDATE ingestion_jobs SET status = ?, worker_pid = NULL WHERE id = ?", orphaned
+            )
+        return len(orphaned)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a job, with its parsed result once it has succeeded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, filename, status, stage, attempts, last_error, result, created_at, "
+                "updated_at, finished_at FROM ingestion_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+
+class IngestionWorkers:
+    """A fixed number of threads draining an IngestionQueue with per-kind handlers."""
+
+    def __init__(
+        self,
+        queue: IngestionQueue,
+        handlers: Dict[str, Handler],
+        workers: int = INGESTION_WORKERS,
+        max_attempts: int = INGESTION_MAX_ATTEMPTS,
+        backoff_base: float = float(os.getenv("INGESTION_BACKOFF_SECONDS", "5")),
+        backoff_max: float = 300.0,
+        poll_interval: float = 0.5
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        requeued = self.queue.requeue_inflight()
+        if requeued:
+            print(f"Requeued {requeued} ingestion jobs left running by a previous run")
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"ingestion-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Let running jobs finish (up to `timeout`); unfinished ones are requeued on the next start."""
+        self._stop.set()
+        self.notify()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def notify(self):
+        """Wake an idle worker after a job has been enqueued."""
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def _retry_delay(self, attempts: int) -> Optional[float]:
+        if attempts + 1 >= self.max_attempts:
+            return None
+        return min(self.backoff_base * (2 ** attempts), self.backoff_max)
+
+    def _process(self, loop: asyncio.AbstractEventLoop, job: Dict[str, Any]):
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            self.queue.mark_failed(job["id"], f"Unknown ingestion job kind {job['kind']}")
+            return
+        try:
+            result = loop.run_until_complete(handler(job, lambda stage: self.queue.set_stage(job["id"], stage)))
+            self.queue.mark_succeeded(job["id"], result)
+        except PermanentIngestionError as e:
+            self.queue.mark_failed(job["id"], str(e))
+        except Exception as e:
+            self.queue.mark_failed(job["id"], str(e), self._retry_delay(job["attempts"]))
+            print(f"Ingestion job {job['id']} failed (attempt {job['attempts'] + 1}): {str(e)}")
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        try:
+            while not self._stop.is_set():
+                try:
+                    job = self.queue.claim()
+                except Exception as e:
+                    print(f"Failed to claim ingestion job: {str(e)}")
+                    job = None
+
+                if job is not None:
+                    self._process(loop, job)
+                    continue
+
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+        finally:
+            loop.close()
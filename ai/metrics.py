@@ -0,0 +1,194 @@
+"""
+Prometheus metrics for both services: per-stage latency histograms, cache
+hit/miss and Gemini failure counters, inference batch sizes, request
+latency and in-flight requests, exposed at /metrics.
+
+Metrics are off unless METRICS_ENABLED=true. When off, prometheus_client
+is not imported, no middleware or route is added, and every helper returns
+a shared no-op, so instrumented code pays about one function call per
+stage. Under the multi-worker launcher (serve.py) set
+PROMETHEUS_MULTIPROC_DIR to an empty directory so /metrics aggregates every
+worker.
+
+    metrics = ServiceMetrics("resume_matcher")
+    metrics.instrument(app)
+    with metrics.stage("compile_job"):
+        ...
+"""
+import os
+import time
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+
+# Gemini calls take seconds, so the stage buckets reach a minute
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+_metrics = None
+
+
+def _load_metrics():
+    """Create the metric objects on first use; None if metrics are off or unavailable."""
+    global _metrics, METRICS_ENABLED
+    if _metrics is not None or not METRICS_ENABLED:
+        return _metrics
+    try:
+        import prometheus_client
+    except ImportError:
+        print("WARNING: METRICS_ENABLED is set but prometheus_client is not installed; metrics are off")
+        METRICS_ENABLED = False
+        return None
+
+    from prometheus_client import Counter, Gauge, Histogram
+    _metrics = {
+        "client": prometheus_client,
+        "stage_seconds": Histogram(
+            "screensmart_stage_seconds", "Latency of one pipeline stage",
+            ["service", "stage"], buckets=STAGE_BUCKETS
+        ),
+        "cache_events": Counter(
+            "screensmart_cache_events_total", "Cache lookups by result",
+            ["service", "cache", "result"]
+        ),
+        "failures": Counter(
+            "screensmart_failures_total", "Failed calls to external dependencies",
+            ["service", "dependency"]
+        ),
+        "batch_size": Histogram(
+            "screensmart_inference_batch_size", "Items per model inference call",
+            ["service", "model"], buckets=BATCH_BUCKETS
+        ),
+        "request_seconds": Histogram(
+            "screensmart_request_seconds", "HTTP request latency",
+            ["service", "method", "route", "status"], buckets=STAGE_BUCKETS
+        ),
+        "in_flight": Gauge(
+            "screensmart_requests_in_flight", "HTTP requests being handled",
+            ["service"], multiprocess_mode="livesum"
+        ),
+    }
+    return _metrics
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _MetricsMiddleware:
+    """ASGI middleware recording request latency and in-flight requests."""
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+        metrics = _load_metrics()
+        self.request_seconds = metrics["request_seconds"]
+        self.in_flight = metrics["in_flight"].labels(service)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec()
+            # The route template, not the raw path, keeps label cardinality bounded
+            route = scope.get("route")
+            self.request_seconds.labels(
+                self.service, scope["method"], getattr(route, "path", "unmatched"), str(status[0])
+            ).observe(time.perf_counter() - start)
+
+
+class ServiceMetrics:
+    """Metric helpers bound to one service's label."""
+
+    def __init__(self, service: str):
+        self.service = service
+        self._stages = {}
+
+    @property
+    def enabled(self) -> bool:
+        return _load_metrics() is not None
+
+    def stage(self, name: str):
+        """Context manager timing one pipeline stage."""
+        if not METRICS_ENABLED:
+            return _NULL_STAGE
+        histogram = self._stages.get(name)
+        if histogram is None:
+            metrics = _load_metrics()
+            if metrics is None:
+                return _NULL_STAGE
+            histogram = self._stages[name] = metrics["stage_seconds"].labels(self.service, name)
+        return _StageTimer(histogram)
+
+    def cache(self, cache: str, hit: bool, count: int = 1):
+        if METRICS_ENABLED and count:
+            metrics = _load_metrics()
+            if metrics is not None:
+                metrics["cache_events"].labels(self.service, cache, "hit" if hit else "miss").inc(count)
+
+    def failure(self, dependency: str):
+        if METRICS_ENABLED:
+            metrics = _load_metrics()
+            if metrics is not None:
+                metrics["failures"].labels(self.service, dependency).inc()
+
+    def batch(self, model: str, size: int):
+        if METRICS_ENABLED:
+            metrics = _load_metrics()
+            if metrics is not None:
+                metrics["batch_size"].labels(self.service, model).observe(size)
+
+    def instrument(self, app):
+        """Add the request middleware and /metrics to an app; does nothing when metrics are off."""
+        metrics = _load_metrics()
+        if metrics is None:
+            return
+        client = metrics["client"]
+        app.add_middleware(_MetricsMiddleware, service=self.service)
+
+        from fastapi import Response
+
+        @app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics():
+            registry = client.REGISTRY
+            if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+                from prometheus_client import CollectorRegistry, multiprocess
+                registry = CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry)
+            return Response(client.generate_latest(registry), media_type=client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,337 @@
+"""
+Versioned hiring-model registry with hot reloading and shadow scoring.
+
+Each trained model is published as an immutable version directory under
+models/registry/ holding the pipeline, its compact serving artifact and a
+metadata.json with the training metrics. Small pointer files name the
+active version and an optional shadow version. A background thread watches
+the pointers, loads a newly selected version off the request path and swaps
+it in atomically, so deploying a retrained model needs no restart.
+
+    python model_registry.py list
+    python model_registry.py activate <version>
+    python model_registry.py shadow <version|none>
+"""
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+
+from hiring_features import build_features, frame_from_requests
+from hiring_runtime import COMPACT_MODEL_DIR, MANIFEST_FILE, CompactHiringModel, export_serving_artifact
+
+REGISTRY_DIR = os.path.join("models", "registry")
+ACTIVE_POINTER = "ACTIVE"
+SHADOW_POINTER = "SHADOW"
+PIPELINE_FILE = "pipeline.joblib"
+COMPACT_DIR = "compact"
+METADATA_FILE = "metadata.json"
+LEGACY_MODEL_PATH = os.path.join("models", "hiring_model.joblib")
+LEGACY_VERSION = "legacy"
+# Shadow batches waiting or running at once; further ones are dropped, not queued
+SHADOW_MAX_PENDING = 4
+
+
+def _write_atomic(path: str, content: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def publish_model(pipeline, metrics: Dict[str, Any], registry_dir: str = REGISTRY_DIR,
+                  activate: bool = False, shadow: bool = False) -> str:
+    """
+    Store a fitted pipeline as a new registry version and return the version.
+    The version directory is assembled under a temporary name and renamed
+    into place, so loaders never see a partial version. A new version is
+    only served once activated, or scored alongside the live one as shadow.
+    """
+    os.makedirs(registry_dir, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    while os.path.exists(os.path.join(registry_dir, version)):
+        suffix += 1
+        version = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+
+    staging_dir = os.path.join(registry_dir, f".staging-{version}")
+    os.makedirs(staging_dir)
+    try:
+        joblib.dump(pipeline, os.path.join(staging_dir, PIPELINE_FILE))
+        export_serving_artifact(pipeline, os.path.join(staging_dir, COMPACT_DIR))
+        metadata = {"version": version, "created_at": datetime.now().isoformat(), **metrics}
+        with open(os.path.join(staging_dir, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+        os.rename(staging_dir, os.path.join(registry_dir, version))
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    if activate:
+        set_pointer(ACTIVE_POINTER, version, registry_dir)
+    elif shadow:
+        set_pointer(SHADOW_POINTER, version, registry_dir)
+    return version
+
+
+def list_versions(registry_dir: str = REGISTRY_DIR) -> List[Dict[str, Any]]:
+    """Metadata of every published version, oldest first."""
+    if not os.path.isdir(registry_dir):
+        return []
+    versions = []
+    for name in os.listdir(registry_dir):
+        metadata_path = os.path.join(registry_dir, name, METADATA_FILE)
+        if not name.startswith('.') and os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                versions.append(json.load(f))
+    return sorted(versions, key=lambda metadata: metadata.get("created_at", ""))
+
+
+def read_pointer(pointer: str, registry_dir: str = REGISTRY_DIR) -> Optional[str]:
+    path = os.path.join(registry_dir, pointer)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip() or None
+
+
+def set_pointer(pointer: str, version: Optional[str], registry_dir: str = REGISTRY_DIR):
+    """Point ACTIVE or SHADOW at a version (None clears it)."""
+    if version is not None and not os.path.exists(os.path.join(registry_dir, version, METADATA_FILE)):
+        raise ValueError(f"Unknown model version {version}")
+    os.makedirs(registry_dir, exist_ok=True)
+    _write_atomic(os.path.join(registry_dir, pointer), version or "")
+
+
+class LoadedModel:
+    """A model version held in memory, with load bookkeeping."""
+
+    def __init__(self, version: str, model, metadata: Dict[str, Any], load_seconds: float):
+        self.version = version
+        self.model = model
+        self.metadata = metadata
+        self.loaded_at = datetime.now().isoformat()
+        self.load_seconds = load_seconds
+
+    def predict_proba(self, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        """Probability of being hired for each /predict-hiring payload."""
+        if isinstance(self.model, CompactHiringModel):
+            return self.model.predict_proba(payloads)
+        return self.model.predict_proba(build_features(frame_from_requests(payloads)))[:, 1]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+            "metadata": self.metadata,
+        }
+
+
+def load_version(version: str, registry_dir: str = REGISTRY_DIR) -> LoadedModel:
+    start = time.perf_counter()
+    if version == LEGACY_VERSION:
+        # Pre-registry artifacts written straight into models/
+        if os.path.exists(os.path.join(COMPACT_MODEL_DIR, MANIFEST_FILE)):
+            model = CompactHiringModel.load(COMPACT_MODEL_DIR)
+        else:
+            model = joblib.load(LEGACY_MODEL_PATH)
+        metadata = {"version": LEGACY_VERSION}
+    else:
+        version_dir = os.path.join(registry_dir, version)
+        with open(os.path.join(version_dir, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        compact_dir = os.path.join(version_dir, COMPACT_DIR)
+        if os.path.exists(os.path.join(compact_dir, MANIFEST_FILE)):
+            model = CompactHiringModel.load(compact_dir)
+        else:
+            model = joblib.load(os.path.join(version_dir, PIPELINE_FILE))
+    return LoadedModel(version, model, metadata, time.perf_counter() - start)
+
+
+class ShadowStats:
+    """Running comparison of shadow predictions against the live model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset(None)
+
+    def reset(self, version: Optional[str]):
+        with self._lock:
+            self.version = version
+            self.scored = 0
+            self.agreements = 0
+            self.total_abs_diff = 0.0
+            self.errors = 0
+            self.dropped = 0
+
+    def record(self, version: str, live: np.ndarray, shadow: np.ndarray):
+        with self._lock:
+            if version != self.version:
+                return
+            self.scored += len(live)
+            self.agreements += int(np.sum((live > 0.5) == (shadow > 0.5)))
+            self.total_abs_diff += float(np.sum(np.abs(live - shadow)))
+
+    def record_error(self, version: str):
+        with self._lock:
+            if version == self.version:
+                self.errors += 1
+
+    def record_dropped(self, version: str):
+        with self._lock:
+            if version == self.version:
+                self.dropped += 1
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "scored": self.scored,
+                "agreement_rate": self.agreements / self.scored if self.scored else None,
+                "mean_abs_probability_diff": self.total_abs_diff / self.scored if self.scored else None,
+                "errors": self.errors,
+                "dropped": self.dropped,
+            }
+
+
+class ModelRegistry:
+    """Serves the active model version and hot-swaps it when the pointers change."""
+
+    def __init__(self, registry_dir: str = REGISTRY_DIR, poll_interval: float = 10.0):
+        self.registry_dir = registry_dir
+        self.poll_interval = poll_interval
+        self.active: Optional[LoadedModel] = None
+        self.shadow: Optional[LoadedModel] = None
+        self.shadow_stats = ShadowStats()
+        self._swap_lock = threading.Lock()
+        self._shadow_executor: Optional[ThreadPoolExecutor] = None
+        self._shadow_executor_lock = threading.Lock()
+        self._shadow_slots = threading.BoundedSemaphore(SHADOW_MAX_PENDING)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _wanted_active(self) -> Optional[str]:
+        version = read_pointer(ACTIVE_POINTER, self.registry_dir)
+        if version:
+            return version
+        if list_versions(self.registry_dir):
+            # Only an explicit activation serves a published version; shadow and
+            # incremental versions must never go live by being the newest
+            return None
+        if os.path.exists(os.path.join(COMPACT_MODEL_DIR, MANIFEST_FILE)) or os.path.exists(LEGACY_MODEL_PATH):
+            return LEGACY_VERSION
+        return None
+
+    def refresh(self):
+        """Load and swap in the versions the pointers name, if they changed."""
+        wanted_active = self._wanted_active()
+        if wanted_active and (self.active is None or self.active.version != wanted_active):
+            loaded = load_version(wanted_active, self.registry_dir)
+            with self._swap_lock:
+                self.active = loaded
+            print(f"Activated hiring model {loaded.version} (loaded in {loaded.load_seconds:.2f}s)")
+
+        wanted_shadow = read_pointer(SHADOW_POINTER, self.registry_dir)
+        current_shadow = self.shadow.version if self.shadow else None
+        if wanted_shadow != current_shadow:
+            loaded = load_version(wanted_shadow, self.registry_dir) if wanted_shadow else None
+            with self._swap_lock:
+                self.shadow = loaded
+                self.shadow_stats.reset(wanted_shadow)
+            print(f"Shadow hiring model set to {wanted_shadow}")
+
+    def start(self):
+        self._ensure_shadow_executor()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-registry-loader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._shadow_executor_lock:
+            executor, self._shadow_executor = self._shadow_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _ensure_shadow_executor(self) -> ThreadPoolExecutor:
+        # Created per start (and on first use without one), since stop() shuts it down
+        with self._shadow_executor_lock:
+            if self._shadow_executor is None:
+                self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scoring")
+            return self._shadow_executor
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Model registry refresh failed: {str(e)}")
+
+    def predict_proba(self, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        """Score with the active model; the shadow model scores the same batch off the request path."""
+        live = self.active
+        if live is None:
+            raise RuntimeError("No hiring model is active")
+        probabilities = live.predict_proba(payloads)
+
+        shadow = self.shadow
+        if shadow is not None:
+            self._submit_shadow(shadow, payloads, probabilities)
+        return probabilities
+
+    def _submit_shadow(self, shadow: LoadedModel, payloads: List[Dict[str, Any]], live: np.ndarray):
+        """Score off the request path; when the shadow model falls behind, skip the batch."""
+        if not self._shadow_slots.acquire(blocking=False):
+            self.shadow_stats.record_dropped(shadow.version)
+            return
+        try:
+            self._ensure_shadow_executor().submit(self._score_shadow, shadow, payloads, live)
+        except RuntimeError:
+            # Shut down by a concurrent stop()
+            self._shadow_slots.release()
+            self.shadow_stats.record_dropped(shadow.version)
+
+    def _score_shadow(self, shadow: LoadedModel, payloads: List[Dict[str, Any]], live: np.ndarray):
+        try:
+            self.shadow_stats.record(shadow.version, live, shadow.predict_proba(payloads))
+        except Exception as e:
+            self.shadow_stats.record_error(shadow.version)
+            print(f"Shadow scoring with {shadow.version} failed: {str(e)}")
+        finally:
+            self._shadow_slots.release()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "active": self.active.describe() if self.active else None,
+            "shadow": self.shadow.describe() if self.shadow else None,
+            "shadow_stats": self.shadow_stats.describe(),
+            "available": [metadata["version"] for metadata in list_versions(self.registry_dir)],
+        }
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "list":
+        active = read_pointer(ACTIVE_POINTER)
+        shadow = read_pointer(SHADOW_POINTER)
+        for metadata in list_versions():
+            marker = " (active)" if metadata["version"] == active else " (shadow)" if metadata["version"] == shadow else ""
+            print(f"{metadata['version']}{marker}: precision={metadata.get('precision')} accuracy={metadata.get('accuracy')}")
+    elif command == "activate" and len(sys.argv) == 3:
+        set_pointer(ACTIVE_POINTER, sys.argv[2])
+    elif command == "shadow" and len(sys.argv) == 3:
+        set_pointer(SHADOW_POINTER, None if sys.argv[2] == "none" else sys.argv[2])
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,329 @@
+"""
+Persistent per-job ranking state for incremental re-ranking.
+
+New candidates are appended to a shared candidate log by the resume parsing
+service. The matching service keeps, for every job, the score of each
+candidate it has already ranked plus the log position it has consumed up to,
+so a ranking request only scores candidates that arrived since the last one.
+Stored scores are tied to a fingerprint of the job description and scoring
+weights; a different fingerprint discards them. The skills and experience
+of every scored candidate are kept alongside, so a ranking can be filtered
+and paged without reloading the candidate pool.
+
+A job can also be ranked under per-request weights. Such variant rankings
+are stored under "<job key>#<weights hash>"; only the MAX_VARIANT_RANKINGS
+most recently used are kept, the others are deleted. Likewise only the
+MAX_CACHED_PROFILES most recently used candidate profiles stay in memory;
+the others are read back from the database when a page needs them.
+
+Only the standard library is used so the parsing service can import this
+module without loading any models.
+"""
+import bisect
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from sqlite_store import ProcessLocalConnection
+
+RANKING_STATE_DB = os.getenv("RANKING_STATE_DB", "ranking_state.db")
+MAX_VARIANT_RANKINGS = int(os.getenv("MAX_VARIANT_RANKINGS", "32"))
+VARIANT_SEPARATOR = "#"
+# Has to hold the profiles of one page scan (a few hundred) for filtering to see them
+MAX_CACHED_PROFILES = int(os.getenv("MAX_CACHED_PROFILES", "50000"))
+
+
+class CandidateLog:
+    """Append-only log of candidates added after a ranking was built."""
+
+    def __init__(self, db_path: str = RANKING_STATE_DB):
+        self._lock = threading.Lock()
+        self._connection = ProcessLocalConnection(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidate_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._connection()
+
+    def append(self, candidate: Dict[str, Any]) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO candidate_log (payload, created_at) VALUES (?, ?)",
+                (json.dumps(candidate, default=str), datetime.now().isoformat())
+            )
+        return cursor.lastrowid
+
+    def last_seq(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM candidate_log").fetchone()
+        return row[0]
+
+    def read_range(self, after_seq: int, up_to_seq: Optional[int] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return (seq, candidate) entries with after_seq < seq <= up_to_seq."""
+        query = "SELECT seq, payload FROM candidate_log WHERE seq > ?"
+        params: List[Any] = [after_seq]
+        if up_to_seq is not None:
+            query += " AND seq <= ?"
+            params.append(up_to_seq)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY seq", params).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+
+class JobRanking:
+    """Scores of every ranked candidate for one job, kept sorted by score."""
+
+    def __init__(self, job_key: str, fingerprint: str, last_seq: int):
+        self.job_key = job_key
+        self.fingerprint = fingerprint
+        self.last_seq = last_seq
+        self.entries: Dict[str, Tuple[str, float]] = {}
+        # (-score, candidate_key) so the best candidates come first
+        self._order: List[Tuple[float, str]] = []
+
+    def __len__(self):
+        return len(self._order)
+
+    def upsert(self, candidate_key: str, name: str, score: float):
+        previous = self.entries.get(candidate_key)
+        if previous is not None:
+            index = bisect.bisect_left(self._order, (-previous[1], candidate_key))
+            del self._order[index]
+        self.entries[candidate_key] = (name, score)
+        bisect.insort(self._order, (-score, candidate_key))
+
+    def top(self, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the k best candidates (all if k is None) as name/score dicts."""
+        order = self._order if k is None else self._order[:k]
+        return [
+            {"key": key, "name": self.entries[key][0], "score": -neg_score}
+            for neg_score, key in order
+        ]
+
+    def iter_after(self, position: Optional[Tuple[float, str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield candidates best first, starting after `position`, the (score, key)
+        of the last one already seen. Keyset positions stay valid while new
+        candidates are inserted.
+        """
+        start = 0 if position is None else bisect.bisect_right(self._order, (-position[0], position[1]))
+        # Indexed rather than sliced, so a page read near the top does not copy the whole order
+        for index in range(start, len(self._order)):
+            neg_score, key = self._order[index]
+            yield {"key": key, "name": self.entries[key][0], "score": -neg_score}
+
+
+class CandidateProfile:
+    """The filterable attributes of a scored candidate."""
+
+    __slots__ = ("skills", "skill_set", "experience_years")
+
+    def __init__(self, skills: List[str], experience_years: Optional[float]):
+        self.skills = skills
+        self.skill_set: FrozenSet[str] = frozenset(skill.strip().lower() for skill in skills)
+        self.experience_years = experience_years
+
+
+class RankingStore:
+    """SQLite persistence plus an in-memory cache of JobRanking objects."""
+
+    def __init__(self, db_path: str = RANKING_STATE_DB, max_variants: int = MAX_VARIANT_RANKINGS,
+                 max_profiles: int = MAX_CACHED_PROFILES):
+        self.max_variants = max_variants
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._connection = ProcessLocalConnection(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_rankings (
+                job_key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                last_seq INTEGER NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_scores (
+                job_key TEXT NOT NULL,
+                candidate_key TEXT NOT NULL,
+                name TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (job_key, candidate_key)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidate_profiles (
+                candidate_key TEXT PRIMARY KEY,
+                skills TEXT NOT NULL,
+                experience_years REAL
+            )
+            """
+        )
+        self._rankings: Dict[str, JobRanking] = {}
+        # Least recently used first
+        self._profiles: "OrderedDict[str, CandidateProfile]" = OrderedDict()
+        # Variant rankings, least recently used first; stored ones count from their last update
+        self._variants: "OrderedDict[str, None]" = OrderedDict(
+            (job_key, None) for job_key, in self._conn.execute(
+                "SELECT job_key FROM job_rankings WHERE instr(job_key, ?) > 0 ORDER BY updated_at",
+                (VARIANT_SEPARATOR,)
+            )
+        )
+        self._evict_variants()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._connection()
+
+    def load(self, job_key: str, fingerprint: str) -> Optional[JobRanking]:
+        """Return the stored ranking for a job, or None if missing or stale."""
+        ranking = self._rankings.get(job_key)
+        if ranking is not None and ranking.fingerprint == fingerprint:
+            self._use(job_key)
+            return ranking
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, last_seq FROM job_rankings WHERE job_key = ?", (job_key,)
+            ).fetchone()
+            if row is None or row[0] != fingerprint:
+                return None
+            scores = self._conn.execute(
+                "SELECT candidate_key, name, score FROM job_scores WHERE job_key = ?", (job_key,)
+            ).fetchall()
+
+        ranking = JobRanking(job_key, fingerprint, row[1])
+        for candidate_key, name, score in scores:
+            ranking.upsert(candidate_key, name, score)
+        self._rankings[job_key] = ranking
+        self._use(job_key)
+        return ranking
+
+    def reset(self, job_key: str, fingerprint: str, last_seq: int,
+              scored: Iterable[Tuple[str, str, float]]) -> JobRanking:
+        """Replace a job's ranking with freshly scored (key, name, score) entries."""
+        ranking = JobRanking(job_key, fingerprint, last_seq)
+        for candidate_key, name, score in scored:
+            ranking.upsert(candidate_key, name, score)
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM job_scores WHERE job_key = ?", (job_key,))
+                self._write(ranking, list(ranking.entries.items()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._rankings[job_key] = ranking
+        self._use(job_key)
+        return ranking
+
+    def add(self, ranking: JobRanking, last_seq: int, scored: Iterable[Tuple[str, str, float]]):
+        """Insert newly scored candidates into an existing ranking."""
+        scored = list(scored)
+        for candidate_key, name, score in scored:
+            ranking.upsert(candidate_key, name, score)
+        ranking.last_seq = last_seq
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                stored = self._conn.execute(
+                    "SELECT 1 FROM job_rankings WHERE job_key = ?", (ranking.job_key,)
+                ).fetchone()
+                # Evicted by another process meanwhile: store the whole ranking again
+                entries = (list(ranking.entries.items()) if stored is None
+                           else [(key, (name, score)) for key, name, score in scored])
+                self._write(ranking, entries)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, job_key: str):
+        self._rankings.pop(job_key, None)
+        self._variants.pop(job_key, None)
+        with self._lock:
+            self._conn.execute("DELETE FROM job_rankings WHERE job_key = ?", (job_key,))
+            self._conn.execute("DELETE FROM job_scores WHERE job_key = ?", (job_key,))
+
+    def _use(self, job_key: str):
+        if VARIANT_SEPARATOR not in job_key:
+            return
+        self._variants[job_key] = None
+        self._variants.move_to_end(job_key)
+        self._evict_variants()
+
+    def _evict_variants(self):
+        while len(self._variants) > self.max_variants:
+            self.invalidate(next(iter(self._variants)))
+
+    def save_profiles(self, profiles: Iterable[Tuple[str, List[str], Optional[float]]]):
+        """Store (key, skills, experience_years) of scored candidates."""
+        profiles = list(profiles)
+        for key, skills, experience_years in profiles:
+            self._cache_profile(key, CandidateProfile(skills, experience_years))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO candidate_profiles (candidate_key, skills, experience_years) VALUES (?, ?, ?)",
+                [(key, json.dumps(skills), experience_years) for key, skills, experience_years in profiles]
+            )
+
+    def load_profiles(self, keys: Iterable[str]):
+        """Make sure the profiles of these candidates are in memory, e.g. after a restart or eviction."""
+        missing = []
+        for key in keys:
+            if key in self._profiles:
+                self._profiles.move_to_end(key)
+            else:
+                missing.append(key)
+        if missing:
+            with self._lock:
+                # Chunked to stay under SQLite's bound-parameter limit
+                rows = []
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    rows += self._conn.execute(
+                        "SELECT candidate_key, skills, experience_years FROM candidate_profiles "
+                        f"WHERE candidate_key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+            for key, skills, experience_years in rows:
+                self._cache_profile(key, CandidateProfile(json.loads(skills), experience_years))
+
+    def profile(self, key: str) -> Optional[CandidateProfile]:
+        """A profile in memory; call load_profiles first for ones that may have been evicted."""
+        return self._profiles.get(key)
+
+    def _cache_profile(self, key: str, profile: CandidateProfile):
+        self._profiles[key] = profile
+        self._profiles.move_to_end(key)
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def _write(self, ranking: JobRanking, entries: List[Tuple[str, Tuple[str, float]]]):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO job_rankings (job_key, fingerprint, last_seq, updated_at) VALUES (?, ?, ?, ?)",
+            (ranking.job_key, ranking.fingerprint, ranking.last_seq, datetime.now().isoformat())
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO job_scores (job_key, candidate_key, name, score) VALUES (?, ?, ?, ?)",
+            [(ranking.job_key, key, name, score) for key, (name, score) in entries]
+        )
@@ -0,0 +1,180 @@
+"""
+Opt-in sampling profiler for individual requests.
+
+With PROFILING_ENABLED=true, a request is profiled when it carries an
+`X-Profile: 1` header, or at random with probability PROFILE_SAMPLE_RATE.
+Randomly sampled requests are only kept if they took at least
+PROFILE_MIN_MS. While a profiled request runs, a background thread samples
+the stack of the thread handling it every PROFILE_INTERVAL_MS. The samples
+are written to PROFILE_DIR in collapsed-stack format, one
+`frame;frame;frame count` line per distinct stack, which flamegraph.pl and
+speedscope read directly. The oldest profiles are deleted once the directory
+exceeds PROFILE_MAX_MB; the profile just written is never among them. Files
+are written and rotated off the event loop. A requested profile ends when
+the response starts, so that its file name can be returned in the
+X-Profile-File response header; the header is only set when a file was
+written.
+
+Handlers in these services are `async def` functions that run their work on
+the event loop thread, so the sampled stacks cover the handler body, e.g.
+parse_resume or match_candidates_to_job. Other requests interleaving on the
+same loop show up in the profile too. Only one request is profiled at a time.
+"""
+import asyncio
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MIN_MS = float(os.getenv("PROFILE_MIN_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_MB = float(os.getenv("PROFILE_MAX_MB", "100"))
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".folded"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's stack on a background thread and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+class ProfileWriter:
+    """Writes collapsed-stack profiles into a directory bounded in total size."""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_bytes: int = int(PROFILE_MAX_MB * 2**20)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def write(self, name: str, stacks: Counter) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name + PROFILE_SUFFIX)
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self._rotate(keep=path)
+        return path
+
+    def _rotate(self, keep: str):
+        """Delete the oldest profiles other than `keep` until the directory fits."""
+        with self._lock:
+            profiles = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(PROFILE_SUFFIX) and entry.path != keep:
+                    stat = entry.stat()
+                    profiles.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in profiles) + os.path.getsize(keep)
+            for _, size, path in sorted(profiles):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling sampled or explicitly requested requests."""
+
+    def __init__(self, app, service: str, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 min_ms: float = PROFILE_MIN_MS, interval_ms: float = PROFILE_INTERVAL_MS,
+                 writer: Optional[ProfileWriter] = None):
+        self.app = app
+        self.service = service
+        self.sample_rate = sample_rate
+        self.min_ms = min_ms
+        self.interval = interval_ms / 1000
+        self.writer = writer or ProfileWriter()
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = any(name == PROFILE_HEADER and value not in (b"", b"0") for name, value in scope["headers"])
+        sampled = not requested and self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = "{}_{}_{}_{}".format(
+            datetime.now().strftime("%Y%m%d-%H%M%S-%f"), self.service, scope["method"],
+            re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        )
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        start = time.perf_counter()
+        finished = False
+
+        async def finish_profile() -> Optional[str]:
+            """Stop sampling and write the profile if it is kept; the path written, if any."""
+            nonlocal finished
+            finished = True
+            stacks = sampler.stop()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._busy.release()
+            if not stacks or not (requested or elapsed_ms >= self.min_ms):
+                return None
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, self.writer.write, name, stacks)
+            except OSError as e:
+                print(f"Failed to write request profile: {str(e)}")
+                return None
+
+        async def send_with_profile_header(message):
+            if message["type"] == "http.response.start" and requested and not finished:
+                path = await finish_profile()
+                if path:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-profile-file", os.path.basename(path).encode()))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_header)
+        finally:
+            if not finished:
+                await finish_profile()
+
+
+def install_profiler(app, service: str):
+    """Add the profiling middleware to an app when PROFILING_ENABLED is set."""
+    if PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware, service=service)
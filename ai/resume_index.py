@@ -0,0 +1,214 @@
+"""
+Index of resumes the parsing service has already processed, so a resume
+uploaded again is answered from the stored result instead of paying for
+another Gemini call, storage upload and candidates row.
+
+Three checks run in order of cost:
+
+  pdf       SHA-256 of the uploaded bytes, before any text is extracted
+  text      SHA-256 of the normalized text (case, whitespace and
+            punctuation folded), so a re-export of the same document matches
+  near      MinHash signature of word shingles, looked up through LSH bands,
+            accepted when the estimated Jaccard similarity reaches
+            RESUME_NEAR_DUPLICATE_THRESHOLD
+
+Results are stored per pipeline (send-data and parse-resume return
+different shapes). Signatures are computed with numpy only, so the parsing
+service needs no extra dependency.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sqlite_store import ProcessLocalConnection
+
+RESUME_INDEX_DB = os.getenv("RESUME_INDEX_DB", "resume_index.db")
+RESUME_NEAR_DUPLICATE_THRESHOLD = float(os.getenv("RESUME_NEAR_DUPLICATE_THRESHOLD", "0.9"))
+
+SHINGLE_WORDS = 5
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+LSH_BANDS = 16
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Multiply-shift hashing: (a * x + b) >> 32 with odd 64-bit a, computed in
+# wrapping uint64 arithmetic. Fixed seed so signatures are stable across processes.
+_rng = np.random.default_rng(20240611)
+_PERM_A = (_rng.integers(1, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_tokens(text))
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash of the text's word shingles; None if it has no words."""
+    tokens = _tokens(text)
+    if not tokens:
+        return None
+    width = min(SHINGLE_WORDS, len(tokens))
+    shingles = {" ".join(tokens[i:i + width]) for i in range(len(tokens) - width + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    with np.errstate(over="ignore"):
+        permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def _band_keys(signature: np.ndarray) -> List[Tuple[int, int]]:
+    rows = len(signature) // LSH_BANDS
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest(),
+            "little", signed=True
+        ))
+        for band in range(LSH_BANDS)
+    ]
+
+
+class ResumeFingerprint:
+    """The hashes and signature one upload is looked up and stored under."""
+
+    def __init__(self, pdf_hash: str, text: Optional[str] = None):
+        self.pdf_hash = pdf_hash
+        self.text_hash = None
+        self.signature = None
+        if text is not None:
+            self.add_text(text)
+
+    @classmethod
+    def from_upload(cls, contents: bytes) -> "ResumeFingerprint":
+        return cls(sha256(contents))
+
+    def add_text(self, text: str):
+        self.text_hash = sha256(normalize_text(text).encode("utf-8"))
+        self.signature = minhash_signature(text)
+
+
+class ResumeIndex:
+    """Stored pipeline results keyed by PDF hash, text hash and LSH buckets."""
+
+    def __init__(self, db_path: str = RESUME_INDEX_DB, threshold: float = RESUME_NEAR_DUPLICATE_THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._connection = ProcessLocalConnection(db_path, row_factory=sqlite3.Row)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resumes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                pdf_hash TEXT NOT NULL,
+                text_hash TEXT,
+                signature BLOB,
+                result TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                UNIQUE (kind, pdf_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_text ON resumes (kind, text_hash)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_lsh (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                resume_id INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_lsh_bucket ON resume_lsh (band, bucket)")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._connection()
+
+    def find(self, kind: str, fingerprint: ResumeFingerprint) -> Optional[Tuple[str, Any]]:
+        """
+        Return (match, stored result) for the closest known resume, where match
+        is "pdf", "text" or "near"; None if the resume is new. Only the checks
+        the fingerprint has data for are run.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM resumes WHERE kind = ? AND pdf_hash = ?", (kind, fingerprint.pdf_hash)
+            ).fetchone()
+            if row is not None:
+                return "pdf", json.loads(row["result"])
+            if fingerprint.text_hash is None:
+                return None
+
+            row = self._conn.execute(
+                "SELECT result FROM resumes WHERE kind = ? AND text_hash = ? LIMIT 1",
+                (kind, fingerprint.text_hash)
+            ).fetchone()
+            if row is not None:
+                return "text", json.loads(row["result"])
+            if fingerprint.signature is None:
+                return None
+
+            candidates = self._near_candidates(kind, fingerprint.signature)
+        if not candidates:
+            return None
+
+        # Share of equal MinHash rows estimates the Jaccard similarity of the shingle sets
+        signatures = np.stack([np.frombuffer(signature, dtype=np.uint32) for _, signature, _ in candidates])
+        similarities = (signatures == fingerprint.signature).mean(axis=1)
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        return "near", json.loads(candidates[best][2])
+
+    def _near_candidates(self, kind: str, signature: np.ndarray) -> List[Tuple[int, bytes, str]]:
+        keys = _band_keys(signature)
+        clause = " OR ".join("(l.band = ? AND l.bucket = ?)" for _ in keys)
+        rows = self._conn.execute(
+            "SELECT DISTINCT r.id, r.signature, r.result FROM resume_lsh l JOIN resumes r ON r.id = l.resume_id "
+            f"WHERE r.kind = ? AND ({clause})",
+            [kind] + [value for key in keys for value in key]
+        ).fetchall()
+        return [(row["id"], row["signature"], row["result"]) for row in rows]
+
+    def add(self, kind: str, fingerprint: ResumeFingerprint, result: Any) -> bool:
+        """Store a pipeline result; False if this exact upload was already stored."""
+        signature = fingerprint.signature
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO resumes (kind, pdf_hash, text_hash, signature, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, fingerprint.pdf_hash, fingerprint.text_hash,
+                     signature.tobytes() if signature is not None else None,
+                     json.dumps(result, default=str), datetime.now().isoformat())
+                )
+                added = cursor.rowcount == 1
+                if added and signature is not None:
+                    self._conn.executemany(
+                        "INSERT INTO resume_lsh (band, bucket, resume_id) VALUES (?, ?, ?)",
+                        [(band, bucket, cursor.lastrowid) for band, bucket in _band_keys(signature)]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Set
@@ -7,13 +8,38 @@ import pandas as pd
 import json
 import os
 import re
-import joblib
+import base64
+import hashlib
+import itertools
+import math
+from collections import Counter, OrderedDict
+from datetime import date
 from fastapi.middleware.cors import CORSMiddleware
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
-app = FastAPI(title="Resume Matching API")
+from encoder import load_encoder
+from metrics import ServiceMetrics
+from model_registry import ModelRegistry
+from ranking_state import VARIANT_SEPARATOR, CandidateLog, JobRanking, RankingStore
+from request_profiler import install_profiler
+from service_lifecycle import WARMUP_ON_STARTUP, LazyResource, Warmup, health_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models load in the background; /readyz reports when they are warm
+    if WARMUP_ON_STARTUP:
+        warmup.start()
+    model_registry.start()
+    yield
+    model_registry.stop()
+
+app = FastAPI(title="Resume Matching API", lifespan=lifespan)
+
+metrics = ServiceMetrics("resume_matcher")
+metrics.instrument(app)
+install_profiler(app, "resume_matcher")
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,26 +49,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-MODEL_DIR = "models"
-STANDARD_MODEL_PATH = os.path.join(MODEL_DIR, "hiring_model.joblib")
+# Versioned hiring models; the registry hot-swaps a newly activated version
+model_registry = ModelRegistry()
 
-try:
-    if os.path.exists(STANDARD_MODEL_PATH):
-        hiring_model = joblib.load(STANDARD_MODEL_PATH)
-        print(f"Loaded model from {STANDARD_MODEL_PATH}")
-    else:
-        model_files = [f for f in os.listdir(MODEL_DIR) if f.startswith("hiring_model_") and f.endswith(".joblib")]
-        if model_files:
-            latest_model = sorted(model_files)[-1]
-            model_path = os.path.join(MODEL_DIR, latest_model)
-            hiring_model = joblib.load(model_path)
-            print(f"Loaded most recent model from {model_path}")
-        else:
-            print("WARNING: No hiring prediction model found! The predict_hire endpoint will not work.")
-            hiring_model = None
-except Exception as e:
-    print(f"Error loading model: {str(e)}")
-    hiring_model = None
+def load_hiring_models() -> ModelRegistry:
+    # Failing keeps /readyz at 503 until a model can be served; warmup and requests retry
+    model_registry.refresh()
+    if model_registry.active is None:
+        raise RuntimeError("No hiring prediction model found; publish one with hiring_model.py")
+    return model_registry
+
+def serving_hiring_models() -> ModelRegistry:
+    try:
+        return hiring_models.get()
+    except Exception:
+        raise HTTPException(status_code=503, detail="Hiring prediction model is not available")
+
+hiring_models = LazyResource("hiring model", load_hiring_models)
 
 class HiringPredictionRequest(BaseModel):
     resume_text: str
@@ -63,62 +86,53 @@ class HiringPredictionResponse(BaseModel):
     hiring_probability: float
     message: str
 
-# Add new prediction endpoint
-# python
+class BatchHiringPredictionRequest(BaseModel):
+    candidates: List[HiringPredictionRequest]
+
+class BatchHiringPredictionResponse(BaseModel):
+    predictions: List[HiringPredictionResponse]
+
+def predict_hiring_batch(requests: List[HiringPredictionRequest]) -> List[HiringPredictionResponse]:
+    """
+    Score a batch of candidates with the hiring model, building features with
+    the same code used for training.
+    """
+    metrics.batch("hiring_model", len(requests))
+    with metrics.stage("hiring_predict"):
+        probabilities = model_registry.predict_proba([r.dict() for r in requests])
+    # Same 0.5 threshold XGBClassifier.predict applies
+    predictions = probabilities > 0.5
+    return [
+        HiringPredictionResponse(
+            hired_prediction=bool(prediction),
+            hiring_probability=float(probability),
+            message="Candidate is likely to be hired" if prediction else "Candidate is not likely to be hired"
+        )
+        for prediction, probability in zip(predictions, probabilities)
+    ]
+
 @app.post("/predict-hiring", response_model=HiringPredictionResponse)
 async def predict_hiring(request: HiringPredictionRequest):
-    if hiring_model is None:
-        raise HTTPException(status_code=503, detail="Hiring prediction model is not available")
-    
-    # Preprocess the data
-    resume_text_clean = preprocess_text(request.resume_text)
-    job_description_clean = preprocess_text(request.job_description)
-    skill_match = get_skill_graph_score(request.skills, request.required_skills) / 100.0
-    salary_difference = request.offered_salary - request.salary_expectation
-    salary_diff_percentage = (salary_difference / request.salary_expectation) * 100
-    skill_match_score = get_skills_match_score(request.skills, request.required_skills, [])
-    
-    # Derive experience level
-    if request.experience_years < 2:
-        experience_level = "Junior"
-    elif 2 <= request.experience_years < 5:
-        experience_level = "Mid"
-    else:
-        experience_level = "Senior"
-    
-    # Prepare input data
-    input_data = {
-        'Resume_Text_Clean': resume_text_clean,
-        'Job_Description_Clean': job_description_clean,
-        'Education': request.education,
-        'Industry': request.industry,
-        'Work_Type': request.work_type,
-        'Location': request.location,
-        'Applied_Job_Title': request.applied_job_title,
-        'Experience (Years)': request.experience_years,
-        'Salary_Expectation': request.salary_expectation,
-        'Offered_Salary': request.offered_salary,
-        'Salary_Difference': salary_difference,
-        'Skill_Match_Ratio': skill_match,
-        'Skill_Match_Score': skill_match_score,
-        'Salary_Diff_Percentage': salary_diff_percentage,
-        'Experience_Level': experience_level,
-    }
-    
-    input_df = pd.DataFrame([input_data])
-    
+    serving_hiring_models()
+
     try:
-        prediction = hiring_model.predict(input_df)[0]
-        probability = hiring_model.predict_proba(input_df)[0][1]
-        return {
-            "hired_prediction": bool(prediction),
-            "hiring_probability": float(probability),
-            "message": "Candidate is likely to be hired" if prediction else "Candidate is not likely to be hired"
-        }
+        return predict_hiring_batch([request])[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
-    
-    
+
+@app.post("/predict-hiring/batch", response_model=BatchHiringPredictionResponse)
+async def predict_hiring_many(request: BatchHiringPredictionRequest):
+    serving_hiring_models()
+
+    try:
+        return BatchHiringPredictionResponse(predictions=predict_hiring_batch(request.candidates))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
 def preprocess_text(text):
     """Clean and preprocess text data using regex"""
     if isinstance(text, str):
@@ -126,30 +140,34 @@ def preprocess_text(text):
         text = text.lower()
         
         # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+        text = _NON_ALPHA_RE.sub(' ', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         # Remove common stopwords manually
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
         words = text.split()
-        words = [word for word in words if word not in stopwords]
+        words = [word for word in words if word not in _STOPWORDS]
         
         return ' '.join(words)
     else:
         return ""
 
 class JobDescription(BaseModel):
+    id: Optional[str] = None
     title: str
     description: str
     required_skills: List[str]
     preferred_skills: Optional[List[str]] = []
+    # Per-job overrides of SCORING_WEIGHTS, e.g. {"semantic": 0} to skip embeddings
+    scoring_weights: Optional[Dict[str, float]] = None
     
 class Candidate(BaseModel):
     name: str
     resume_text: str
     extracted_skills: List[str]
+    # Only used to filter rankings, never scored
+    experience_years: Optional[float] = None
 
 class MatchedCandidate(BaseModel):
     name: str
@@ -158,6 +176,24 @@ class MatchedCandidate(BaseModel):
 class MatchResponse(BaseModel):
     candidates: List[MatchedCandidate]
 
+class JobMatches(BaseModel):
+    job_id: str
+    title: str
+    candidates: List[MatchedCandidate]
+
+class MatchedJob(BaseModel):
+    job_id: str
+    title: str
+    match: int
+
+class CandidateMatches(BaseModel):
+    name: str
+    jobs: List[MatchedJob]
+
+class MultiMatchResponse(BaseModel):
+    jobs: List[JobMatches]
+    candidates: List[CandidateMatches]
+
 SKILL_GRAPH = {
     "python": {"django", "flask", "pandas", "numpy", "tensorflow", "pytorch", "scikit-learn", "data science", "machine learning"},
     "javascript": {"typescript", "nodejs", "reactjs", "angularjs", "vuejs", "frontend"},
@@ -179,7 +215,11 @@ SKILL_GRAPH = {
     "leadership": {"management", "team lead", "project management", "communication"},
 }
 
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+# Backend (PyTorch, ONNX or int8 ONNX) and thread count come from ENCODER_* settings
+encoder = LazyResource("sentence encoder", load_encoder)
+
+warmup = Warmup([encoder, hiring_models])
+app.include_router(health_router(warmup))
 
 def expand_skills(skills: List[str]) -> Set[str]:
     """
@@ -272,8 +312,8 @@ def get_semantic_similarity(resume_text: str, job_description: str) -> float:
     Calculate semantic similarity using sentence transformers.
     """
     # Encode documents
-    resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-    job_embedding = model.encode(job_description, convert_to_tensor=True)
+    resume_embedding = encoder.get().encode(resume_text, convert_to_tensor=True)
+    job_embedding = encoder.get().encode(job_description, convert_to_tensor=True)
     
     # Calculate cosine similarity
     cos_similarity = cosine_similarity(
@@ -283,116 +323,985 @@ def get_semantic_similarity(resume_text: str, job_description: str) -> float:
     
     return float(cos_similarity[0][0]) * 100  # Convert to percentage
 
-def match_candidates_to_job(job: JobDescription, candidates: List[Candidate]) -> List[MatchedCandidate]:
+# Analyzer matching the TfidfVectorizer used by get_tfidf_similarity
+_tfidf_analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+
+# With a two-document corpus and smooth_idf, a term found in both documents
+# has idf 1 and a term found in only one has idf ln(3/2) + 1
+_PAIR_IDF_UNSHARED = math.log(1.5) + 1.0
+
+COMPILED_JOB_CACHE_SIZE = 128
+
+class CompiledJob:
+    """
+    Job-side scoring values computed once per JobDescription and reused for
+    every candidate ranked against it.
+    """
+    def __init__(self, job: JobDescription):
+        self.job = job
+        self.content_hash = job_content_hash(job)
+        self.required_skills_set = set(skill.lower() for skill in job.required_skills)
+        self.preferred_skills_set = set(skill.lower() for skill in job.preferred_skills or [])
+        self.all_skills = job.required_skills + (job.preferred_skills or [])
+        self.all_skills_set = set(skill.lower() for skill in self.all_skills)
+        self.expanded_skills = expand_skills(self.all_skills)
+
+        # TF-IDF side of the job description: raw term counts under the same
+        # analyzer; IDF depends on the resume so it is applied per candidate
+        self.term_counts = Counter(_tfidf_analyzer(job.description))
+        self._embedding = None
+
+    @property
+    def embedding(self) -> np.ndarray:
+        """Normalized job embedding, encoded on first use so jobs scored without semantic similarity never load it."""
+        if self._embedding is None:
+            embedding = encoder.get().encode(self.job.description, convert_to_tensor=True).cpu().numpy()
+            norm = np.linalg.norm(embedding)
+            self._embedding = embedding / norm if norm else embedding
+        return self._embedding
+
+_compiled_jobs: "OrderedDict[tuple, CompiledJob]" = OrderedDict()
+
+def job_content_hash(job: JobDescription) -> str:
+    """Hash of the job fields that affect scoring."""
+    payload = json.dumps(
+        [job.title, job.description, job.required_skills, job.preferred_skills or []],
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def compile_job(job: JobDescription) -> CompiledJob:
+    """
+    Return the CompiledJob for a job, cached by job id and content hash so an
+    edited job description is recompiled.
+    """
+    key = (job.id, job_content_hash(job))
+    compiled = _compiled_jobs.get(key)
+    metrics.cache("compiled_job", compiled is not None)
+    if compiled is not None:
+        _compiled_jobs.move_to_end(key)
+        return compiled
+
+    with metrics.stage("compile_job"):
+        compiled = CompiledJob(job)
+    _compiled_jobs[key] = compiled
+    if len(_compiled_jobs) > COMPILED_JOB_CACHE_SIZE:
+        _compiled_jobs.popitem(last=False)
+    return compiled
+
+def compiled_skills_match_score(candidate_skills: List[str], compiled: CompiledJob) -> float:
+    """get_skills_match_score against a precompiled job."""
+    candidate_skills_set = set(skill.lower() for skill in candidate_skills)
+    job = compiled.job
+
+    if not job.required_skills:
+        required_score = 1.0
+    else:
+        required_score = len(compiled.required_skills_set & candidate_skills_set) / len(compiled.required_skills_set)
+
+    if not compiled.preferred_skills_set:
+        preferred_score = 1.0
+    else:
+        preferred_score = len(compiled.preferred_skills_set & candidate_skills_set) / len(compiled.preferred_skills_set)
+
+    return ((0.8 * required_score) + (0.2 * preferred_score)) * 100
+
+def compiled_skill_graph_score(candidate_skills: List[str], compiled: CompiledJob) -> float:
+    """get_skill_graph_score against a precompiled job."""
+    if not compiled.all_skills:
+        return 100.0
+
+    expanded_candidate_skills = expand_skills(candidate_skills)
+    direct_matches = len(compiled.all_skills_set & expanded_candidate_skills)
+    expanded_matches = len(compiled.expanded_skills & expanded_candidate_skills)
+
+    total_score = (0.7 * (direct_matches / len(compiled.all_skills_set))) + \
+                  (0.3 * (expanded_matches / len(compiled.expanded_skills)))
+    return total_score * 100
+
+def compiled_tfidf_similarity(resume_text: str, compiled: CompiledJob) -> float:
+    """
+    get_tfidf_similarity against a precompiled job. Reproduces the two-document
+    TF-IDF fit exactly without refitting a vectorizer per candidate.
+    """
+    resume_counts = Counter(_tfidf_analyzer(resume_text))
+    job_counts = compiled.term_counts
+    if not resume_counts or not job_counts:
+        return 0.0
+
+    dot = 0.0
+    resume_norm = 0.0
+    shared_job_norm = 0.0
+    for term, count in resume_counts.items():
+        job_count = job_counts.get(term)
+        if job_count is None:
+            resume_norm += (count * _PAIR_IDF_UNSHARED) ** 2
+        else:
+            dot += count * job_count
+            resume_norm += count ** 2
+            shared_job_norm += job_count ** 2
+
+    job_norm = sum(count ** 2 for count in job_counts.values())
+    job_norm = shared_job_norm + (job_norm - shared_job_norm) * _PAIR_IDF_UNSHARED ** 2
+
+    return float(dot / math.sqrt(resume_norm * job_norm)) * 100
+
+def compiled_semantic_similarity(resume_text: str, compiled: CompiledJob) -> float:
+    """get_semantic_similarity against a precompiled job embedding."""
+    resume_embedding = encoder.get().encode(resume_text, convert_to_tensor=True).cpu().numpy()
+    norm = np.linalg.norm(resume_embedding)
+    if not norm:
+        return 0.0
+    return float(np.dot(resume_embedding / norm, compiled.embedding)) * 100
+
+# Semantic scoring of long resumes: "none" encodes the whole text in one call
+# (the encoder truncates it at its sequence limit); "max" or "mean" split it
+# into windows and pool the chunk similarities to the job
+SEMANTIC_POOLING = os.getenv("SEMANTIC_POOLING", "none")
+# About 1.3 word pieces per word keeps a window within MiniLM's 256 word pieces
+CHUNK_MAX_WORDS = int(os.getenv("CHUNK_MAX_WORDS", "180"))
+CHUNK_CACHE_SIZE = 10_000
+
+_SECTION_SPLIT_RE = re.compile(r'\n\s*\n|\n(?=\s*[A-Z][A-Za-z &/]{2,40}:?\s*\n)')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+def chunk_resume(text: str, max_words: int = CHUNK_MAX_WORDS) -> List[str]:
+    """
+    Split a resume into windows of at most max_words words. Windows are
+    filled with whole sections where they fit, then whole sentences; only a
+    single sentence longer than a window is cut mid-sentence.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_words = 0
+
+    def flush():
+        nonlocal current, current_words
+        if current:
+            chunks.append(' '.join(current))
+        current, current_words = [], 0
+
+    for section in _SECTION_SPLIT_RE.split(text):
+        section_words = section.split()
+        if not section_words:
+            continue
+        if len(section_words) <= max_words:
+            pieces = [section_words]
+        else:
+            pieces = [sentence.split() for sentence in _SENTENCE_SPLIT_RE.split(section) if sentence.strip()]
+        for words in pieces:
+            if current_words + len(words) > max_words:
+                flush()
+            while len(words) > max_words:
+                chunks.append(' '.join(words[:max_words]))
+                words = words[max_words:]
+            current.append(' '.join(words))
+            current_words += len(words)
+        # Start the next section in a fresh window when this one is large
+        if current_words > max_words // 2:
+            flush()
+    flush()
+    return chunks or [text]
+
+_chunk_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+def chunk_embeddings(resume_texts: List[str]) -> List[np.ndarray]:
+    """
+    Normalized chunk embeddings of each resume. Chunks of every resume not
+    yet cached are encoded in one batched call; results are cached per
+    resume text.
+    """
+    keys = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in resume_texts]
+    missing = {}
+    for key, text in zip(keys, resume_texts):
+        if key in _chunk_embedding_cache:
+            _chunk_embedding_cache.move_to_end(key)
+        elif key not in missing:
+            missing[key] = chunk_resume(text)
+
+    metrics.cache("chunk_embeddings", True, len(keys) - len(missing))
+    metrics.cache("chunk_embeddings", False, len(missing))
+    if missing:
+        all_chunks = [chunk for chunks in missing.values() for chunk in chunks]
+        metrics.batch("encoder", len(all_chunks))
+        embeddings = encoder.get().encode(all_chunks)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1.0, norms)
+        start = 0
+        for key, chunks in missing.items():
+            _chunk_embedding_cache[key] = embeddings[start:start + len(chunks)]
+            start += len(chunks)
+        while len(_chunk_embedding_cache) > CHUNK_CACHE_SIZE:
+            _chunk_embedding_cache.popitem(last=False)
+
+    return [_chunk_embedding_cache[key] for key in keys]
+
+def semantic_similarity_batch(resume_texts: List[str], compiled: CompiledJob,
+                              pooling: str = SEMANTIC_POOLING) -> List[float]:
+    """compiled_semantic_similarity for many resumes with one batched encode."""
+    if not resume_texts:
+        return []
+    if pooling in ("max", "mean"):
+        pool = np.max if pooling == "max" else np.mean
+        return [
+            float(pool(embeddings @ compiled.embedding)) * 100
+            for embeddings in chunk_embeddings(resume_texts)
+        ]
+
+    metrics.batch("encoder", len(resume_texts))
+    embeddings = encoder.get().encode(list(resume_texts))
+    norms = np.linalg.norm(embeddings, axis=1)
+    similarities = embeddings @ compiled.embedding / np.where(norms == 0, 1.0, norms)
+    return [float(similarity) * 100 for similarity in similarities]
+
+# Many-to-many scoring: each scorer fills a jobs × candidates matrix from
+# sparse products over a shared vocabulary instead of scoring pair by pair.
+# Every matrix equals the per-job scorer applied to each job in turn.
+
+def _vocabulary(term_sets) -> Dict[str, int]:
+    vocabulary: Dict[str, int] = {}
+    for terms in term_sets:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    return vocabulary
+
+def _term_matrix(rows, vocabulary: Dict[str, int]) -> sparse.csr_matrix:
+    """
+    Rows × vocabulary matrix of term counts (a dict row) or of 0/1 membership,
+    i.e. a bitset per row (any other iterable). Terms outside the vocabulary
+    are dropped.
+    """
+    indptr, indices, data = [0], [], []
+    for row in rows:
+        counts = row if isinstance(row, dict) else dict.fromkeys(row, 1)
+        for term, count in counts.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                indices.append(column)
+                data.append(count)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(len(indptr) - 1, len(vocabulary))
+    )
+
+def _share_matched(job_sets: sparse.csr_matrix, candidate_sets: sparse.csr_matrix) -> np.ndarray:
+    """|job set ∩ candidate set| / |job set| for every pair; 0 for an empty job set."""
+    matched = (job_sets @ candidate_sets.T).toarray()
+    sizes = np.asarray(job_sets.sum(axis=1)).ravel()
+    return matched / np.where(sizes == 0, 1.0, sizes)[:, None]
+
+def skills_match_matrix(candidates: List[Candidate], compiled_jobs: List[CompiledJob]) -> np.ndarray:
+    """compiled_skills_match_score for every job × candidate pair, from skill bitsets."""
+    vocabulary = _vocabulary(compiled.required_skills_set | compiled.preferred_skills_set
+                             for compiled in compiled_jobs)
+    candidate_sets = _term_matrix(
+        [{skill.lower() for skill in candidate.extracted_skills} for candidate in candidates], vocabulary
+    )
+    required = _share_matched(_term_matrix([c.required_skills_set for c in compiled_jobs], vocabulary),
+                              candidate_sets)
+    preferred = _share_matched(_term_matrix([c.preferred_skills_set for c in compiled_jobs], vocabulary),
+                               candidate_sets)
+    required[[not compiled.job.required_skills for compiled in compiled_jobs]] = 1.0
+    preferred[[not compiled.preferred_skills_set for compiled in compiled_jobs]] = 1.0
+    return ((0.8 * required) + (0.2 * preferred)) * 100
+
+def skill_graph_matrix(candidates: List[Candidate], compiled_jobs: List[CompiledJob]) -> np.ndarray:
+    """compiled_skill_graph_score for every job × candidate pair, from expanded skill bitsets."""
+    vocabulary = _vocabulary(compiled.expanded_skills | compiled.all_skills_set for compiled in compiled_jobs)
+    candidate_sets = _term_matrix([expand_skills(candidate.extracted_skills) for candidate in candidates],
+                                  vocabulary)
+    direct = _share_matched(_term_matrix([c.all_skills_set for c in compiled_jobs], vocabulary), candidate_sets)
+    expanded = _share_matched(_term_matrix([c.expanded_skills for c in compiled_jobs], vocabulary), candidate_sets)
+    scores = ((0.7 * direct) + (0.3 * expanded)) * 100
+    scores[[not compiled.all_skills for compiled in compiled_jobs]] = 100.0
+    return scores
+
+def tfidf_similarity_matrix(candidates: List[Candidate], compiled_jobs: List[CompiledJob]) -> np.ndarray:
+    """
+    compiled_tfidf_similarity for every job × candidate pair. Per pair, terms
+    found in only one document carry idf u = _PAIR_IDF_UNSHARED and shared
+    terms idf 1, so with raw counts r (resume) and j (job):
+
+        dot         = sum over shared terms of r * j
+        |resume|^2  = u^2 * sum(r^2) - (u^2 - 1) * sum over shared terms of r^2
+        |job|^2     = u^2 * sum(j^2) - (u^2 - 1) * sum over shared terms of j^2
+
+    and every "sum over shared terms" is a sparse product over the job vocabulary.
+    """
+    vocabulary = _vocabulary(compiled.term_counts for compiled in compiled_jobs)
+    resume_counts = [Counter(_tfidf_analyzer(candidate.resume_text)) for candidate in candidates]
+    resume_totals = np.array([sum(count * count for count in counts.values()) for counts in resume_counts],
+                             dtype=np.float64)
+    resumes = _term_matrix(resume_counts, vocabulary)
+    jobs = _term_matrix([compiled.term_counts for compiled in compiled_jobs], vocabulary)
+    job_totals = np.asarray(jobs.power(2).sum(axis=1)).ravel()
+
+    unshared = _PAIR_IDF_UNSHARED ** 2
+    dot = (jobs @ resumes.T).toarray()
+    shared_resume = (jobs.sign() @ resumes.power(2).T).toarray()
+    shared_job = (jobs.power(2) @ resumes.sign().T).toarray()
+    resume_norm = unshared * resume_totals[None, :] - (unshared - 1) * shared_resume
+    job_norm = unshared * job_totals[:, None] - (unshared - 1) * shared_job
+
+    # Either document without terms scores 0, as in the per-pair version
+    denominator = np.sqrt(resume_norm * job_norm)
+    return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0) * 100
+
+def job_embeddings(compiled_jobs: List[CompiledJob]) -> np.ndarray:
+    """Normalized embeddings of the jobs, encoding the ones not yet embedded in one call."""
+    missing = [compiled for compiled in compiled_jobs if compiled._embedding is None]
+    if missing:
+        metrics.batch("encoder", len(missing))
+        embeddings = encoder.get().encode([compiled.job.description for compiled in missing])
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        for compiled, embedding in zip(missing, embeddings / np.where(norms == 0, 1.0, norms)):
+            compiled._embedding = embedding
+    return np.stack([compiled.embedding for compiled in compiled_jobs])
+
+def semantic_similarity_matrix(candidates: List[Candidate], compiled_jobs: List[CompiledJob],
+                               pooling: str = SEMANTIC_POOLING) -> np.ndarray:
+    """semantic_similarity_batch for every job: one encode of the pool, one matmul against the jobs."""
+    if not candidates:
+        return np.zeros((len(compiled_jobs), 0))
+    jobs = job_embeddings(compiled_jobs)
+    resume_texts = [candidate.resume_text for candidate in candidates]
+    if pooling in ("max", "mean"):
+        per_resume = chunk_embeddings(resume_texts)
+        sizes = np.array([len(embeddings) for embeddings in per_resume])
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        similarities = jobs @ np.concatenate(per_resume).T
+        if pooling == "max":
+            return np.maximum.reduceat(similarities, starts, axis=1) * 100
+        return np.add.reduceat(similarities, starts, axis=1) / sizes * 100
+
+    metrics.batch("encoder", len(resume_texts))
+    embeddings = encoder.get().encode(resume_texts)
+    norms = np.linalg.norm(embeddings, axis=1)
+    return (jobs @ embeddings.T) / np.where(norms == 0, 1.0, norms)[None, :] * 100
+
+class Scorer:
+    """
+    One component of the match score. `score_batch` scores a list of
+    candidates against a compiled job; `cost` is the relative per-candidate
+    cost, used to run cheap scorers first and to decide what the cascade
+    defers; `max_score` bounds every score it returns. `score_matrix`, if
+    given, scores candidates against several compiled jobs at once as a
+    jobs × candidates array.
+    """
+    def __init__(self, name: str, cost: float, score_batch, max_score: float = 100.0, score_matrix=None):
+        self.name = name
+        self.cost = cost
+        self.score_batch = score_batch
+        self.max_score = max_score
+        self.score_matrix = score_matrix
+
+    def matrix(self, candidates: List[Candidate], compiled_jobs: List[CompiledJob]) -> np.ndarray:
+        """Jobs × candidates scores; one score_batch call per job if there is no score_matrix."""
+        if self.score_matrix is not None:
+            return self.score_matrix(candidates, compiled_jobs)
+        return np.array(
+            [self.score_batch(candidates, compiled) for compiled in compiled_jobs], dtype=np.float64
+        ).reshape(len(compiled_jobs), len(candidates))
+
+SCORERS: Dict[str, Scorer] = {}
+
+def register_scorer(name: str, cost: float, score_batch, max_score: float = 100.0, score_matrix=None):
+    SCORERS[name] = Scorer(name, cost, score_batch, max_score, score_matrix)
+
+register_scorer("skills", 1, lambda candidates, compiled: [
+    compiled_skills_match_score(candidate.extracted_skills, compiled) for candidate in candidates
+], score_matrix=skills_match_matrix)
+register_scorer("skill_graph", 2, lambda candidates, compiled: [
+    compiled_skill_graph_score(candidate.extracted_skills, compiled) for candidate in candidates
+], score_matrix=skill_graph_matrix)
+register_scorer("tfidf", 5, lambda candidates, compiled: [
+    compiled_tfidf_similarity(candidate.resume_text, compiled) for candidate in candidates
+], score_matrix=tfidf_similarity_matrix)
+# Cosine similarity is at most 1, so the semantic score never exceeds 100
+register_scorer("semantic", 1000, lambda candidates, compiled: semantic_similarity_batch(
+    [candidate.resume_text for candidate in candidates], compiled
+), score_matrix=semantic_similarity_matrix)
+
+# Default weight of each scorer in the final match score
+SCORING_WEIGHTS = {"semantic": 0.6, "tfidf": 0.2, "skills": 0.1, "skill_graph": 0.1}
+
+def resolve_weights(job: JobDescription, overrides: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Effective scorer weights: SCORING_WEIGHTS, updated by the job's
+    scoring_weights and then by per-request overrides, normalized to sum to 1.
+    Scorers with weight 0 are left out and never computed.
+    """
+    weights = dict(SCORING_WEIGHTS)
+    weights.update(job.scoring_weights or {})
+    weights.update(overrides or {})
+
+    unknown = [name for name in weights if name not in SCORERS]
+    if unknown:
+        raise ValueError(f"Unknown scorers: {unknown}")
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Scoring weights must not be negative")
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("At least one scorer needs a positive weight")
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+def score_candidates(candidates: List[Candidate], compiled: CompiledJob,
+                     weights: Optional[Dict[str, float]] = None) -> List[float]:
+    """
+    Weighted match scores of candidates against a precompiled job, before
+    rounding and capping. Each enabled scorer runs once over the whole batch,
+    cheapest first.
+    """
+    weights = weights or resolve_weights(compiled.job)
+    totals = [0.0] * len(candidates)
+    for name in sorted(weights, key=lambda name: SCORERS[name].cost):
+        weight = weights[name]
+        with metrics.stage(f"score_{name}"):
+            scores = SCORERS[name].score_batch(candidates, compiled)
+        for i, score in enumerate(scores):
+            totals[i] += weight * score
+    return totals
+
+def score_candidate(candidate: Candidate, compiled: CompiledJob,
+                    weights: Optional[Dict[str, float]] = None) -> float:
+    """Weighted match score of one candidate against a precompiled job."""
+    return score_candidates([candidate], compiled, weights)[0]
+
+def to_match_percentage(score: float) -> int:
+    """Round a weighted score to the nearest integer, capped at 100."""
+    return min(round(score), 100)
+
+def match_candidates_to_job(job: JobDescription, candidates: List[Candidate],
+                            weights: Optional[Dict[str, float]] = None) -> List[MatchedCandidate]:
     """
     Match candidates to a job and return a ranked list.
     """
-    results = []
-    
-    for candidate in candidates:
-        # Step 2: Skills match score
-        skills_score = get_skills_match_score(
-            candidate.extracted_skills, 
-            job.required_skills, 
-            job.preferred_skills
-        )
-        
-        # Step 3: Semantic similarity score
-        semantic_score = get_semantic_similarity(candidate.resume_text, job.description)
-        
-        # Step 4: TF-IDF similarity score
-        tfidf_score = get_tfidf_similarity(candidate.resume_text, job.description)
-        
-        # Step 5: Skill Graph score
-        skill_graph_score = get_skill_graph_score(candidate.extracted_skills, job.required_skills + job.preferred_skills)
-        
-        # Step 6: Calculate final weighted score
-        # 60% semantic, 20% TF-IDF, 10% direct skill match, 10% skill graph
-        final_score = (0.6 * semantic_score) + (0.2 * tfidf_score) + \
-                       (0.1 * skills_score) + (0.1 * skill_graph_score)
-        
-        # Round the score to nearest integer
-        match_percentage = round(final_score)
-        
-        # Cap at 100
-        match_percentage = min(match_percentage, 100)
-        
-        results.append(MatchedCandidate(name=candidate.name, match=match_percentage))
+    compiled = compile_job(job)
+    scores = score_candidates(candidates, compiled, resolve_weights(job, weights))
+    results = [
+        MatchedCandidate(name=candidate.name, match=to_match_percentage(score))
+        for candidate, score in zip(candidates, scores)
+    ]
     
     # Sort results by match score (descending)
     results.sort(key=lambda x: x.match, reverse=True)
     
     return results
 
+def score_matrix(candidates: List[Candidate], compiled_jobs: List[CompiledJob],
+                 job_weights: List[Dict[str, float]]) -> np.ndarray:
+    """
+    Weighted match scores of every candidate against every job, as a jobs ×
+    candidates array, before rounding and capping. Each scorer runs once,
+    cheapest first, over the jobs that give it a weight.
+    """
+    totals = np.zeros((len(compiled_jobs), len(candidates)))
+    names = {name for weights in job_weights for name in weights}
+    for name in sorted(names, key=lambda name: SCORERS[name].cost):
+        weights = np.array([weights.get(name, 0.0) for weights in job_weights])
+        rows = np.flatnonzero(weights)
+        with metrics.stage(f"score_matrix_{name}"):
+            scores = SCORERS[name].matrix(candidates, [compiled_jobs[row] for row in rows])
+        totals[rows] += weights[rows, None] * scores
+    return totals
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k highest scores of each row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(best, order, axis=1)
+
+def match_candidates_to_jobs(jobs: List[JobDescription], candidates: List[Candidate], top_k: int = 10,
+                             weights: Optional[Dict[str, float]] = None) -> MultiMatchResponse:
+    """
+    Match a candidate pool against many jobs in one pass: the top_k
+    candidates of each job and the top_k jobs of each candidate. Every job
+    keeps its own scoring weights, updated by `weights`.
+    """
+    compiled_jobs = [compile_job(job) for job in jobs]
+    scores = score_matrix(candidates, compiled_jobs, [resolve_weights(job, weights) for job in jobs])
+    matches = np.minimum(np.rint(scores), 100).astype(int)
+    job_ids = [job_id_of(job) for job in jobs]
+
+    best_candidates = top_k_indices(scores, top_k)
+    best_jobs = top_k_indices(scores.T, top_k)
+    return MultiMatchResponse(
+        jobs=[
+            JobMatches(job_id=job_ids[row], title=jobs[row].title, candidates=[
+                MatchedCandidate(name=candidates[column].name, match=matches[row, column])
+                for column in best_candidates[row]
+            ])
+            for row in range(len(jobs))
+        ],
+        candidates=[
+            CandidateMatches(name=candidates[column].name, jobs=[
+                MatchedJob(job_id=job_ids[row], title=jobs[row].title, match=matches[row, column])
+                for row in best_jobs[column]
+            ])
+            for column in range(len(candidates))
+        ]
+    )
+
+# Scorers at least this costly are deferred by the cascade until a candidate survives pruning
+CASCADE_DEFERRED_COST = 100
+CASCADE_BATCH_SIZE = 32
+
+def match_candidates_cascade(job: JobDescription, candidates: List[Candidate], top_k: int,
+                             weights: Optional[Dict[str, float]] = None,
+                             batch_size: int = CASCADE_BATCH_SIZE):
+    """
+    Return the top_k matches and the number of candidates pruned without
+    running the expensive scorers on them.
+
+    The cheap scorers run for every candidate, which bounds each final score
+    from above by assuming the expensive scorers return their maximum.
+    Candidates are then fully scored in batches in order of that bound, and
+    the scan stops once no remaining bound can reach the current k-th best
+    score.
+    """
+    compiled = compile_job(job)
+    weights = resolve_weights(job, weights)
+    cheap = {name: weight for name, weight in weights.items() if SCORERS[name].cost < CASCADE_DEFERRED_COST}
+    deferred = {name: weight for name, weight in weights.items() if name not in cheap}
+    headroom = sum(weight * SCORERS[name].max_score for name, weight in deferred.items())
+
+    partials = score_candidates(candidates, compiled, cheap) if cheap else [0.0] * len(candidates)
+    bounded = sorted(zip(partials, candidates), key=lambda entry: entry[0], reverse=True)
+
+    scored = []
+    threshold = -math.inf
+    position = 0
+    while position < len(bounded):
+        if len(scored) >= top_k and bounded[position][0] + headroom < threshold:
+            break
+        batch = bounded[position:position + batch_size]
+        position += len(batch)
+
+        batch_candidates = [candidate for _, candidate in batch]
+        expensive = score_candidates(batch_candidates, compiled, deferred) if deferred else [0.0] * len(batch)
+        scored.extend(
+            (partial + score, candidate) for (partial, candidate), score in zip(batch, expensive)
+        )
+
+        scored.sort(key=lambda entry: entry[0], reverse=True)
+        del scored[top_k:]
+        if len(scored) >= top_k:
+            threshold = scored[-1][0]
+
+    results = [
+        MatchedCandidate(name=candidate.name, match=to_match_percentage(score))
+        for score, candidate in scored
+    ]
+    return results, len(bounded) - position
+
+candidate_log = CandidateLog()
+ranking_store = RankingStore()
+
+def candidate_key(candidate: Candidate) -> str:
+    """Stable identity of a candidate within a job ranking."""
+    return hashlib.sha1(f"{candidate.name}\n{candidate.resume_text}".encode("utf-8")).hexdigest()
+
+def candidate_pool(candidates: List[Candidate], up_to_seq: Optional[int] = None) -> List[Candidate]:
+    """
+    The file's candidates plus those in the candidate log (up to `up_to_seq`),
+    each once: resumes submitted through /send-data are in both.
+    """
+    logged = [candidate_from_record(record) for _, record in candidate_log.read_range(0, up_to_seq)]
+    pool = {}
+    for candidate in candidates + logged:
+        pool.setdefault(candidate_key(candidate), candidate)
+    return list(pool.values())
+
+# Bumped when stored rankings lack something newer code needs (2: candidate profiles)
+RANKING_FORMAT = 2
+
+def ranking_fingerprint(compiled: CompiledJob, weights: Dict[str, float]) -> str:
+    """Stored scores are only valid for the same job content, weights and semantic pooling."""
+    return hashlib.sha256(
+        json.dumps([compiled.content_hash, weights, SEMANTIC_POOLING, RANKING_FORMAT], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+def _score_entries(candidates: List[Candidate], compiled: CompiledJob, weights: Dict[str, float]):
+    scores = score_candidates(candidates, compiled, weights)
+    keys = [candidate_key(candidate) for candidate in candidates]
+    ranking_store.save_profiles(
+        (key, candidate.extracted_skills, candidate.experience_years) for key, candidate in zip(keys, candidates)
+    )
+    return [
+        (key, candidate.name, score)
+        for key, candidate, score in zip(keys, candidates, scores)
+    ]
+
+def rank_job_incrementally(job: JobDescription, load_candidates,
+                           weights: Optional[Dict[str, float]] = None) -> JobRanking:
+    """
+    Return the stored ranking for a job, scoring only candidates added to the
+    candidate log since it was last updated. `load_candidates` supplies the
+    full pool and is only called when the ranking has to be rebuilt.
+    Rankings under per-request weights are stored separately from the job's own.
+    """
+    compiled = compile_job(job)
+    weights = resolve_weights(job, weights)
+    job_key = job.id or compiled.content_hash
+    if weights != resolve_weights(job):
+        job_key += VARIANT_SEPARATOR + hashlib.sha1(json.dumps(weights, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    fingerprint = ranking_fingerprint(compiled, weights)
+
+    ranking = ranking_store.load(job_key, fingerprint)
+    metrics.cache("job_ranking", ranking is not None)
+    if ranking is None:
+        last_seq = candidate_log.last_seq()
+        candidates = candidate_pool(list(load_candidates()), last_seq)
+        return ranking_store.reset(job_key, fingerprint, last_seq, _score_entries(candidates, compiled, weights))
+
+    new_entries = candidate_log.read_range(ranking.last_seq)
+    if new_entries:
+        new_candidates = [candidate_from_record(record) for _, record in new_entries]
+        ranking_store.add(ranking, new_entries[-1][0], _score_entries(new_candidates, compiled, weights))
+    return ranking
+
+_MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_DATE_RE = re.compile(r'(?:([a-z]+)\.?\s+)?(\d{4})')
+_ONGOING = frozenset({"present", "current", "now", "ongoing"})
+
+def _month_index(value, today: date) -> Optional[int]:
+    """Months since year 0 of a date like "March 2020", "2019" or "Present"."""
+    text = str(value or "").strip().lower()
+    if text in _ONGOING:
+        return today.year * 12 + today.month - 1
+    match = _DATE_RE.search(text)
+    if not match:
+        return None
+    month = _MONTHS.get((match.group(1) or "")[:3], 1)
+    return int(match.group(2)) * 12 + month - 1
+
+def experience_years(work_experience) -> Optional[float]:
+    """Years covered by a work history, overlapping jobs counted once; None without usable dates."""
+    today = date.today()
+    spans = []
+    for job in work_experience or []:
+        if not isinstance(job, dict):
+            continue
+        start = _month_index(job.get('start_date'), today)
+        end = _month_index(job.get('end_date') or "present", today)
+        if start is not None and end is not None and end >= start:
+            spans.append((start, end + 1))
+    if not spans:
+        return None
+
+    months = 0
+    covered_until = 0
+    for start, end in sorted(spans):
+        start = max(start, covered_until)
+        if end > start:
+            months += end - start
+            covered_until = end
+    return round(months / 12, 1)
+
+def candidate_from_resume_item(item: Dict) -> Candidate:
+    """Build a Candidate from a resumes_data.json entry."""
+    # Combine skills from different categories
+    all_skills = (
+        item.get('skills', {}).get('mobile_development', []) +
+        item.get('skills', {}).get('backend', []) +
+        item.get('skills', {}).get('tools', [])
+    )
+    
+    return Candidate(
+        name=item['personal_information'].get('name', 'Unknown'),
+        resume_text=f"Mobile Application Developer with experience in {', '.join(all_skills)}. " + 
+                    f"Worked at {', '.join([exp['company'] for exp in item.get('work_experience', [])])}. " +
+                    f"Education: {item['education'][0]['degree'] if item.get('education') else 'Not Specified'}",
+        extracted_skills=all_skills,
+        experience_years=experience_years(item.get('work_experience'))
+    )
+
+def candidate_from_record(record: Dict) -> Candidate:
+    """Build a Candidate from a candidate log entry."""
+    if 'personal_information' in record:
+        return candidate_from_resume_item(record)
+    return Candidate(
+        name=record.get('name') or 'Unknown',
+        resume_text=record.get('resume_text', ''),
+        extracted_skills=record.get('extracted_skills', []),
+        experience_years=(record['experience_years'] if record.get('experience_years') is not None
+                          else experience_years(record.get('work_experience')))
+    )
+
+def job_from_posting(item: Dict) -> JobDescription:
+    """Build a JobDescription from a resumes_data.json job posting."""
+    return JobDescription(
+        id=(item.get('metadata') or {}).get('job_id'),
+        title=item['job_description'].get('applied_job_title', 'Not Specified'),
+        description=" ".join(item['job_description'].get('job_responsibilities', [])),
+        required_skills=(
+            item['job_description']['required_skills'].get('core_technologies', []) + 
+            item['job_description']['required_skills'].get('state_management', []) + 
+            item['job_description']['required_skills'].get('styling', [])
+        ),
+        preferred_skills=(
+            item['job_description']['required_skills'].get('soft_skills', [])
+        ),
+        scoring_weights=item['job_description'].get('scoring_weights')
+    )
+
 def prepare_candidate_data(json_file_path):
     """
-    Prepare candidate data from the JSON file for resume matching
+    Prepare the job postings and candidates of the JSON file for resume matching
     """
     with open(json_file_path, 'r') as file:
         data = json.load(file)
     
     candidates = []
-    job_description = None
+    jobs = []
 
     for item in data:
-        # Extract job description from the first job posting
-        if not job_description and 'job_description' in item:
-            job_description = JobDescription(
-                title=item['job_description'].get('applied_job_title', 'Not Specified'),
-                description=" ".join(item['job_description'].get('job_responsibilities', [])),
-                required_skills=(
-                    item['job_description']['required_skills'].get('core_technologies', []) + 
-                    item['job_description']['required_skills'].get('state_management', []) + 
-                    item['job_description']['required_skills'].get('styling', [])
-                ),
-                preferred_skills=(
-                    item['job_description']['required_skills'].get('soft_skills', [])
-                )
-            )
+        if 'job_description' in item:
+            jobs.append(job_from_posting(item))
         
         # Extract candidate information
         if 'personal_information' in item:
-            # Combine skills from different categories
-            all_skills = (
-                item.get('skills', {}).get('mobile_development', []) +
-                item.get('skills', {}).get('backend', []) +
-                item.get('skills', {}).get('tools', [])
-            )
-            
-            candidate = Candidate(
-                name=item['personal_information'].get('name', 'Unknown'),
-                resume_text=f"Mobile Application Developer with experience in {', '.join(all_skills)}. " + 
-                            f"Worked at {', '.join([exp['company'] for exp in item.get('work_experience', [])])}. " +
-                            f"Education: {item['education'][0]['degree'] if item.get('education') else 'Not Specified'}",
-                extracted_skills=all_skills
-            )
-            candidates.append(candidate)
+            candidates.append(candidate_from_resume_item(item))
 
-    return job_description, candidates
+    return jobs, candidates
+
+RESUMES_JSON_PATH = os.path.join(os.path.dirname(__file__), "resumes_data.json")
+
+_candidate_data_cache: Dict[str, tuple] = {}
+
+def load_candidate_data(json_file_path):
+    """
+    prepare_candidate_data, re-reading the file only when it has changed.
+    """
+    stat = os.stat(json_file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _candidate_data_cache.get(json_file_path)
+    metrics.cache("candidate_data", cached is not None and cached[0] == signature)
+    if cached is None or cached[0] != signature:
+        with metrics.stage("load_candidate_data"):
+            cached = (signature, prepare_candidate_data(json_file_path))
+        _candidate_data_cache[json_file_path] = cached
+    return cached[1]
 
 @app.get("/process-and-match-resumes")
-async def process_and_match_resumes():
+async def process_and_match_resumes(limit: Optional[int] = None, mode: str = "incremental",
+                                    weights: Optional[str] = None):
     """
-    Process resumes from the resumes_data.json file and match them to a job description
+    Process resumes from the resumes_data.json file and match them to its first job description.
+    Scores are kept per job; only candidates added since the last request are scored.
+    With mode=cascade the top `limit` candidates are found from scratch, pruning
+    candidates that cannot reach them before any embedding is computed.
+    `weights` is a JSON object of scorer weights overriding the job's, e.g.
+    {"semantic": 0} to rank without embeddings.
     """
     try:
-        # Use fixed path to your JSON file
-        json_file_path = os.path.join(os.path.dirname(__file__), "resumes_data.json")
-        
         # Prepare job description and candidates
-        job_description, candidates = prepare_candidate_data(json_file_path)
+        jobs, candidates = load_candidate_data(RESUMES_JSON_PATH)
+        job_description = jobs[0] if jobs else None
         
         if not job_description or not candidates:
             raise HTTPException(status_code=400, detail="Could not extract job description or candidates")
+
+        weight_overrides = parse_weight_overrides([job_description], weights)
+
+        if mode == "cascade":
+            if not limit:
+                raise HTTPException(status_code=400, detail="Cascade ranking needs a positive limit")
+            pool = candidate_pool(candidates)
+            with metrics.stage("rank_cascade"):
+                ranked_candidates, pruned = match_candidates_cascade(job_description, pool, limit, weight_overrides)
+            print(f"Ranked candidates: {ranked_candidates} ({pruned} of {len(pool)} pruned)")
+            return {"candidates": ranked_candidates, "pruned": pruned}
+        if mode != "incremental":
+            raise HTTPException(status_code=400, detail=f"Unknown ranking mode {mode}")
  
-        ranked_candidates = match_candidates_to_job(job_description, candidates)
+        with metrics.stage("rank_incremental"):
+            ranking = rank_job_incrementally(job_description, lambda: candidates, weight_overrides)
+        ranked_candidates = [
+            MatchedCandidate(name=entry["name"], match=to_match_percentage(entry["score"]))
+            for entry in ranking.top(limit)
+        ]
         
-        print(f"Ranked candidates: {ranked_candidates}")
-        return {"candidates": ranked_candidates}
+        print(f"Ranked {len(ranking)} candidates for job {job_id_of(job_description)}")
+        return {"job_id": job_id_of(job_description), "candidates": ranked_candidates}
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resumes: {str(e)}")
 
+RANKING_FIELDS = ("key", "name", "match", "score", "skills", "experience_years")
+DEFAULT_RANKING_FIELDS = ("name", "match")
+RANKING_PAGE_SIZE = 50
+MAX_RANKING_PAGE_SIZE = 500
+# Ranked candidates whose profiles are fetched together while a filtered page is scanned
+PROFILE_LOAD_BATCH = 500
+
+def encode_cursor(entry: Dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps([entry["score"], entry["key"]]).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str):
+    try:
+        score, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(score), str(key)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def page_ranking(ranking: JobRanking, limit: int, after=None, min_match: Optional[int] = None,
+                 skills: Optional[List[str]] = None, min_experience: Optional[float] = None,
+                 max_experience: Optional[float] = None):
+    """
+    Return up to `limit` ranked candidates passing the filters, best first,
+    starting after the (score, key) position `after`, plus the last returned
+    entry if more candidates pass the filters (else None). The scan stops at
+    the first candidate below `min_match`, since every later one scores lower.
+    """
+    required = {skill.strip().lower() for skill in skills or [] if skill.strip()}
+    filter_profiles = bool(required) or min_experience is not None or max_experience is not None
+
+    page = []
+    entries = ranking.iter_after(after)
+    # Profiles are loaded a batch at a time, only for the entries the scan reaches
+    batch_size = PROFILE_LOAD_BATCH if filter_profiles else limit + 1
+    while True:
+        batch = list(itertools.islice(entries, batch_size))
+        if not batch:
+            return page, None
+        if filter_profiles:
+            ranking_store.load_profiles([entry["key"] for entry in batch])
+        for entry in batch:
+            entry["match"] = to_match_percentage(entry["score"])
+            if min_match is not None and entry["match"] < min_match:
+                return page, None
+            if filter_profiles:
+                profile = ranking_store.profile(entry["key"])
+                if profile is None or not required <= profile.skill_set:
+                    continue
+                years = profile.experience_years
+                if (min_experience is not None or max_experience is not None) and years is None:
+                    continue
+                if (min_experience is not None and years < min_experience) or \
+                        (max_experience is not None and years > max_experience):
+                    continue
+            if len(page) == limit:
+                return page, page[-1]
+            page.append(entry)
+
+def parse_weight_overrides(jobs: List[JobDescription], weights: Optional[str]) -> Optional[Dict[str, float]]:
+    """Parse `weights` and check they resolve against the own weights of every job."""
+    try:
+        weight_overrides = json.loads(weights) if weights else None
+        for job in jobs:
+            resolve_weights(job, weight_overrides)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid scoring weights: {str(e)}")
+    return weight_overrides
+
+def job_id_of(job: JobDescription) -> str:
+    """The id a job's ranking is requested by: its own id, else a hash of its content."""
+    return job.id or compile_job(job).content_hash
+
+@app.get("/rankings")
+async def list_rankings():
+    """Jobs whose candidate ranking can be requested from /rankings/{job_id}."""
+    jobs, _ = load_candidate_data(RESUMES_JSON_PATH)
+    return {"jobs": [{"job_id": job_id_of(job), "title": job.title} for job in jobs]}
+
+@app.get("/rankings/{job_id}")
+async def get_ranking_page(job_id: str, limit: int = RANKING_PAGE_SIZE, cursor: Optional[str] = None,
+                           min_match: Optional[int] = None, skills: Optional[str] = None,
+                           min_experience: Optional[float] = None, max_experience: Optional[float] = None,
+                           fields: Optional[str] = None, weights: Optional[str] = None):
+    """
+    One page of a job's candidate ranking, best first, served from the stored
+    incremental ranking. Filters: `min_match` (percent), `skills` (comma
+    separated, all required) and an experience range in years. `fields`
+    (comma separated, from RANKING_FIELDS) projects each candidate; name and
+    match by default. Pass a response's `next_cursor` as `cursor` to get the
+    following page; it stays valid while new candidates arrive.
+    """
+    if not 1 <= limit <= MAX_RANKING_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_RANKING_PAGE_SIZE}")
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else DEFAULT_RANKING_FIELDS
+    unknown = [field for field in selected if field not in RANKING_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}; choose from {list(RANKING_FIELDS)}")
+    after = decode_cursor(cursor) if cursor else None
+
+    try:
+        jobs, candidates = load_candidate_data(RESUMES_JSON_PATH)
+        job_description = next((job for job in jobs if job_id_of(job) == job_id), None)
+        if job_description is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        weight_overrides = parse_weight_overrides([job_description], weights)
+
+        with metrics.stage("rank_incremental"):
+            ranking = rank_job_incrementally(job_description, lambda: candidates, weight_overrides)
+        with metrics.stage("ranking_page"):
+            entries, last = page_ranking(
+                ranking, limit, after, min_match,
+                skills.split(",") if skills else None, min_experience, max_experience
+            )
+
+        if "skills" in selected or "experience_years" in selected:
+            ranking_store.load_profiles([entry["key"] for entry in entries])
+            for entry in entries:
+                profile = ranking_store.profile(entry["key"])
+                entry["skills"] = profile.skills if profile else None
+                entry["experience_years"] = profile.experience_years if profile else None
+
+        return {
+            "job_id": job_id,
+            "title": job_description.title,
+            "total": len(ranking),
+            "candidates": [{field: entry[field] for field in selected} for entry in entries],
+            "next_cursor": encode_cursor(last) if last else None
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ranking candidates: {str(e)}")
+
+MAX_MULTI_MATCH_TOP_K = 100
+
+@app.get("/match-jobs", response_model=MultiMatchResponse)
+async def match_jobs(top_k: int = 10, weights: Optional[str] = None):
+    """
+    Score every candidate against every job posting in resumes_data.json in
+    one pass and return the top_k candidates per job and the top_k jobs per
+    candidate. `weights` overrides the scorer weights of every job.
+    """
+    if not 1 <= top_k <= MAX_MULTI_MATCH_TOP_K:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 1 and {MAX_MULTI_MATCH_TOP_K}")
+    try:
+        jobs, candidates = load_candidate_data(RESUMES_JSON_PATH)
+        if not jobs or not candidates:
+            raise HTTPException(status_code=400, detail="Could not extract job descriptions or candidates")
+        weight_overrides = parse_weight_overrides(jobs, weights)
+
+        pool = candidate_pool(candidates)
+        with metrics.stage("match_jobs"):
+            result = match_candidates_to_jobs(jobs, pool, top_k, weight_overrides)
+        print(f"Matched {len(pool)} candidates against {len(jobs)} jobs")
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error matching jobs: {str(e)}")
+
+@app.get("/models")
+async def get_models():
+    """Report the active and shadow hiring model versions and when they were loaded."""
+    return model_registry.describe()
+
 @app.get("/")
 async def root():
     return {"message": "Resume Matching API is running"}
@@ -0,0 +1,102 @@
+"""
+Production launcher running a service under several gunicorn workers that
+share one copy of its models.
+
+    python serve.py resume_matcher --workers 4 --port 8080
+    python serve.py app --workers 4 --port 8000
+
+By default the master process imports the service and loads every resource
+its warmup would load (spaCy en_core_web_lg, the MiniLM encoder, the hiring
+model) before forking. The workers then share those pages copy-on-write
+instead of each loading its own copy. gc.freeze() moves everything loaded so
+far out of the garbage collector's reach, so collections in the workers do
+not write to, and thereby copy, the shared pages. The compact hiring-model
+arrays are memory-mapped and shared through the page cache either way.
+
+--no-preload starts every worker from scratch (one model copy per worker),
+for comparison. Measure both with:
+
+    python benchmarks/measure_worker_rss.py resume_matcher app --workers 1 4 --output benchmarks/worker_rss.txt
+
+Compare PSS (proportional set size) rather than RSS. RSS counts shared
+pages in full in every worker, so it barely moves with preloading, while
+PSS splits them between the processes that share them.
+
+benchmarks/worker_rss.txt holds one run. With 4 workers, preloading took
+the total PSS from 2391 MB to 971 MB for resume_matcher and from 3963 MB to
+1243 MB for app, and each worker's private memory from about 500 MB and
+920 MB to about 20 MB. With 1 worker it changes nothing. That run used
+stand-ins of the same size for the models it could not download: a
+randomly initialized all-MiniLM-L6-v2 (ENCODER_MODEL) and an
+en_core_web_lg package with untrained components and a random vector
+table. Gemini and Supabase were benchmarks/fake_services.py.
+
+A hiring model hot-swapped by the registry after startup is loaded by each
+worker separately and is not shared. Restart the launcher to share it again.
+"""
+import argparse
+import gc
+import importlib
+import os
+
+from gunicorn.app.base import BaseApplication
+
+
+def preload(module_name: str):
+    """Import a service and load its resources synchronously; return its app."""
+    service = importlib.import_module(module_name)
+    for resource in service.warmup.resources:
+        try:
+            resource.get()
+        except Exception:
+            # Reported by the resource; workers retry on first use
+            pass
+    gc.freeze()
+    return service.app
+
+
+class ServiceApplication(BaseApplication):
+    def __init__(self, module_name: str, options: dict):
+        self.module_name = module_name
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Runs in the master when preload_app is set, otherwise in each worker
+        if self.options["preload_app"]:
+            return preload(self.module_name)
+        return importlib.import_module(self.module_name).app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", choices=["app", "resume_matcher"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--no-preload", action="store_true")
+    parser.add_argument("--timeout", type=int, default=120)
+    args = parser.parse_args()
+
+    port = args.port or (8000 if args.module == "app" else 8080)
+    # One intra-op thread pool per worker would otherwise oversubscribe the CPUs
+    os.environ.setdefault("ENCODER_THREADS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+    if not args.no_preload:
+        # Resources are already loaded in the master; the workers have nothing to warm
+        os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+
+    ServiceApplication(args.module, {
+        "bind": f"{args.host}:{port}",
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": not args.no_preload,
+        "timeout": args.timeout,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Lazy loading of heavy service resources (NLP models, encoders, API clients)
+and the warmup that preloads them.
+
+Importing a service only declares its resources; each one is built on first
+use, or ahead of time by a background warmup thread started from the app's
+lifespan, so the server starts accepting connections immediately. /healthz
+answers as soon as the process is up; /readyz only once every resource has
+loaded.
+
+Resources that fail to load are retried by the warmup every
+WARMUP_RETRY_SECONDS, so /readyz turns ready once e.g. a missing model appears.
+Set WARMUP_ON_STARTUP=false (e.g. with uvicorn --reload) to skip the warmup
+and load each resource only when a request needs it.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() != "false"
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "30"))
+
+
+class LazyResource:
+    """A resource built by `loader` the first time it is needed, exactly once."""
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                except Exception as e:
+                    self.error = str(e)
+                    print(f"❌ Loading {self.name} failed: {e}")
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self.error = None
+                self._loaded = True
+                print(f"✅ {self.name} loaded in {self.load_seconds:.2f}s")
+        return self._value
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._loaded,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class Warmup:
+    """Loads a service's resources in a background thread, in order."""
+
+    def __init__(self, resources: List[LazyResource]):
+        self.resources = resources
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        pending = self.resources
+        while True:
+            for resource in pending:
+                try:
+                    resource.get()
+                except Exception:
+                    # Already reported; retried below and on the resource's next use
+                    pass
+            pending = [resource for resource in pending if not resource.loaded]
+            if not pending:
+                return
+            time.sleep(WARMUP_RETRY_SECONDS)
+
+    def ready(self) -> bool:
+        return all(resource.loaded for resource in self.resources)
+
+    def describe(self) -> Dict[str, Any]:
+        return {resource.name: resource.describe() for resource in self.resources}
+
+
+def health_router(warmup: Warmup) -> APIRouter:
+    """/healthz (process is alive) and /readyz (every resource is loaded)."""
+    router = APIRouter()
+
+    @router.get("/healthz")
+    async def healthz():
+        return {"status": "ok"}
+
+    @router.get("/readyz")
+    async def readyz():
+        ready = warmup.ready()
+        return JSONResponse(
+            status_code=200 if ready else 503,
+            content={"ready": ready, "resources": warmup.describe()}
+        )
+
+    return router
@@ -0,0 +1,58 @@
+"""
+SQLite connections for the services' durable stores (email queue, ranking
+state).
+
+A SQLite connection must not be used on both sides of a fork, and the
+multi-worker launcher (serve.py) imports the services in the master process
+before forking its workers. ProcessLocalConnection therefore opens its
+connection lazily in each process that uses it. Queues shared by several
+workers record the pid of the process that claimed a row; process_alive
+tells whether that claim can still be in progress.
+"""
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+def connect(db_path: str, row_factory=None) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class ProcessLocalConnection:
+    """Call to get this process's connection to db_path, opening it if needed."""
+
+    def __init__(self, db_path: str, row_factory=None):
+        self.db_path = db_path
+        self.row_factory = row_factory
+        self._pid: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open_lock = threading.Lock()
+
+    def __call__(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._open_lock:
+                if self._pid != pid:
+                    # An inherited connection belongs to the parent; leave it untouched
+                    self._conn = connect(self.db_path, self.row_factory)
+                    self._pid = pid
+        return self._conn
+
+
+def process_alive(pid: Optional[int]) -> bool:
+    """Whether the process that claimed a row may still be working on it."""
+    if not pid or pid == os.getpid():
+        # This process is only starting, so nothing it claimed is still running
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
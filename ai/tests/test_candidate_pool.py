@@ -0,0 +1,99 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import resume_matcher
+from ranking_state import CandidateLog, RankingStore
+
+JOB = {
+    "job_description": {
+        "applied_job_title": "Senior Frontend Developer",
+        "job_responsibilities": ["Develop and maintain React applications"],
+        "required_skills": {
+            "core_technologies": ["React.js", "TypeScript"],
+            "tools": ["Git"],
+            "soft_skills": ["Team collaboration"]
+        }
+    },
+    "metadata": {"job_id": "frontend-1"}
+}
+
+RESUME = {
+    "personal_information": {"name": "James Carter", "email": "james.carter@example.com"},
+    "education": [{"degree": "Bachelor of Science in Computer Science"}],
+    "work_experience": [
+        {"company": "CodeWave Solutions", "start_date": "March 2020", "end_date": "Present"}
+    ],
+    "skills": {"mobile_development": ["React.js", "TypeScript"], "backend": [], "tools": ["Git"]}
+}
+
+
+def submit_resume(resumes_path, log: CandidateLog):
+    """What /send-data does: append the resume to the file and log it for ranking."""
+    with open(resumes_path) as f:
+        data = json.load(f)
+    data.append(RESUME)
+    with open(resumes_path, "w") as f:
+        json.dump(data, f)
+    log.append(RESUME)
+
+
+def test_cascade_ranks_a_submitted_resume_once(tmp_path, monkeypatch):
+    resumes_path = tmp_path / "resumes_data.json"
+    resumes_path.write_text(json.dumps([JOB]))
+    log = CandidateLog(str(tmp_path / "ranking_state.db"))
+    monkeypatch.setattr(resume_matcher, "RESUMES_JSON_PATH", str(resumes_path))
+    monkeypatch.setattr(resume_matcher, "candidate_log", log)
+
+    submit_resume(resumes_path, log)
+
+    response = TestClient(resume_matcher.app).get(
+        "/process-and-match-resumes",
+        params={"mode": "cascade", "limit": 10, "weights": json.dumps({"semantic": 0})}
+    )
+    assert response.status_code == 200, response.text
+    names = [candidate["name"] for candidate in response.json()["candidates"]]
+    assert names == ["James Carter"]
+
+
+def test_match_jobs_scores_a_submitted_resume_once(tmp_path, monkeypatch):
+    resumes_path = tmp_path / "resumes_data.json"
+    resumes_path.write_text(json.dumps([JOB]))
+    log = CandidateLog(str(tmp_path / "ranking_state.db"))
+    monkeypatch.setattr(resume_matcher, "RESUMES_JSON_PATH", str(resumes_path))
+    monkeypatch.setattr(resume_matcher, "candidate_log", log)
+
+    submit_resume(resumes_path, log)
+
+    response = TestClient(resume_matcher.app).get(
+        "/match-jobs", params={"top_k": 10, "weights": json.dumps({"semantic": 0})}
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()["candidates"]) == 1
+    assert [match["name"] for match in response.json()["jobs"][0]["candidates"]] == ["James Carter"]
+
+
+def test_ranking_rebuild_scores_a_submitted_resume_once(tmp_path, monkeypatch):
+    resumes_path = tmp_path / "resumes_data.json"
+    resumes_path.write_text(json.dumps([JOB]))
+    log = CandidateLog(str(tmp_path / "ranking_state.db"))
+    monkeypatch.setattr(resume_matcher, "RESUMES_JSON_PATH", str(resumes_path))
+    monkeypatch.setattr(resume_matcher, "candidate_log", log)
+    monkeypatch.setattr(resume_matcher, "ranking_store", RankingStore(str(tmp_path / "ranking_state.db")))
+
+    scored = []
+    score_entries = resume_matcher._score_entries
+
+    def recording_score_entries(candidates, compiled, weights):
+        scored.extend(candidate.name for candidate in candidates)
+        return score_entries(candidates, compiled, weights)
+
+    monkeypatch.setattr(resume_matcher, "_score_entries", recording_score_entries)
+
+    submit_resume(resumes_path, log)
+
+    response = TestClient(resume_matcher.app).get(
+        "/process-and-match-resumes", params={"weights": json.dumps({"semantic": 0})}
+    )
+    assert response.status_code == 200, response.text
+    assert scored == ["James Carter"]
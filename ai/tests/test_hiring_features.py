@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from hiring_features import (EXPERIENCE_BINS, build_feature_records, build_features, check_serving_parity,
+                             frame_from_requests, requests_from_frame)
+
+
+def training_frame() -> pd.DataFrame:
+    """Training rows covering the gaps and boundaries serving has to reproduce."""
+    rows = []
+    # One row on every finite experience bin edge, plus 0 years
+    for i, years in enumerate([0] + [edge for edge in EXPERIENCE_BINS if np.isfinite(edge) and edge >= 0]):
+        rows.append({
+            'Resume_Text': f"Candidate {i} has experience in Java, Spring Boot.",
+            'Job_Description': "Looking for a Backend Engineer with skills in Java, Spring Boot.",
+            'Skills': "Java, Spring Boot, Microservices",
+            'Required_Skills': "Java, Spring Boot",
+            'Experience (Years)': years,
+            'Offered_Salary': 80000 + 1000 * i,
+            'Salary_Expectation': 75000 + 2000 * i,
+            'Education': "Bachelor's",
+            'Industry': "Finance",
+            'Location': "London",
+            'Applied_Job_Title': "Backend Engineer",
+            'Work_Type': "Remote",
+            'Hired': i % 2,
+        })
+    edge = dict(rows[0], Resume_Text="Candidate with gaps", Hired=1)
+    rows += [
+        dict(edge, Offered_Salary=None),
+        dict(edge, Salary_Expectation=None),
+        dict(edge, Offered_Salary=None, Salary_Expectation=None),
+        dict(edge, Skills=None),
+        dict(edge, Required_Skills=None),
+        dict(edge, Salary_Expectation=0),
+        dict(edge, Offered_Salary=0, Salary_Expectation=0),
+        dict(edge, **{'Experience (Years)': None}),
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_serving_reproduces_training_features():
+    df = training_frame()
+    assert check_serving_parity(df) == []
+    assert np.isfinite(build_features(df)['Experience (Years)']).all()
+    assert np.isfinite(build_features(df)['Salary_Diff_Percentage']).all()
+
+
+def test_zero_salary_expectation_gives_a_finite_difference():
+    requests = requests_from_frame(training_frame())
+    requests = [dict(request, offered_salary=90000.0, salary_expectation=0.0) for request in requests[:1]]
+
+    batch = build_features(frame_from_requests(requests))['Salary_Diff_Percentage'].tolist()
+    records = [record['Salary_Diff_Percentage'] for record in build_feature_records(requests)]
+    assert batch == records == [0.0]
+    assert all(math.isfinite(value) for value in batch)
@@ -0,0 +1,52 @@
+import os
+import sys
+
+import spacy
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import app
+import synthetic
+from ranking_state import CandidateLog
+from resume_index import ResumeIndex
+from service_lifecycle import LazyResource
+from stubs import FakeGeminiModel, FakeSupabase
+
+
+class RecordingGeminiModel(FakeGeminiModel):
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return super().generate_content(prompt)
+
+
+def blank_pipeline():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def test_parse_resume_reaches_gemini(monkeypatch, tmp_path):
+    model = RecordingGeminiModel()
+    client = FakeSupabase()
+    monkeypatch.setattr(app, "gemini_model", LazyResource("Gemini model (test)", lambda: model))
+    monkeypatch.setattr(app, "supabase", LazyResource("Supabase client (test)", lambda: client))
+    monkeypatch.setattr(app, "nlp", LazyResource("spaCy model (test)", blank_pipeline))
+    monkeypatch.setattr(app, "resume_index", ResumeIndex(str(tmp_path / "resume_index.db")))
+    monkeypatch.setattr(app, "candidate_log", CandidateLog(str(tmp_path / "ranking_state.db")))
+
+    resume = synthetic.make_resumes(1)[0]
+    pdf = synthetic.make_pdf(synthetic.resume_text(resume))
+    response = TestClient(app.app).post(
+        "/parse-resume/", files={"file": ("resume.pdf", pdf, "application/pdf")})
+
+    assert response.status_code == 200, response.text
+    assert any("enhance the extracted data" in prompt for prompt in model.prompts)
+    enhanced = response.json()["enhanced_data"]
+    assert "Gemini enhancement failed" not in enhanced["corrections_made"]
+    assert enhanced["skills"] == ["Flutter", "Kotlin", "Firebase", "Git"]
+    assert len(client.tables["candidates"]) == 1
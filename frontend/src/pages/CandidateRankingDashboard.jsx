@@ -1,29 +1,61 @@
 import React, { useState, useEffect } from "react";
 import { Trophy, Star, Briefcase, FileText } from "lucide-react";
 
+const MATCHER_URL = "http://localhost:8080";
+const PAGE_SIZE = 25;
+
 const CandidateRankingDashboard = () => {
   const [candidates, setCandidates] = useState([]);
+  const [jobId, setJobId] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
+  // The ranking is served a page at a time; nextCursor asks for the page after the last one shown
+  const fetchPage = async (job, cursor) => {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    const response = await fetch(`${MATCHER_URL}/rankings/${encodeURIComponent(job)}?${params}`, {
+      method: "GET",
+      headers: {
+        "Accept": "application/json"
+      }
+    });
+
+    if (!response.ok) {
+      throw new Error("Failed to fetch candidates");
+    }
+
+    return response.json();
+  };
+
   useEffect(() => {
     const fetchCandidates = async () => {
       try {
         setIsLoading(true);
-        // Simple GET request with no parameters
-        const response = await fetch("http://localhost:8080/process-and-match-resumes", {
+        const jobsResponse = await fetch(`${MATCHER_URL}/rankings`, {
           method: "GET",
           headers: {
             "Accept": "application/json"
           }
         });
 
-        if (!response.ok) {
-          throw new Error("Failed to fetch candidates");
+        if (!jobsResponse.ok) {
+          throw new Error("Failed to fetch jobs");
         }
 
-        const data = await response.json();
-        setCandidates(data.candidates);
+        const { jobs } = await jobsResponse.json();
+        if (jobs.length > 0) {
+          const data = await fetchPage(jobs[0].job_id, null);
+          setJobId(jobs[0].job_id);
+          setCandidates(data.candidates);
+          setNextCursor(data.next_cursor);
+          setTotal(data.total);
+        }
         setIsLoading(false);
       } catch (err) {
         setError(err.message);
@@ -34,6 +66,20 @@ const CandidateRankingDashboard = () => {
     fetchCandidates();
   }, []);
 
+  const loadMore = async () => {
+    try {
+      setIsLoadingMore(true);
+      const data = await fetchPage(jobId, nextCursor);
+      setCandidates((previous) => [...previous, ...data.candidates]);
+      setNextCursor(data.next_cursor);
+      setTotal(data.total);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const getMatchColorClass = (matchPercentage) => {
     if (matchPercentage >= 90) return "bg-green-100 border-green-500";
     if (matchPercentage >= 75) return "bg-lime-100 border-lime-500";
@@ -68,12 +114,17 @@ const CandidateRankingDashboard = () => {
         <h1 className="text-3xl font-bold text-gray-800">
           Candidate Ranking Dashboard
         </h1>
+        {total > 0 && (
+          <span className="ml-4 text-gray-500">
+            Showing {candidates.length} of {total}
+          </span>
+        )}
       </div>
 
       <div className="grid gap-6">
         {candidates.map((candidate, index) => (
           <div
-            key={candidate.name}
+            key={`${candidate.name}-${index}`}
             className={`
               border-l-4 rounded-lg shadow-md p-6 transition-all duration-300 
               hover:shadow-xl ${getMatchColorClass(candidate.match)}
@@ -107,6 +158,18 @@ const CandidateRankingDashboard = () => {
         ))}
       </div>
 
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={loadMore}
+            disabled={isLoadingMore}
+            className="px-6 py-2 rounded-lg bg-blue-500 text-white font-semibold hover:bg-blue-600 disabled:opacity-50"
+          >
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
+
       {candidates.length === 0 && (
         <div className="text-center py-10 bg-gray-100 rounded-lg">
           <p className="text-xl text-gray-600">No candidates found</p>